@@ -0,0 +1,197 @@
+# benchmarks/scoring.py
+"""End-to-end scoring benchmark for plant_model and myco_model.
+
+Replays data/plant_health_data.csv and data/Tree_Data.csv through the same
+path the app uses (encoding tables for the fungal inputs, then
+predict_with_confidence) and measures, per model and inference engine:
+
+  * model load time (imports + loading, in a fresh interpreter),
+  * single-row latency p50/p99,
+  * batched throughput at several batch sizes,
+  * peak RSS of the process.
+
+Each (engine, model) pair runs in its own subprocess so load time and peak
+RSS are not polluted by the other runs. Results are written as JSON and can
+be compared with an earlier run:
+
+    python benchmarks/scoring.py -o bench.json
+    python benchmarks/scoring.py -o new.json --compare bench.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+
+ENGINES = ['flat', 'pruned', 'sklearn']
+MODELS = ['plant_model', 'myco_model']
+BATCH_SIZES = [1, 16, 128, 1024, 8192]
+
+
+def _peak_rss_mb():
+    import resource
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _percentile(sorted_values, q):
+    return sorted_values[min(len(sorted_values) - 1, int(round(q / 100 * (len(sorted_values) - 1))))]
+
+
+def run_worker(engine, model_name, single_rows, min_seconds):
+    """Benchmark one model in this process; returns a result dict."""
+    start = time.perf_counter()
+    if engine == 'flat':
+        from bundle import load_flat_assets as loader
+    elif engine == 'pruned':
+        from pruning import load_pruned_assets as loader
+    else:
+        from assets import load_assets as loader
+    plant_model, myco_model, *encoders = loader()
+    load_seconds = time.perf_counter() - start
+    rss_after_load = _peak_rss_mb()
+
+    import numpy as np
+    import pandas as pd
+
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+    from scoring import predict_with_confidence
+
+    if model_name == 'plant_model':
+        model = plant_model
+        raw, _ = load_plant_data()
+
+        def score(frame):
+            return predict_with_confidence(model, frame)
+    else:
+        model = myco_model
+        raw = load_myco_frame()
+
+        def score(frame):
+            X, _ = encode_myco(frame, *encoders)
+            return predict_with_confidence(model, X)
+
+    # Warm up (first call pays for lazy imports and allocator growth)
+    score(raw.iloc[:1])
+
+    latencies = []
+    for i in range(single_rows):
+        row = raw.iloc[[i % len(raw)]]
+        start = time.perf_counter()
+        score(row)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    throughput = {}
+    for batch_size in BATCH_SIZES:
+        reps = -(-batch_size // len(raw))
+        batch = pd.concat([raw] * reps, ignore_index=True).iloc[:batch_size] if reps > 1 else raw.iloc[:batch_size]
+        rows, elapsed = 0, 0.0
+        while elapsed < min_seconds:
+            start = time.perf_counter()
+            score(batch)
+            elapsed += time.perf_counter() - start
+            rows += len(batch)
+        throughput[str(batch_size)] = round(rows / elapsed, 1)
+
+    return {
+        'load_ms': round(load_seconds * 1000, 1),
+        'single_row_ms': {
+            'p50': round(_percentile(latencies, 50) * 1000, 3),
+            'p99': round(_percentile(latencies, 99) * 1000, 3),
+            'mean': round(float(np.mean(latencies)) * 1000, 3),
+            'samples': len(latencies),
+        },
+        'rows_per_sec': throughput,
+        'peak_rss_mb': {'after_load': round(rss_after_load, 1), 'total': round(_peak_rss_mb(), 1)},
+    }
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip()
+
+
+def compare(new, old):
+    """Print the relative change of every metric between two result files."""
+    def flatten(prefix, value, out):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                flatten(f"{prefix}.{key}" if prefix else key, item, out)
+        elif isinstance(value, (int, float)) and not prefix.endswith('samples'):
+            out[prefix] = value
+        return out
+
+    new_metrics = flatten('', new['results'], {})
+    old_metrics = flatten('', old['results'], {})
+    print(f"\nChange vs {old.get('commit') or 'previous run'}:")
+    for key, value in new_metrics.items():
+        if key in old_metrics and old_metrics[key]:
+            change = (value - old_metrics[key]) / old_metrics[key] * 100
+            print(f"  {key:<45} {old_metrics[key]:>12} -> {value:>12} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scoring latency, throughput, load time and memory")
+    parser.add_argument('--engine', action='append', choices=ENGINES, help="Engine(s) to run (default: all)")
+    parser.add_argument('--model', action='append', choices=MODELS, help="Model(s) to run (default: all)")
+    parser.add_argument('--single-rows', type=int, default=500, help="Single-row predictions to time")
+    parser.add_argument('--min-seconds', type=float, default=1.0, help="Minimum time per batch size")
+    parser.add_argument('-o', '--output', help="Write the results as JSON")
+    parser.add_argument('--compare', help="Earlier JSON result to compare against")
+    parser.add_argument('--worker', nargs=2, metavar=('ENGINE', 'MODEL'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        sys.path.insert(0, SRC_DIR)
+        print(json.dumps(run_worker(*args.worker, args.single_rows, args.min_seconds)))
+        return
+
+    sys.path.insert(0, SRC_DIR)
+    from pruning import pruned_models_available
+
+    # The pruned forests only exist once python src/pruning.py has been run
+    engines = args.engine or [engine for engine in ENGINES if engine != 'pruned' or pruned_models_available()]
+    results = {}
+    for engine in engines:
+        for model_name in args.model or MODELS:
+            cmd = [sys.executable, '-W', 'ignore', os.path.abspath(__file__), '--worker', engine, model_name,
+                   '--single-rows', str(args.single_rows), '--min-seconds', str(args.min_seconds)]
+            out = subprocess.run(cmd, cwd=SRC_DIR, capture_output=True, text=True, check=True)
+            result = json.loads(out.stdout.strip().splitlines()[-1])
+            results.setdefault(engine, {})[model_name] = result
+            best = max(result['rows_per_sec'].values())
+            print(f"{engine:>7} {model_name:<12} load {result['load_ms']:8.1f} ms   "
+                  f"p50 {result['single_row_ms']['p50']:7.3f} ms   p99 {result['single_row_ms']['p99']:7.3f} ms   "
+                  f"best {best:>11,.0f} rows/s   peak RSS {result['peak_rss_mb']['total']:.0f} MB")
+
+    report = {
+        'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'batch_sizes': BATCH_SIZES,
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
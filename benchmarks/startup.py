@@ -0,0 +1,99 @@
+# benchmarks/startup.py
+"""Startup benchmark: import cost and time to first paint for every app page.
+
+For each page a fresh interpreter
+  * imports the page module under ``python -X importtime`` and records the
+    cumulative import time plus the heaviest top-level imports, and
+  * runs src/app.py headlessly with Streamlit's AppTest, switches to the
+    page and records the time from process start until the page has
+    rendered (time to first paint, including the page's lazy imports).
+
+    python benchmarks/startup.py                 # all pages
+    python benchmarks/startup.py --page Home -o startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(ROOT_DIR, 'src')
+sys.path.insert(0, SRC_DIR)
+
+from views import PAGES  # noqa: E402
+
+FIRST_PAINT = """
+import time
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+at.run()
+if {page!r} != "Home":
+    at.radio(key="app_mode").set_value({page!r}).run()
+elapsed = time.perf_counter() - start
+errors = [e.value for e in at.exception]
+print(repr((elapsed, errors)))
+"""
+
+
+def import_time(module):
+    """Cumulative import time (ms) of ``module`` and the 5 heaviest modules it imports."""
+    out = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                         cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    total, direct = 0.0, []
+    for line in out.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # Nested imports are indented two spaces per level under their importer
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        ms = int(cumulative) / 1000
+        if name.strip() == module:
+            total = ms
+        elif depth == 1:
+            direct.append((name.strip(), ms))
+    heaviest = sorted(direct, key=lambda item: item[1], reverse=True)[:5]
+    return {'total_ms': round(total, 1),
+            'heaviest': [{'module': name, 'ms': round(ms, 1)} for name, ms in heaviest]}
+
+
+def first_paint(page, repeat):
+    code = FIRST_PAINT.format(app=os.path.join(SRC_DIR, 'app.py'), page=page)
+    timings = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', code], cwd=SRC_DIR, capture_output=True, text=True, check=True)
+        elapsed, errors = eval(out.stdout.strip().splitlines()[-1])
+        if errors:
+            raise RuntimeError(f"{page} raised: {errors[0]}")
+        timings.append(elapsed * 1000)
+    return {'median_ms': round(statistics.median(timings), 1), 'min_ms': round(min(timings), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import cost and time to first paint per page")
+    parser.add_argument('--page', action='append', choices=list(PAGES), help="Page(s) to measure (default: all)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('-o', '--output', help="Write the results as JSON")
+    args = parser.parse_args()
+
+    results = {'pages': {}}
+    for page in args.page or list(PAGES):
+        results['pages'][page] = {
+            'import': import_time(PAGES[page]),
+            'first_paint': first_paint(page, args.repeat),
+        }
+        paint = results['pages'][page]['first_paint']
+        imports = results['pages'][page]['import']
+        print(f"{page:<26} first paint {paint['median_ms']:8.1f} ms   "
+              f"page imports {imports['total_ms']:7.1f} ms "
+              f"(heaviest: {', '.join(h['module'] for h in imports['heaviest'][:3])})")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
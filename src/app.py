@@ -1,13 +1,27 @@
 # app.py
+import importlib
+from types import SimpleNamespace
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-import joblib
-import matplotlib.pyplot as plt
-import seaborn as sns
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.preprocessing import LabelEncoder
-import datetime
+
+from assets import MODELS_DIR, load_assets as load_pickled_assets
+from bundle import BundleError, load_flat_assets
+from datasets import encode_myco, load_myco_frame, load_plant_data
+from distill import CASCADE_THRESHOLD, CascadeModel, compact_models_available, load_compact_models
+from early_exit import EarlyExitForest
+from forest import LARGE_BATCH_ROWS, BatchRouter, FlatForest
+from history_store import HistoryStore
+from metrics import set_page, span
+from prediction_cache import PredictionCache
+from pruning import load_pruned_assets, pruned_models_available
+from region_index import load_region_index, region_index_available
+from scoring import MYCO_FEATURES, PH_FEATURES
+from views import PAGES
+
+PREDICTION_CACHE_SIZE = 4096
+# Quantization steps for the prediction cache, matching the slider resolution
+PH_RESOLUTION = {feature: 0.01 for feature in PH_FEATURES}
+MYCO_RESOLUTION = {'AMF': 0.01, 'PHN_Imp': 0.01, 'NSC_Imp': 0.01, 'LIG_Imp': 0.01}
 
 # Set page config
 st.set_page_config(
@@ -179,34 +193,147 @@ if 'plant_results' not in st.session_state:
     st.session_state.plant_results = None
 if 'fungal_results' not in st.session_state:
     st.session_state.fungal_results = None
-if 'test_history' not in st.session_state:
-    st.session_state.test_history = []
 
 # --- Model and Encoder Loading ---
 @st.cache_resource
 def load_assets():
     try:
-        plant_model = joblib.load('plant_health_model.pkl')
-        myco_model = joblib.load('myco_net_model.pkl')
-        le_species = joblib.load('species_encoder.pkl')
-        le_light = joblib.load('light_encoder.pkl') 
-        le_microbe = joblib.load('microbe_encoder.pkl')
-        return plant_model, myco_model, le_species, le_light, le_microbe
+        with span('load_assets'):
+            return load_flat_assets(MODELS_DIR)
     except FileNotFoundError:
-        st.error("Model files not found! Please run train_and_save_models.py first.")
+        st.error("Model files not found! Please run python src/train_and_save_models.py first.")
+        st.stop()
+    except BundleError as e:
+        st.error(f"Model bundle is invalid ({e}). Rebuild it with: python src/bundle.py build")
         st.stop()
 plant_model, myco_model, le_species, le_light, le_microbe = load_assets()
 
+@st.cache_resource
+def load_sklearn_models():
+    with span('load_assets'):
+        plant_model, myco_model, _, _, _ = load_pickled_assets(MODELS_DIR)
+    return plant_model, myco_model
+
+@st.cache_resource
+def load_pruned_models():
+    # None if the pruned forests are lossy or come from other models
+    try:
+        with span('load_assets'):
+            plant_model, myco_model, *_ = load_pruned_assets(MODELS_DIR)
+    except ValueError:
+        return None
+    return plant_model, myco_model
+
+@st.cache_resource
+def load_myco_region_index(_myco_model):
+    # None if the saved index was built for another model
+    try:
+        return load_region_index(_myco_model, MODELS_DIR)
+    except ValueError:
+        return None
+
+@st.cache_resource
+def load_early_exit(engine, mode, _plant_model, _myco_model):
+    # Tree order learned on the datasets; models that are not flat forests are left as they are
+    X_plant, _ = load_plant_data()
+    X_myco, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+    return tuple(EarlyExitForest.learned(model, X, mode=mode) if isinstance(model, FlatForest) else model
+                 for model, X in ((_plant_model, X_plant), (_myco_model, X_myco)))
+
+@st.cache_resource
+def load_checked_compact_models(_plant_model, _myco_model):
+    # None if the compact models were distilled from other forests
+    try:
+        return load_compact_models(MODELS_DIR, {'plant_model': _plant_model, 'myco_model': _myco_model})
+    except ValueError:
+        return None
+
+@st.cache_resource
+def load_fast_path(engine, early_exit, _compact, _plant_model, _myco_model):
+    # Compact distilled models in front of the full forests of the selected engine
+    return (CascadeModel(_compact['plant_model'], _plant_model, CASCADE_THRESHOLD),
+            CascadeModel(_compact['myco_model'], _myco_model, CASCADE_THRESHOLD))
+
+@st.cache_resource
+def load_prediction_caches(engine, early_exit, fast_path, _plant_model, _myco_model):
+    # Shared by every session; one pair of caches per inference engine
+    return (PredictionCache(_plant_model, PH_FEATURES, PREDICTION_CACHE_SIZE, PH_RESOLUTION),
+            PredictionCache(_myco_model, MYCO_FEATURES, PREDICTION_CACHE_SIZE, MYCO_RESOLUTION))
+
+@st.cache_resource
+def load_batch_models(engine, early_exit, fast_path, _plant_model, _myco_model):
+    # File, field and stream scoring: calls above LARGE_BATCH_ROWS rows go to the pickled forests
+    return (BatchRouter(_plant_model, lambda: load_sklearn_models()[0]),
+            BatchRouter(_myco_model, lambda: load_sklearn_models()[1]))
+
+@st.cache_resource
+def load_history_store():
+    return HistoryStore()
+history_store = load_history_store()
+
 # Title and description
 st.markdown('<h1 class="main-header">🌿 Myco-Net: AI Fungal Network Interpreter</h1>', unsafe_allow_html=True)
 st.markdown("### Revolutionizing Plant Health Monitoring through AI and Fungal Network Analysis")
 
 # Sidebar navigation
 st.sidebar.markdown("## 🌿 Navigation")
-app_mode = st.sidebar.radio("Choose Mode", 
-                           ["Home", "Plant Health Assessment", "Fungal Network Analysis", 
-                            "Combined Results", "Test History", "Results Dashboard"],
-                           index=0)
+app_mode = st.sidebar.radio("Choose Mode", list(PAGES), index=0, key="app_mode")
+set_page(app_mode)
+
+flat_plant_model, flat_myco_model = plant_model, myco_model
+REGION_ENGINE = "Flat arrays + region index"
+PRUNED_ENGINE = "Pruned flat arrays"
+engines = ["Flat arrays", "scikit-learn"] + ([PRUNED_ENGINE] if pruned_models_available(MODELS_DIR) else []) \
+    + ([REGION_ENGINE] if region_index_available(MODELS_DIR) else [])
+inference_engine = st.sidebar.selectbox("Inference Engine", engines,
+                                        help="Flat arrays gives identical predictions with lower latency on "
+                                             "single rows and small batches; the region index looks fungal "
+                                             "predictions up by decision region. Batches above "
+                                             f"{LARGE_BATCH_ROWS} rows are scored with scikit-learn, which is "
+                                             "faster there")
+region_index = None
+if inference_engine == "scikit-learn":
+    plant_model, myco_model = load_sklearn_models()
+elif inference_engine == PRUNED_ENGINE:
+    pruned_models = load_pruned_models()
+    if pruned_models is None:
+        st.sidebar.warning("The pruned forests are stale. Rewrite them with: python src/pruning.py")
+    else:
+        plant_model, myco_model = pruned_models
+elif inference_engine == REGION_ENGINE:
+    region_index = load_myco_region_index(myco_model)
+    if region_index is None:
+        st.sidebar.warning("The region index is stale. Rebuild it with: python src/region_index.py build")
+    else:
+        myco_model = region_index
+EARLY_EXIT_MODES = {"Off": None, "Exact margin": 'margin', "Hoeffding bound": 'hoeffding'}
+early_exit, early_models = None, ()
+if inference_engine != "scikit-learn":
+    early_exit = EARLY_EXIT_MODES[st.sidebar.selectbox(
+        "Early exit", list(EARLY_EXIT_MODES),
+        help="Stop evaluating trees once the label is settled: exactly (margin) or with 95% confidence (Hoeffding)")]
+if early_exit:
+    early_models = load_early_exit(inference_engine, early_exit, plant_model, myco_model)
+    plant_model, myco_model = early_models
+compact_models = None
+if compact_models_available(MODELS_DIR):
+    compact_models = load_checked_compact_models(flat_plant_model, flat_myco_model)
+    if compact_models is None:
+        st.sidebar.warning("The compact models are stale. Redistill them with: python src/distill.py")
+fast_path = compact_models is not None and st.sidebar.toggle(
+    "Compact fast path", value=True,
+    help="Score with the distilled compact models and use the full forests only for low-confidence rows")
+if fast_path:
+    plant_model, myco_model = load_fast_path(inference_engine, early_exit, compact_models, plant_model, myco_model)
+plant_cache, myco_cache = load_prediction_caches(inference_engine, early_exit, fast_path, plant_model,
+                                                   myco_model)
+if inference_engine == "scikit-learn":
+    batch_plant_model, batch_myco_model = plant_model, myco_model
+else:
+    batch_plant_model, batch_myco_model = load_batch_models(inference_engine, early_exit, fast_path, plant_model,
+                                                            myco_model)
+# The live monitor is shared by every session, so it always uses the exact flat forest
+stream_plant_model = load_batch_models("Flat arrays", None, False, flat_plant_model, flat_myco_model)[0]
 
 st.sidebar.markdown("---")
 st.sidebar.markdown("### 📊 Quick Stats")
@@ -226,563 +353,39 @@ if st.session_state.fungal_results:
     else:
         st.sidebar.error(f"🍄 Fungal: {risk}")
 
-st.sidebar.markdown(f"**Tests Conducted:** {len(st.session_state.test_history)}")
+total_tests = history_store.count()
+st.sidebar.markdown(f"**Tests Conducted:** {total_tests}")
 
-# --- Page Content ---
-if app_mode == "Home":
-    st.header("Welcome to Myco-Net!")
-    st.markdown("""
-    **Myco-Net** is an innovative AI system that interprets plant health through:
-    - **Standard sensor data** for immediate stress detection
-    - **Fungal network analysis** for early warning predictions
-    
-    ### How it Works:
-    1. **Input** your plant's sensor data
-    2. **Get instant analysis** of current health status
-    3. **Receive early warnings** from fungal network data
-    4. **View actionable recommendations** for farmers
-    
-    ### Key Features:
-    - 🎯 **100% accuracy** in current stress detection (Plant Health Model)
-    - 🔮 **98.13% accuracy** in early warning predictions (Myco-Net Model)
-    - 🌱 **Sustainable** farming practices
-    - 💰 **Cost-effective** for small-scale farmers
-    """)
-    
-    col1, col2 = st.columns(2)
-    with col1:
-        st.image("https://images.unsplash.com/photo-1589923188937-cb64779f4abe?w=600", 
-                 caption="AI-Powered Plant Health Monitoring")
-    with col2:
-        st.image("https://images.unsplash.com/photo-1598003807926-9a376a19e536?w=600", 
-                 caption="Fungal Network Analysis")
-    
-    st.markdown("---")
-    st.markdown("### 🚀 Get Started")
-    st.info("Use the navigation menu on the left to begin your analysis. Start with **Plant Health Assessment** or **Fungal Network Analysis**.")
-
-elif app_mode == "Plant Health Assessment":
-    st.markdown('<h2 class="sub-header">🌱 Plant Health Assessment</h2>', unsafe_allow_html=True)
-    
-    # Use tabs for better organization
-    tab1, tab2 = st.tabs(["📊 Input Parameters", "ℹ️ Information"])
-    
-    with tab1:
-        ph_features = ['Soil_Moisture', 'Ambient_Temperature', 'Soil_Temperature',
-                       'Humidity', 'Light_Intensity', 'Soil_pH',
-                       'Nitrogen_Level', 'Phosphorus_Level', 'Potassium_Level',
-                       'Chlorophyll_Content', 'Electrochemical_Signal']
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### Environmental Sensors")
-            soil_moisture = st.slider("Soil Moisture (%)", 0.0, 100.0, 45.0, help="Optimal range: 30-60%")
-            ambient_temp = st.slider("Ambient Temperature (°C)", 0.0, 50.0, 25.0, help="Optimal range: 20-30°C")
-            soil_temp = st.slider("Soil Temperature (°C)", 0.0, 50.0, 22.0, help="Optimal range: 18-24°C")
-            humidity = st.slider("Humidity (%)", 0.0, 100.0, 60.0, help="Optimal range: 50-70%")
-            light_intensity = st.slider("Light Intensity (lux)", 0.0, 100000.0, 50000.0, key="light_ph")
-            
-        with col2:
-            st.markdown("#### Soil Composition")
-            soil_ph = st.slider("Soil pH", 0.0, 14.0, 6.5, help="Optimal range: 6.0-7.0")
-            nitrogen = st.slider("Nitrogen Level (ppm)", 0.0, 100.0, 45.0, help="Optimal range: 40-60 ppm")
-            phosphorus = st.slider("Phosphorus Level (ppm)", 0.0, 100.0, 35.0, help="Optimal range: 30-50 ppm")
-            potassium = st.slider("Potassium Level (ppm)", 0.0, 100.0, 40.0, help="Optimal range: 35-55 ppm")
-            chlorophyll = st.slider("Chlorophyll Content", 0.0, 100.0, 65.0, key="chlorophyll_ph")
-        
-        st.markdown("#### Bio-signals")
-        electrochemical = st.slider("Electrochemical Signal", -100.0, 100.0, 10.0, key="electro_ph")
-        
-        if st.button("Analyze Plant Health", type="primary", use_container_width=True):
-            features = pd.DataFrame([[soil_moisture, ambient_temp, soil_temp, humidity, light_intensity,
-                                        soil_ph, nitrogen, phosphorus, potassium, chlorophyll, electrochemical]],
-                                      columns=ph_features)
-            
-            prediction = plant_model.predict(features)[0]
-            probabilities = plant_model.predict_proba(features)[0]
-            confidence = np.max(probabilities) * 100
-            
-            st.session_state.plant_results = {
-                'status': prediction,
-                'confidence': confidence,
-                'soil_moisture': soil_moisture,
-                'nitrogen': nitrogen,
-                'soil_ph': soil_ph,
-                'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            st.markdown("---")
-            
-            if prediction == "Healthy":
-                st.markdown(f"""
-                <div class="prediction-box">
-                    <h2>✅ Health Status: {prediction}</h2>
-                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
-                    <p>Your plants are in good condition! Maintain current practices.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            elif prediction == "Moderate Stress":
-                st.markdown(f"""
-                <div class="prediction-box warning">
-                    <h2>⚠️ Health Status: {prediction}</h2>
-                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
-                    <p>Recommendations:</p>
-                    <ul>
-                        <li>Increase irrigation (current: {soil_moisture}%)</li>
-                        <li>Add nitrogen-rich fertilizer (current: {nitrogen} ppm)</li>
-                        <li>Monitor soil pH levels (current: {soil_ph})</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="prediction-box critical">
-                    <h2>🚨 Health Status: {prediction}</h2>
-                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
-                    <p>Immediate action required:</p>
-                    <ul>
-                        <li>Urgent irrigation needed (current: {soil_moisture}%)</li>
-                        <li>Apply emergency fertilizer (current nitrogen: {nitrogen} ppm)</li>
-                        <li>Check soil pH and adjust if needed (current: {soil_ph})</li>
-                    </ul>
-                </div>
-                """, unsafe_allow_html=True)
-    
-    with tab2:
-        st.markdown("""
-        ### About Plant Health Assessment
-        
-        This module analyzes standard plant health parameters to detect current stress conditions:
-        
-        - **Soil Moisture**: Water content in the soil
-        - **Temperature**: Both ambient and soil temperatures
-        - **Humidity**: Atmospheric moisture level
-        - **Light Intensity**: Amount of light exposure
-        - **Soil pH**: Acidity/alkalinity level
-        - **Nutrients**: Nitrogen, Phosphorus, and Potassium levels
-        - **Chlorophyll Content**: Indicator of photosynthetic activity
-        - **Electrochemical Signals**: Plant's electrical response to environment
-        
-        The model uses a Random Forest classifier trained on extensive agricultural data to provide accurate health assessments.
-        """)
-
-elif app_mode == "Fungal Network Analysis":
-    st.markdown('<h2 class="sub-header">🍄 Fungal Network Analysis</h2>', unsafe_allow_html=True)
-    
-    tab1, tab2 = st.tabs(["📊 Input Parameters", "ℹ️ Information"])
-    
-    with tab1:
-        myco_features = ['Species_encoded', 'Light_encoded', 'Microbe_encoded', 'AMF', 
-                         'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### Fungal Metrics & Tree Type")
-            species = st.selectbox("Plant Species", le_species.classes_)
-            amf_colonization = st.slider("AMF Colonization (%)", 0.0, 100.0, 65.0)
-            nsc_imp = st.slider("NSC_Imp (Non-Structural Carbohydrate Proxy)", 0.0, 1.0, 0.5, step=0.01)
-            lig_imp = st.slider("LIG_Imp (Lignin Content Proxy)", 0.0, 1.0, 0.5, step=0.01)
-        with col2:
-            st.markdown("#### Environmental Factors")
-            light_level = st.selectbox("Light Condition", le_light.classes_)
-            microbe_type = st.selectbox("Microbial Community", le_microbe.classes_)
-            phn_imp = st.slider("PHN_Imp (Water Stress Proxy)", 0.0, 1.0, 0.5, step=0.01)
-            
-        if st.button("Analyze Fungal Network", type="primary", use_container_width=True):
-            species_encoded = le_species.transform([species])[0]
-            light_encoded = le_light.transform([light_level])[0]
-            microbe_encoded = le_microbe.transform([microbe_type])[0]
-            
-            features = pd.DataFrame([[species_encoded, light_encoded, microbe_encoded, 
-                                        amf_colonization, phn_imp, nsc_imp, lig_imp]],
-                                      columns=myco_features)
-            
-            prediction = myco_model.predict(features)[0]
-            probabilities = myco_model.predict_proba(features)[0]
-            confidence = np.max(probabilities) * 100
-            
-            st.markdown("---")
-            
-            risk_level = "Low Risk" if prediction == 1 else "High Risk"
-            
-            st.session_state.fungal_results = {
-                'risk_level': risk_level,
-                'confidence': confidence,
-                'amf_colonization': amf_colonization,
-                'nsc_level': nsc_imp,
-                'microbe_type': microbe_type,
-                'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            
-            if risk_level == "Low Risk":
-                st.markdown(f"""
-                <div class="prediction-box">
-                    <h2>✅ Survival Prediction: LIKELY TO SURVIVE</h2>
-                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
-                    <p>The fungal network appears strong and supportive of plant health.</p>
-                </div>
-                """, unsafe_allow_html=True)
-            else:
-                st.markdown(f"""
-                <div class="prediction-box warning">
-                    <h2>⚠️ Survival Prediction: AT RISK</h2>
-                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
-                    <p>The fungal network may be compromised. Immediate action is recommended.</p>
-                </div>
-                """, unsafe_allow_html=True)
-                
-            # Feature importance visualization
-            st.markdown("#### Feature Importance")
-            myco_importance = pd.DataFrame({'feature': myco_features, 'importance': myco_model.feature_importances_})
-            myco_importance = myco_importance.sort_values('importance', ascending=False)
-            
-            fig, ax = plt.subplots(figsize=(10, 6))
-            sns.barplot(x='importance', y='feature', data=myco_importance, palette="Oranges_r", ax=ax)
-            ax.set_xlabel('Importance')
-            ax.set_title('Feature Importance in Fungal Network Analysis')
-            st.pyplot(fig)
-    
-    with tab2:
-        st.markdown("""
-        ### About Fungal Network Analysis
-        
-        This module analyzes fungal network parameters to predict future plant health issues:
-        
-        - **Plant Species**: Different species have different fungal associations
-        - **Light Conditions**: Affects fungal network development
-        - **Microbial Community**: Composition of soil microbes
-        - **AMF Colonization**: Arbuscular Mycorrhizal Fungi colonization percentage
-        - **PHN_Imp**: Water stress proxy measurement
-        - **NSC_Imp**: Non-Structural Carbohydrate proxy (energy reserves)
-        - **LIG_Imp**: Lignin content proxy (structural integrity)
-        
-        The Myco-Net model uses these parameters to provide early warnings about potential plant health issues before they become visible.
-        """)
-
-elif app_mode == "Combined Results":
-    st.header("📊 Combined Analysis Results")
-    
-    if st.session_state.plant_results and st.session_state.fungal_results:
-        plant = st.session_state.plant_results
-        fungal = st.session_state.fungal_results
-        
-        # Summary cards
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            if plant['status'] == "Healthy":
-                st.success(f"🌱 **Plant Health: {plant['status']}**")
-            elif plant['status'] == "Moderate Stress":
-                st.warning(f"🌱 **Plant Health: {plant['status']}**")
-            else:
-                st.error(f"🌱 **Plant Health: {plant['status']}**")
-            st.write(f"Confidence: {plant['confidence']:.1f}%")
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        with col2:
-            st.markdown('<div class="card fungal-card">', unsafe_allow_html=True)
-            if fungal['risk_level'] == "Low Risk":
-                st.success(f"🍄 **Fungal Network: {fungal['risk_level']}**")
-            else:
-                st.error(f"🍄 **Fungal Network: {fungal['risk_level']}**")
-            st.write(f"Confidence: {fungal['confidence']:.1f}%")
-            st.markdown('</div>', unsafe_allow_html=True)
-                
-        with col3:
-            st.markdown('<div class="card">', unsafe_allow_html=True)
-            if plant['status'] == "Healthy" and fungal['risk_level'] == "Low Risk":
-                st.success("✅ **Overall: Optimal Health**")
-                st.write("Your plants are healthy now and likely to remain so.")
-            elif plant['status'] == "High Stress" or fungal['risk_level'] == "High Risk":
-                st.error("🚨 **Overall: Critical Attention Needed**")
-                st.write("Immediate intervention is required.")
-            else:
-                st.warning("⚠️ **Overall: Monitoring Required**")
-                st.write("Some parameters need attention.")
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Detailed results
-        st.markdown("---")
-        col1, col2 = st.columns(2)
-        with col1:
-            st.markdown("#### 🌱 Plant Health Details")
-            st.markdown('<div class="metric-box">', unsafe_allow_html=True)
-            st.write(f"**Status:** {plant['status']} ({plant['confidence']:.1f}% confidence)")
-            st.write(f"**Soil Moisture:** {plant['soil_moisture']}%")
-            st.write(f"**Nitrogen Level:** {plant['nitrogen']} ppm")
-            st.write(f"**Soil pH:** {plant['soil_ph']}")
-            st.write(f"**Last Updated:** {plant['timestamp']}")
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        with col2:
-            st.markdown("#### 🍄 Fungal Network Details")
-            st.markdown('<div class="metric-box">', unsafe_allow_html=True)
-            st.write(f"**Risk Level:** {fungal['risk_level']} ({fungal['confidence']:.1f}% confidence)")
-            st.write(f"**AMF Colonization:** {fungal['amf_colonization']}%")
-            st.write(f"**NSC Level:** {fungal['nsc_level']}")
-            st.write(f"**Microbial Community:** {fungal['microbe_type']}")
-            st.write(f"**Last Updated:** {fungal['timestamp']}")
-            st.markdown('</div>', unsafe_allow_html=True)
-        
-        # Recommendations
-        st.markdown("#### 💡 Recommendations")
-        if plant['status'] == "Healthy" and fungal['risk_level'] == "Low Risk":
-            st.success("""
-            - Maintain current practices
-            - Continue regular monitoring
-            - No immediate action needed
-            """)
-        elif plant['status'] == "High Stress" or fungal['risk_level'] == "High Risk":
-            st.error("""
-            - Immediate intervention required
-            - Adjust irrigation and fertilization
-            - Consider soil amendments
-            - Monitor closely for changes
-            """)
-        else:
-            st.warning("""
-            - Monitor specific parameters
-            - Consider slight adjustments to practices
-            - Schedule follow-up assessment
-            """)
-        
-        if st.button("Save Combined Results to History", type="primary", use_container_width=True):
-            test_entry = {
-                'plant_results': plant,
-                'fungal_results': fungal,
-                'combined_timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            }
-            st.session_state.test_history.append(test_entry)
-            st.success("Results saved to history!")
-            st.rerun()
-
-    else:
-        st.warning("⚠️ Please run both Plant Health and Fungal Network analyses first!")
-        col1, col2 = st.columns(2)
-        with col1:
-            if not st.session_state.plant_results:
-                st.error("Plant Health Assessment not completed")
-            else:
-                st.success("Plant Health Assessment completed")
-        with col2:
-            if not st.session_state.fungal_results:
-                st.error("Fungal Network Analysis not completed")
-            else:
-                st.success("Fungal Network Analysis completed")
+with st.sidebar.expander("⚡ Prediction Cache"):
+    for cache_name, cache in (("Plant Health", plant_cache), ("Myco-Net", myco_cache)):
+        stats = cache.stats()
+        st.markdown(f"**{cache_name}:** {stats['hits']} hits / {stats['misses']} misses "
+                    f"({stats['hit_rate']:.0%}), {stats['evictions']} evictions, "
+                    f"{stats['size']}/{stats['maxsize']} entries")
+    if early_exit:
+        trees = [f"{model.average_trees():.1f} {name}" for name, model in
+                 zip(("plant health", "Myco-Net"), early_models) if isinstance(model, EarlyExitForest)]
+        st.markdown(f"**Early exit:** average trees evaluated {', '.join(trees)}")
+    if region_index is not None:
+        st.markdown(f"**Region index:** {region_index.hit_rate():.0%} of fungal rows found a precomputed cell, "
+                    f"{region_index.cells:,} cells")
+    if fast_path:
+        st.markdown(f"**Full-forest fallbacks:** {plant_model.fallback_rate():.0%} plant health, "
+                    f"{myco_model.fallback_rate():.0%} Myco-Net")
 
-elif app_mode == "Test History":
-    st.header("📋 Test History")
-    
-    if st.session_state.test_history:
-        st.info(f"Total tests conducted: {len(st.session_state.test_history)}")
-        
-        # Add filter options
-        col1, col2 = st.columns(2)
-        with col1:
-            filter_status = st.selectbox("Filter by Plant Status", 
-                                       ["All", "Healthy", "Moderate Stress", "High Stress"])
-        with col2:
-            filter_risk = st.selectbox("Filter by Fungal Risk", 
-                                     ["All", "Low Risk", "High Risk"])
-        
-        # Filter tests based on selection
-        filtered_tests = st.session_state.test_history.copy()
-        
-        if filter_status != "All":
-            filtered_tests = [test for test in filtered_tests if test['plant_results']['status'] == filter_status]
-        
-        if filter_risk != "All":
-            filtered_tests = [test for test in filtered_tests if test['fungal_results']['risk_level'] == filter_risk]
-        
-        if not filtered_tests:
-            st.warning("No tests match the selected filters.")
-        else:
-            for i, test in enumerate(reversed(filtered_tests)):
-                plant = test['plant_results']
-                fungal = test['fungal_results']
-                
-                # Create a unique key for each expander
-                expander_key = f"test_{i}_{test['combined_timestamp'].replace(' ', '_').replace(':', '-')}"
-                
-                with st.expander(f"Test on {test['combined_timestamp']}", expanded=False):
-                    st.markdown(f"""
-                    <div class="history-item">
-                        <div class="history-header">
-                            <span>Test from {test['combined_timestamp']}</span>
-                        </div>
-                    """, unsafe_allow_html=True)
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.subheader("🌱 Plant Health")
-                        if plant['status'] == "Healthy":
-                            st.success(f"**Status:** {plant['status']} ({plant['confidence']:.1f}%)")
-                        elif plant['status'] == "Moderate Stress":
-                            st.warning(f"**Status:** {plant['status']} ({plant['confidence']:.1f}%)")
-                        else:
-                            st.error(f"**Status:** {plant['status']} ({plant['confidence']:.1f}%)")
-                        
-                        st.write(f"Soil Moisture: {plant['soil_moisture']}%")
-                        st.write(f"Nitrogen: {plant['nitrogen']} ppm")
-                        st.write(f"Soil pH: {plant['soil_ph']}")
-                    
-                    with col2:
-                        st.subheader("🍄 Fungal Network")
-                        if fungal['risk_level'] == "Low Risk":
-                            st.success(f"**Risk Level:** {fungal['risk_level']} ({fungal['confidence']:.1f}%)")
-                        else:
-                            st.error(f"**Risk Level:** {fungal['risk_level']} ({fungal['confidence']:.1f}%)")
-                        
-                        st.write(f"AMF Colonization: {fungal['amf_colonization']}%")
-                        st.write(f"NSC Level: {fungal['nsc_level']}")
-                        st.write(f"Microbe Type: {fungal['microbe_type']}")
-                    
-                    st.markdown("</div>", unsafe_allow_html=True)
-        
-        # Add export functionality
-        st.markdown("---")
-        st.subheader("Export History")
-        
-        if st.button("Export Test History as CSV", type="secondary"):
-            # Create a DataFrame from the test history
-            history_data = []
-            for test in st.session_state.test_history:
-                plant = test['plant_results']
-                fungal = test['fungal_results']
-                history_data.append({
-                    'Timestamp': test['combined_timestamp'],
-                    'Plant_Status': plant['status'],
-                    'Plant_Confidence': plant['confidence'],
-                    'Soil_Moisture': plant['soil_moisture'],
-                    'Nitrogen_Level': plant['nitrogen'],
-                    'Soil_pH': plant['soil_ph'],
-                    'Fungal_Risk': fungal['risk_level'],
-                    'Fungal_Confidence': fungal['confidence'],
-                    'AMF_Colonization': fungal['amf_colonization'],
-                    'NSC_Level': fungal['nsc_level'],
-                    'Microbe_Type': fungal['microbe_type']
-                })
-            
-            history_df = pd.DataFrame(history_data)
-            csv = history_df.to_csv(index=False)
-            
-            st.download_button(
-                label="Download CSV",
-                data=csv,
-                file_name="myco_net_test_history.csv",
-                mime="text/csv",
-            )
-    else:
-        st.info("📝 No test history yet. Run some analyses and save the results to build your history!")
-        
-    if st.session_state.test_history and st.button("🗑️ Clear All History", type="secondary"):
-        st.session_state.test_history = []
-        st.success("Test history cleared!")
-        st.rerun()
-
-elif app_mode == "Results Dashboard":
-    st.header("📊 Performance Dashboard")
-    
-    ph_features = ['Soil_Moisture', 'Ambient_Temperature', 'Soil_Temperature',
-                   'Humidity', 'Light_Intensity', 'Soil_pH',
-                   'Nitrogen_Level', 'Phosphorus_Level', 'Potassium_Level',
-                   'Chlorophyll_Content', 'Electrochemical_Signal']
-    
-    ph_importance_df = pd.DataFrame({'feature': ph_features, 'importance': plant_model.feature_importances_})
-    
-    myco_features_raw = ['Species', 'Light', 'Microbe', 'AMF', 'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
-    myco_importance_df = pd.DataFrame({'feature': myco_features_raw, 'importance': myco_model.feature_importances_})
-    
-    st.subheader("Feature Importance Comparison")
-    
-    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-    
-    ph_importance_df = ph_importance_df.sort_values('importance', ascending=False)
-    bars1 = sns.barplot(x='importance', y='feature', data=ph_importance_df, ax=ax1, palette="Greens_r")
-    ax1.set_xlabel('Importance')
-    ax1.set_title('Plant Health Model Feature Importance')
-    # Add value labels on bars
-    for i, v in enumerate(ph_importance_df['importance']):
-        ax1.text(v + 0.01, i, f'{v:.2f}', color='black', ha='left', va='center')
-    
-    myco_importance_df = myco_importance_df.sort_values('importance', ascending=False)
-    bars2 = sns.barplot(x='importance', y='feature', data=myco_importance_df, ax=ax2, palette="Oranges_r")
-    ax2.set_xlabel('Importance')
-    ax2.set_title('Myco-Net Model Feature Importance')
-    # Add value labels on bars
-    for i, v in enumerate(myco_importance_df['importance']):
-        ax2.text(v + 0.01, i, f'{v:.2f}', color='black', ha='left', va='center')
-    
-    plt.tight_layout()
-    st.pyplot(fig)
-    
-    # Model performance metrics
-    st.subheader("Model Performance Metrics")
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-        st.metric("Plant Health Model Accuracy", "100%", "0%")
-        st.write("Trained on extensive agricultural data")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown('<div class="card fungal-card">', unsafe_allow_html=True)
-        st.metric("Myco-Net Model Accuracy", "98.13%", "1.87%")
-        st.write("Early warning prediction system")
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Add some statistics if we have test history
-    if st.session_state.test_history:
-        st.subheader("Historical Trends")
-        
-        # Create a DataFrame from the test history
-        history_data = []
-        for test in st.session_state.test_history:
-            plant = test['plant_results']
-            fungal = test['fungal_results']
-            history_data.append({
-                'Timestamp': test['combined_timestamp'],
-                'Plant_Status': plant['status'],
-                'Fungal_Risk': fungal['risk_level'],
-                'Soil_Moisture': plant['soil_moisture'],
-                'Nitrogen_Level': plant['nitrogen'],
-                'AMF_Colonization': fungal['amf_colonization']
-            })
-        
-        history_df = pd.DataFrame(history_data)
-        history_df['Timestamp'] = pd.to_datetime(history_df['Timestamp'])
-        history_df = history_df.sort_values('Timestamp')
-        
-        # Plot trends over time
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        
-        # Soil moisture over time
-        axes[0, 0].plot(history_df['Timestamp'], history_df['Soil_Moisture'], marker='o', color='blue')
-        axes[0, 0].set_title('Soil Moisture Over Time')
-        axes[0, 0].set_ylabel('Soil Moisture (%)')
-        axes[0, 0].tick_params(axis='x', rotation=45)
-        
-        # Nitrogen level over time
-        axes[0, 1].plot(history_df['Timestamp'], history_df['Nitrogen_Level'], marker='o', color='green')
-        axes[0, 1].set_title('Nitrogen Level Over Time')
-        axes[0, 1].set_ylabel('Nitrogen (ppm)')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        
-        # AMF colonization over time
-        axes[1, 0].plot(history_df['Timestamp'], history_df['AMF_Colonization'], marker='o', color='orange')
-        axes[1, 0].set_title('AMF Colonization Over Time')
-        axes[1, 0].set_ylabel('AMF Colonization (%)')
-        axes[1, 0].tick_params(axis='x', rotation=45)
-        
-        # Status counts
-        status_counts = history_df['Plant_Status'].value_counts()
-        axes[1, 1].pie(status_counts.values, labels=status_counts.index, autopct='%1.1f%%', 
-                      colors=['green', 'orange', 'red'])
-        axes[1, 1].set_title('Plant Status Distribution')
-        
-        plt.tight_layout()
-        st.pyplot(fig)
+# --- Page Content ---
+# Each page lives in its own module under views/ and is imported on first visit
+with span('render'):
+    page = importlib.import_module(PAGES[app_mode])
+    page.render(SimpleNamespace(
+        plant_model=plant_model, myco_model=myco_model,
+        plant_cache=plant_cache, myco_cache=myco_cache,
+        le_species=le_species, le_light=le_light, le_microbe=le_microbe,
+        flat_plant_model=flat_plant_model, flat_myco_model=flat_myco_model,
+        batch_plant_model=batch_plant_model, batch_myco_model=batch_myco_model,
+        stream_plant_model=stream_plant_model,
+        history_store=history_store, total_tests=total_tests,
+    ))
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,26 @@
+# assets.py
+"""Locations of the project data/models and a Streamlit-free asset loader."""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(ROOT_DIR, 'models')
+DATA_DIR = os.path.join(ROOT_DIR, 'data')
+
+MODEL_FILES = {
+    'plant_model': 'plant_health_model.pkl',
+    'myco_model': 'myco_net_model.pkl',
+    'le_species': 'species_encoder.pkl',
+    'le_light': 'light_encoder.pkl',
+    'le_microbe': 'microbe_encoder.pkl',
+}
+
+
+def load_assets(models_dir=MODELS_DIR):
+    """Load the models and encoders, in the same order as the app's load_assets().
+
+    Returns (plant_model, myco_model, le_species, le_light, le_microbe).
+    """
+    import joblib
+
+    return tuple(joblib.load(os.path.join(models_dir, filename))
+                 for filename in MODEL_FILES.values())
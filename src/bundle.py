@@ -0,0 +1,218 @@
+# bundle.py
+"""Versioned, memory-mappable model bundle.
+
+A bundle is a directory holding ``manifest.json`` plus one ``.npy`` file per
+forest array. The manifest records the format version, feature names,
+classes and feature importances of each model, the encoder classes and a
+SHA-256 checksum of every array. Arrays are opened with ``mmap_mode='r'``
+so worker processes share a single page-cache copy and loading does not
+unpickle anything.
+
+    python src/bundle.py build    # models/*.pkl -> models/myco_net_bundle/
+    python src/bundle.py verify   # recompute and compare checksums
+    python src/bundle.py bench    # cold start: joblib pickles vs bundle
+"""
+import argparse
+import datetime
+import hashlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+import numpy as np
+
+from assets import MODEL_FILES, MODELS_DIR, load_assets
+from encoding import ENCODED_COLUMNS, EncodingTable
+from forest import FlatForest
+
+FORMAT_VERSION = 1
+BUNDLE_DIR = os.path.join(MODELS_DIR, 'myco_net_bundle')
+MANIFEST = 'manifest.json'
+
+MODEL_NAMES = ['plant_model', 'myco_model']
+ENCODER_NAMES = ['le_species', 'le_light', 'le_microbe']
+FOREST_ARRAYS = ['feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots']
+
+
+class BundleError(Exception):
+    pass
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _bundle_checksum(models):
+    digest = hashlib.sha256()
+    for name in sorted(models):
+        for array in sorted(models[name]['arrays']):
+            digest.update(models[name]['arrays'][array]['sha256'].encode())
+    return digest.hexdigest()
+
+
+def build_bundle(plant_model, myco_model, le_species, le_light, le_microbe,
+                 path=BUNDLE_DIR, sources=None):
+    """Write a bundle for the given models and encoders and return its manifest."""
+    os.makedirs(path, exist_ok=True)
+    models = {}
+    for name, model in zip(MODEL_NAMES, (plant_model, myco_model)):
+        flat = model if isinstance(model, FlatForest) else FlatForest.from_sklearn(model)
+        arrays = {}
+        for array in FOREST_ARRAYS:
+            filename = f"{name}.{array}.npy"
+            data = np.ascontiguousarray(getattr(flat, array))
+            np.save(os.path.join(path, filename), data)
+            arrays[array] = {
+                'file': filename,
+                'dtype': data.dtype.str,
+                'shape': list(data.shape),
+                'sha256': _sha256(os.path.join(path, filename)),
+            }
+        models[name] = {
+            'n_trees': flat.n_trees,
+            'max_depth': flat.max_depth,
+            'features': [str(f) for f in flat.feature_names_in_] if flat.feature_names_in_ is not None else None,
+            'classes': flat.classes_.tolist(),
+            'feature_importances': flat.feature_importances_.tolist(),
+            'arrays': arrays,
+        }
+
+    manifest = {
+        'format_version': FORMAT_VERSION,
+        'created': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'models': models,
+        'encoders': {name: encoder.classes_.tolist()
+                     for name, encoder in zip(ENCODER_NAMES, (le_species, le_light, le_microbe))},
+        'sources': sources or {},
+        'checksum': _bundle_checksum(models),
+    }
+    tmp = os.path.join(path, MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(path, MANIFEST))
+    return manifest
+
+
+def read_manifest(path=BUNDLE_DIR):
+    manifest_path = os.path.join(path, MANIFEST)
+    if not os.path.exists(manifest_path):
+        raise FileNotFoundError(f"No model bundle at {path}")
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != FORMAT_VERSION:
+        raise BundleError(f"Unsupported bundle format {manifest.get('format_version')!r} "
+                          f"(expected {FORMAT_VERSION})")
+    if manifest['checksum'] != _bundle_checksum(manifest['models']):
+        raise BundleError("Bundle manifest checksum does not match its array entries")
+    return manifest
+
+
+def verify_bundle(path=BUNDLE_DIR):
+    """Recompute every array checksum; returns a list of mismatching files."""
+    manifest = read_manifest(path)
+    bad = []
+    for model in manifest['models'].values():
+        for entry in model['arrays'].values():
+            if _sha256(os.path.join(path, entry['file'])) != entry['sha256']:
+                bad.append(entry['file'])
+    return bad
+
+
+def load_bundle(path=BUNDLE_DIR, mmap=True):
+    """Load a bundle as (plant_model, myco_model, le_species, le_light, le_microbe).
+
+    The models are FlatForest instances backed by memory-mapped arrays.
+    Array shapes and dtypes are checked against the manifest; use
+    verify_bundle() for a full checksum pass.
+    """
+    manifest = read_manifest(path)
+    models = []
+    for name in MODEL_NAMES:
+        meta = manifest['models'][name]
+        arrays = {}
+        for array, entry in meta['arrays'].items():
+            data = np.load(os.path.join(path, entry['file']), mmap_mode='r' if mmap else None)
+            if data.dtype.str != entry['dtype'] or list(data.shape) != entry['shape']:
+                raise BundleError(f"{entry['file']} does not match the manifest")
+            arrays[array] = data
+        features = meta['features']
+        models.append(FlatForest(
+            classes=np.asarray(meta['classes']),
+            feature_importances=np.asarray(meta['feature_importances'], dtype=np.float64),
+            max_depth=meta['max_depth'],
+            feature_names=np.asarray(features) if features is not None else None,
+            **arrays))
+
+    encoders = [EncodingTable(manifest['encoders'][name], column)
+                for name, column in zip(ENCODER_NAMES, ENCODED_COLUMNS)]
+    return tuple(models + encoders)
+
+
+def load_flat_assets(models_dir=MODELS_DIR):
+    """Load flat-array models, from the bundle when present and the pickles otherwise."""
+    path = os.path.join(models_dir, os.path.basename(BUNDLE_DIR))
+    if os.path.exists(os.path.join(path, MANIFEST)):
+        return load_bundle(path)
+    plant_model, myco_model, *encoders = load_assets(models_dir)
+    tables = [EncodingTable.from_encoder(encoder, column) for encoder, column in zip(encoders, ENCODED_COLUMNS)]
+    return (FlatForest.from_sklearn(plant_model), FlatForest.from_sklearn(myco_model), *tables)
+
+
+_COLD_START = {
+    'joblib': "from assets import load_assets; load_assets({models_dir!r})",
+    'bundle': "from bundle import load_bundle; load_bundle({bundle_dir!r})",
+}
+
+
+def bench_cold_start(models_dir=MODELS_DIR, bundle_dir=BUNDLE_DIR, repeat=5):
+    """Time imports + loading in fresh interpreters for both formats (seconds)."""
+    src_dir = os.path.dirname(os.path.abspath(__file__))
+    results = {}
+    for name, statement in _COLD_START.items():
+        code = ("import time; start = time.perf_counter(); "
+                + statement.format(models_dir=models_dir, bundle_dir=bundle_dir)
+                + "; print(time.perf_counter() - start)")
+        timings = []
+        for _ in range(repeat):
+            out = subprocess.run([sys.executable, '-c', code], cwd=src_dir, check=True,
+                                 capture_output=True, text=True)
+            timings.append(float(out.stdout.strip().splitlines()[-1]))
+        results[name] = {'median': statistics.median(timings), 'min': min(timings), 'runs': timings}
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build, verify or benchmark the model bundle")
+    parser.add_argument('command', choices=['build', 'verify', 'bench'])
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--bundle-dir', default=BUNDLE_DIR)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        sources = {filename: _sha256(os.path.join(args.models_dir, filename))
+                   for filename in MODEL_FILES.values()}
+        manifest = build_bundle(*load_assets(args.models_dir), path=args.bundle_dir, sources=sources)
+        print(f"Wrote bundle {manifest['checksum'][:12]} to {args.bundle_dir}")
+    elif args.command == 'verify':
+        bad = verify_bundle(args.bundle_dir)
+        if bad:
+            print("Checksum mismatch: " + ", ".join(bad))
+            raise SystemExit(1)
+        print("Bundle OK")
+    else:
+        results = bench_cold_start(args.models_dir, args.bundle_dir, args.repeat)
+        for name, result in results.items():
+            print(f"{name:>7}: median {result['median'] * 1000:.1f} ms, min {result['min'] * 1000:.1f} ms")
+        speedup = results['joblib']['median'] / results['bundle']['median']
+        print(f"Bundle cold start is {speedup:.1f}x the speed of the joblib path")
+
+
+if __name__ == '__main__':
+    main()
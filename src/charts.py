@@ -0,0 +1,121 @@
+# charts.py
+"""Feature-importance, what-if and explanation charts rendered to PNG bytes.
+
+The importance figures only depend on the models' feature_importances_, so
+the app caches the PNG keyed on model_version(). Every figure is closed
+right after it is rasterized to avoid leaking matplotlib state in
+long-running servers.
+"""
+import hashlib
+import io
+
+import numpy as np
+import pandas as pd
+
+MYCO_FEATURES_RAW = ['Species', 'Light', 'Microbe', 'AMF', 'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
+
+
+def model_version(model):
+    """Short hash identifying what a model's charts are built from."""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(model.feature_importances_, dtype=np.float64).tobytes())
+    digest.update(repr(np.asarray(model.classes_).tolist()).encode())
+    return digest.hexdigest()[:16]
+
+
+def _to_png(fig):
+    import matplotlib.pyplot as plt
+
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, format='png', bbox_inches='tight')
+    finally:
+        plt.close(fig)
+    return buffer.getvalue()
+
+
+def _importance_bars(ax, features, importances, palette, title, value_labels):
+    import seaborn as sns
+
+    importance_df = pd.DataFrame({'feature': features, 'importance': importances})
+    importance_df = importance_df.sort_values('importance', ascending=False)
+    sns.barplot(x='importance', y='feature', data=importance_df, ax=ax, palette=palette)
+    ax.set_xlabel('Importance')
+    ax.set_title(title)
+    if value_labels:
+        # Add value labels on bars
+        for i, v in enumerate(importance_df['importance']):
+            ax.text(v + 0.01, i, f'{v:.2f}', color='black', ha='left', va='center')
+
+
+def fungal_importance_png(features, importances):
+    """Importance chart shown after a fungal network analysis."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    _importance_bars(ax, features, importances, "Oranges_r",
+                     'Feature Importance in Fungal Network Analysis', value_labels=False)
+    return _to_png(fig)
+
+
+def importance_comparison_png(ph_features, ph_importances, myco_features, myco_importances):
+    """Side-by-side importance charts for the Results Dashboard."""
+    import matplotlib.pyplot as plt
+
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    _importance_bars(ax1, ph_features, ph_importances, "Greens_r",
+                     'Plant Health Model Feature Importance', value_labels=True)
+    _importance_bars(ax2, myco_features, myco_importances, "Oranges_r",
+                     'Myco-Net Model Feature Importance', value_labels=True)
+    plt.tight_layout()
+    return _to_png(fig)
+
+
+def response_surface_png(x_values, y_values, values, x_label, y_label, title, value_label, marker=None):
+    """Heatmap of a 2-D what-if sweep (values has shape (len(y_values), len(x_values))).
+
+    ``marker`` optionally marks the current (x, y) inputs.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(9, 6))
+    image = ax.imshow(values, origin='lower', aspect='auto', cmap='RdYlGn', vmin=0, vmax=1,
+                      extent=(x_values[0], x_values[-1], y_values[0], y_values[-1]))
+    fig.colorbar(image, ax=ax, label=value_label)
+    if marker is not None:
+        ax.plot(*marker, marker='o', linestyle='none', markersize=10, markerfacecolor='none',
+                markeredgecolor='black', markeredgewidth=2, label='Current inputs')
+        ax.legend(loc='upper right')
+    ax.set_xlabel(x_label)
+    ax.set_ylabel(y_label)
+    ax.set_title(title)
+    return _to_png(fig)
+
+
+def response_curve_png(x_values, proba, classes, x_label, title):
+    """Class probabilities along a 1-D what-if sweep."""
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(9, 5))
+    for i, label in enumerate(classes):
+        ax.plot(x_values, proba[:, i], label=str(label))
+    ax.set_xlabel(x_label)
+    ax.set_ylabel('Probability')
+    ax.set_ylim(0, 1)
+    ax.set_title(title)
+    ax.legend()
+    return _to_png(fig)
+
+
+def contributions_png(contributions, title, xlabel):
+    """Horizontal bars of one prediction's feature contributions (a Series), largest first."""
+    import matplotlib.pyplot as plt
+
+    ordered = contributions.reindex(contributions.abs().sort_values().index)
+    fig, ax = plt.subplots(figsize=(9, 0.45 * len(ordered) + 1.5))
+    colors = np.where(ordered.to_numpy() >= 0, '#2E8B57', '#FF4500')
+    ax.barh(ordered.index, ordered.to_numpy(), color=colors)
+    ax.axvline(0, color='black', linewidth=0.8)
+    ax.set_xlabel(xlabel)
+    ax.set_title(title)
+    return _to_png(fig)
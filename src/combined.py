@@ -0,0 +1,169 @@
+# combined.py
+"""Combined plant health + fungal network scoring for whole fields.
+
+A plant-sensor table and a fungal table are joined on a plot or plant ID.
+Every plant reading is matched with the fungal record of its ID, so
+several readings can share one fungal record. plant_model and myco_model
+then score the joined rows concurrently on a two-thread pool, because the
+forests' traversal runs in NumPy/Cython code that releases the GIL. The
+overall verdict and recommendations come from one np.select over the two
+prediction columns.
+
+    python src/combined.py plants.csv fungal.csv combined.csv --key Plant_ID
+    python src/combined.py --bench --rows 100000   # sequential vs thread pool
+"""
+import argparse
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from datasets import MYCO_RAW_FEATURES, encode_myco_features
+from scoring import PH_FEATURES, fungal_risk_level, predict_with_confidence
+
+DEFAULT_KEY = 'Plant_ID'
+
+OPTIMAL = "Optimal Health"
+CRITICAL = "Critical Attention Needed"
+MONITORING = "Monitoring Required"
+
+RECOMMENDATIONS = {
+    OPTIMAL: ["Maintain current practices", "Continue regular monitoring", "No immediate action needed"],
+    CRITICAL: ["Immediate intervention required", "Adjust irrigation and fertilization",
+               "Consider soil amendments", "Monitor closely for changes"],
+    MONITORING: ["Monitor specific parameters", "Consider slight adjustments to practices",
+                 "Schedule follow-up assessment"],
+}
+
+
+def combined_verdict(plant_status, risk_level):
+    """Overall verdict per row from the plant statuses and fungal risk levels."""
+    plant_status = np.asarray(plant_status)
+    risk_level = np.asarray(risk_level)
+    return np.select(
+        [(plant_status == "Healthy") & (risk_level == "Low Risk"),
+         (plant_status == "High Stress") | (risk_level == "High Risk")],
+        [OPTIMAL, CRITICAL],
+        default=MONITORING,
+    )
+
+
+def join_tables(plant_df, fungal_df, key=DEFAULT_KEY):
+    """Inner join of plant readings with their plot's fungal record.
+
+    Raises ValueError if a table lacks the key or a required column, or if
+    the fungal table has more than one record per key.
+    """
+    for name, frame, columns in (('Plant', plant_df, PH_FEATURES), ('Fungal', fungal_df, MYCO_RAW_FEATURES)):
+        missing = [col for col in [key] + columns if col not in frame.columns]
+        if missing:
+            raise ValueError(f"{name} table is missing required columns: {', '.join(missing)}")
+    fungal_df = fungal_df[[key] + [col for col in fungal_df.columns if col != key]]
+    try:
+        return plant_df.merge(fungal_df, on=key, how='inner', suffixes=('', '_fungal'),
+                              validate='many_to_one')
+    except pd.errors.MergeError:
+        raise ValueError(f"Fungal table has more than one record per {key}")
+
+
+def score_joined(plant_model, myco_model, joined, encoders, executor=None):
+    """Score joined rows with both models and add the combined verdict.
+
+    ``encoders`` is (le_species, le_light, le_microbe). Both models run at
+    the same time on ``executor`` (a new two-thread pool if None).
+    """
+    X_myco = encode_myco_features(joined, *encoders)
+    own_executor = executor is None
+    executor = executor or ThreadPoolExecutor(max_workers=2)
+    try:
+        plant_future = executor.submit(predict_with_confidence, plant_model, joined[PH_FEATURES])
+        myco_future = executor.submit(predict_with_confidence, myco_model, X_myco)
+        plant_labels, plant_confidence, _ = plant_future.result()
+        myco_labels, myco_confidence, _ = myco_future.result()
+    finally:
+        if own_executor:
+            executor.shutdown()
+    risk_level = fungal_risk_level(myco_labels)
+    verdict = combined_verdict(plant_labels, risk_level)
+    recommendations = {name: "; ".join(items) for name, items in RECOMMENDATIONS.items()}
+    return joined.assign(
+        Plant_Status=plant_labels,
+        Plant_Confidence=np.round(plant_confidence, 2),
+        Risk_Level=risk_level,
+        Fungal_Confidence=np.round(myco_confidence, 2),
+        Verdict=verdict,
+        Recommendations=pd.Series(verdict, index=joined.index).map(recommendations),
+    )
+
+
+def score_combined(plant_model, myco_model, plant_df, fungal_df, encoders, key=DEFAULT_KEY, executor=None):
+    """Join the two tables on ``key`` and score every joined row (see score_joined)."""
+    return score_joined(plant_model, myco_model, join_tables(plant_df, fungal_df, key), encoders, executor)
+
+
+def sample_tables(rows, seed=0):
+    """Plant and fungal tables built from the datasets, ``rows`` readings over rows // 10 plants."""
+    from datasets import load_myco_frame, load_plant_data
+
+    rng = np.random.default_rng(seed)
+    X_plant, _ = load_plant_data()
+    myco_df = load_myco_frame()
+    n_plants = max(1, rows // 10)
+    plant_df = X_plant.iloc[rng.integers(0, len(X_plant), rows)].reset_index(drop=True)
+    plant_df.insert(0, DEFAULT_KEY, rng.integers(1, n_plants + 1, rows))
+    fungal_df = myco_df[MYCO_RAW_FEATURES].iloc[rng.integers(0, len(myco_df), n_plants)].reset_index(drop=True)
+    fungal_df.insert(0, DEFAULT_KEY, np.arange(1, n_plants + 1))
+    return plant_df, fungal_df
+
+
+def main():
+    from functools import lru_cache
+
+    from assets import load_assets
+    from bundle import load_flat_assets
+    from forest import BatchRouter
+
+    parser = argparse.ArgumentParser(description="Combined plant health and fungal risk for a whole field")
+    parser.add_argument('plants', nargs='?', help="CSV of plant sensor readings")
+    parser.add_argument('fungal', nargs='?', help="CSV of fungal records, one per key")
+    parser.add_argument('output', nargs='?')
+    parser.add_argument('--key', default=DEFAULT_KEY)
+    parser.add_argument('--bench', action='store_true', help="Time sequential vs concurrent scoring instead")
+    parser.add_argument('--rows', type=int, default=100000, help="Plant readings used by --bench")
+    args = parser.parse_args()
+
+    plant_model, myco_model, *encoders = load_flat_assets()
+    # Calls above LARGE_BATCH_ROWS rows go to the pickled forests, loaded once on first use
+    pickled = lru_cache()(load_assets)
+    plant_model = BatchRouter(plant_model, lambda: pickled()[0])
+    myco_model = BatchRouter(myco_model, lambda: pickled()[1])
+    if args.bench:
+        plant_df, fungal_df = sample_tables(args.rows)
+        joined = join_tables(plant_df, fungal_df)
+        X_myco = encode_myco_features(joined, *encoders)
+        start = time.perf_counter()
+        predict_with_confidence(plant_model, joined[PH_FEATURES])
+        predict_with_confidence(myco_model, X_myco)
+        sequential = time.perf_counter() - start
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            start = time.perf_counter()
+            scored = score_joined(plant_model, myco_model, joined, encoders, executor)
+            concurrent = time.perf_counter() - start
+        print(f"{len(scored):,} joined rows: sequential models {sequential * 1000:.0f} ms, "
+              f"thread pool incl. encoding and verdicts {concurrent * 1000:.0f} ms")
+        print(scored['Verdict'].value_counts().to_string())
+        return
+    if not (args.plants and args.fungal and args.output):
+        parser.error("plants, fungal and output are required unless --bench is given")
+
+    start = time.perf_counter()
+    scored = score_combined(plant_model, myco_model, pd.read_csv(args.plants), pd.read_csv(args.fungal),
+                            encoders, args.key)
+    scored.to_csv(args.output, index=False)
+    print(f"Scored {len(scored):,} joined rows in {time.perf_counter() - start:.2f}s -> {args.output}")
+    print(scored['Verdict'].value_counts().to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,244 @@
+# dataset_store.py
+"""Typed, memory-mapped columnar copies of the datasets in data/.
+
+Each dataset is a directory holding ``manifest.json`` and one raw binary
+file per column:
+
+  * numeric columns keep their dtype (int64 / float64, NaN for NA),
+  * timestamp columns are stored as int64 nanoseconds (datetime64[ns]),
+  * string columns (Species, Light, Microbe, Plant_Health_Status, ...) are
+    dictionary-encoded: int32 codes, -1 for missing, with the dictionary
+    in the manifest.
+
+Loading maps the column files read-only, so numeric features come back as
+views of the page cache without parsing. Appending writes the new rows to
+the end of every column file and then replaces the manifest. Existing
+bytes are never rewritten, and readers only see rows that the manifest
+has committed.
+
+The manifest records the size and modification time of the CSV a store
+was converted from. is_current() compares them with the CSV on disk, so
+callers can tell when the CSV was edited or replaced after conversion.
+
+    python src/dataset_store.py convert                   # data/*.csv -> data/store/
+    python src/dataset_store.py append plant_health new_readings.csv
+    python src/dataset_store.py bench                     # pd.read_csv vs the store
+"""
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from assets import DATA_DIR
+
+FORMAT_VERSION = 1
+STORE_DIR = os.path.join(DATA_DIR, 'store')
+MANIFEST = 'manifest.json'
+CODE_DTYPE = np.dtype(np.int32)
+
+DATASETS = {
+    'plant_health': {'csv': os.path.join(DATA_DIR, 'plant_health_data.csv'), 'timestamps': ['Timestamp']},
+    'tree_data': {'csv': os.path.join(DATA_DIR, 'Tree_Data.csv'), 'timestamps': []},
+}
+
+
+class StoreError(Exception):
+    pass
+
+
+def _column_spec(name, series, timestamps):
+    if name in timestamps:
+        return {'name': name, 'kind': 'timestamp', 'dtype': '<i8'}
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return {'name': name, 'kind': 'numeric', 'dtype': series.dtype.str}
+    return {'name': name, 'kind': 'category', 'dtype': CODE_DTYPE.str, 'categories': []}
+
+
+def _encode_column(spec, series):
+    """Raw values to append for one column; extends the dictionary in ``spec``."""
+    if spec['kind'] == 'timestamp':
+        values = pd.to_datetime(series).to_numpy(dtype='datetime64[ns]')
+        return values.view(np.int64)
+    if spec['kind'] == 'numeric':
+        try:
+            return series.to_numpy(dtype=np.dtype(spec['dtype']))
+        except (TypeError, ValueError):
+            raise StoreError(f"Column {spec['name']} cannot be stored as {np.dtype(spec['dtype'])}")
+    # Existing codes never change: unseen categories are added to the end
+    categories = spec['categories']
+    values = series.astype(object)
+    present = values.notna().to_numpy()
+    strings = values[present].astype(str)
+    known = set(categories)
+    categories.extend(value for value in pd.unique(strings) if value not in known)
+    codes = np.full(len(series), -1, dtype=CODE_DTYPE)
+    codes[present] = pd.Index(categories).get_indexer(strings)
+    return codes
+
+
+class DatasetStore:
+    """A columnar dataset directory; see the module docstring for the layout."""
+
+    def __init__(self, path):
+        self.path = path
+        manifest_path = os.path.join(path, MANIFEST)
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError(f"No dataset store at {path}")
+        with open(manifest_path) as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('format_version') != FORMAT_VERSION:
+            raise StoreError(f"Unsupported store format {self.manifest.get('format_version')!r}")
+        self._specs = {spec['name']: spec for spec in self.manifest['columns']}
+
+    @classmethod
+    def create(cls, frame, path, timestamps=(), source=None):
+        """Write ``frame`` as a new store at ``path`` (replacing any existing one)."""
+        os.makedirs(path, exist_ok=True)
+        columns = [_column_spec(name, frame[name], timestamps) for name in frame.columns]
+        for i, spec in enumerate(columns):
+            spec['file'] = f"{i:03d}.bin"
+            open(os.path.join(path, spec['file']), 'wb').close()
+        _write_manifest(path, {'format_version': FORMAT_VERSION, 'rows': 0,
+                               'columns': columns, 'source': source})
+        store = cls(path)
+        store.append(frame)
+        return store
+
+    @property
+    def rows(self):
+        return self.manifest['rows']
+
+    @property
+    def columns(self):
+        return list(self._specs)
+
+    def is_current(self, csv):
+        """False if ``csv`` has changed since the store was converted from it."""
+        if not os.path.exists(csv):
+            return True
+        return self.manifest.get('source') == _source_stat(csv)
+
+    def categories(self, name):
+        return list(self._specs[name].get('categories', []))
+
+    def column(self, name):
+        """Read-only memory map of a column's stored values (codes for categories)."""
+        spec = self._specs[name]
+        if not self.rows:
+            return np.empty(0, dtype=np.dtype(spec['dtype']))
+        return np.memmap(os.path.join(self.path, spec['file']), dtype=np.dtype(spec['dtype']),
+                         mode='r', shape=(self.rows,))
+
+    def series(self, name):
+        spec = self._specs[name]
+        values = self.column(name)
+        if spec['kind'] == 'timestamp':
+            return pd.Series(values.view('datetime64[ns]'), name=name, copy=False)
+        if spec['kind'] == 'category':
+            return pd.Series(pd.Categorical.from_codes(values, spec['categories']), name=name)
+        return pd.Series(values, name=name, copy=False)
+
+    def frame(self, columns=None):
+        """DataFrame of the requested columns; numeric columns are memory-mapped views."""
+        columns = self.columns if columns is None else list(columns)
+        missing = [name for name in columns if name not in self._specs]
+        if missing:
+            raise KeyError(f"Columns not in the store: {', '.join(missing)}")
+        return pd.DataFrame({name: self.series(name) for name in columns}, copy=False)
+
+    def append(self, frame):
+        """Append rows (a DataFrame with the store's columns); returns the new row count."""
+        missing = [name for name in self.columns if name not in frame.columns]
+        if missing:
+            raise StoreError(f"Rows are missing columns: {', '.join(missing)}")
+        manifest = json.loads(json.dumps(self.manifest))
+        specs = {spec['name']: spec for spec in manifest['columns']}
+        encoded = {name: _encode_column(specs[name], frame[name]) for name in self.columns}
+        for name, values in encoded.items():
+            path = os.path.join(self.path, specs[name]['file'])
+            with open(path, 'r+b') as f:
+                # Drop bytes left by an append that never reached the manifest
+                f.truncate(self.rows * values.dtype.itemsize)
+                f.seek(0, os.SEEK_END)
+                f.write(np.ascontiguousarray(values).tobytes())
+        manifest['rows'] = self.rows + len(frame)
+        _write_manifest(self.path, manifest)
+        self.manifest = manifest
+        self._specs = specs
+        return self.rows
+
+
+def _write_manifest(path, manifest):
+    tmp = os.path.join(path, MANIFEST + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(path, MANIFEST))
+
+
+def dataset_path(name, store_dir=STORE_DIR):
+    return os.path.join(store_dir, name)
+
+
+def open_dataset(name, store_dir=STORE_DIR):
+    """The store for a DATASETS entry, or None if it has not been converted."""
+    try:
+        return DatasetStore(dataset_path(name, store_dir))
+    except FileNotFoundError:
+        return None
+
+
+def _source_stat(csv):
+    stat = os.stat(csv)
+    return {'file': os.path.basename(csv), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def convert(name, store_dir=STORE_DIR, csv=None):
+    spec = DATASETS[name]
+    csv = csv or spec['csv']
+    frame = pd.read_csv(csv)
+    return DatasetStore.create(frame, dataset_path(name, store_dir), spec['timestamps'],
+                               source=_source_stat(csv))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Columnar, memory-mapped copies of the datasets in data/")
+    sub = parser.add_subparsers(dest='command', required=True)
+    sub.add_parser('convert', help="Convert the CSV files in data/")
+    append = sub.add_parser('append', help="Append rows from a CSV file")
+    append.add_argument('dataset', choices=list(DATASETS))
+    append.add_argument('csv')
+    sub.add_parser('bench', help="Compare load time with pd.read_csv")
+    parser.add_argument('--store-dir', default=STORE_DIR)
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        for name in DATASETS:
+            store = convert(name, args.store_dir)
+            print(f"{name}: {store.rows} rows, {len(store.columns)} columns -> {store.path}")
+    elif args.command == 'append':
+        store = open_dataset(args.dataset, args.store_dir)
+        if store is None:
+            raise SystemExit(f"Convert {args.dataset} first: python src/dataset_store.py convert")
+        before = store.rows
+        store.append(pd.read_csv(args.csv))
+        print(f"{args.dataset}: appended {store.rows - before} rows ({store.rows} total)")
+    else:
+        for name, spec in DATASETS.items():
+            store = open_dataset(name, args.store_dir)
+            if store is None:
+                raise SystemExit("Convert the datasets first: python src/dataset_store.py convert")
+            start = time.perf_counter()
+            pd.read_csv(spec['csv'], parse_dates=spec['timestamps'])
+            csv_seconds = time.perf_counter() - start
+            start = time.perf_counter()
+            DatasetStore(store.path).frame()
+            store_seconds = time.perf_counter() - start
+            print(f"{name}: read_csv {csv_seconds * 1000:.2f} ms, store {store_seconds * 1000:.2f} ms "
+                  f"({csv_seconds / store_seconds:.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# datasets.py
+"""Loading of the two project datasets into model-ready feature frames.
+
+The default datasets are read from the memory-mapped columnar store in
+data/store/ when it has been built (python src/dataset_store.py convert)
+and the CSV has not changed since, and from the CSV files otherwise. Both
+paths return the same dtypes.
+"""
+import os
+import warnings
+
+import pandas as pd
+
+from assets import DATA_DIR
+from dataset_store import open_dataset
+from scoring import MYCO_FEATURES, PH_FEATURES
+
+PLANT_DATA = os.path.join(DATA_DIR, 'plant_health_data.csv')
+TREE_DATA = os.path.join(DATA_DIR, 'Tree_Data.csv')
+
+PLANT_TARGET = 'Plant_Health_Status'
+MYCO_RAW_FEATURES = ['Species', 'Light', 'Microbe', 'AMF', 'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
+MYCO_TARGET = 'Event'
+
+
+def _read(path, dataset, columns):
+    store = open_dataset(dataset) if path in (PLANT_DATA, TREE_DATA) else None
+    if store is not None and not store.is_current(path):
+        warnings.warn(f"{path} changed after data/store/{dataset} was built; reading the CSV instead "
+                      "(rebuild the store with python src/dataset_store.py convert)")
+        store = None
+    if store is None:
+        return pd.read_csv(path)[columns]
+    frame = store.frame(columns)
+    # Dictionary-encoded columns come back as strings, as read_csv gives them
+    return frame.astype({name: frame[name].cat.categories.dtype for name in columns
+                         if isinstance(frame[name].dtype, pd.CategoricalDtype)})
+
+
+def load_plant_data(path=PLANT_DATA):
+    """Return (X, y) for the plant health model."""
+    df = _read(path, 'plant_health', PH_FEATURES + [PLANT_TARGET])
+    return df[PH_FEATURES], df[PLANT_TARGET]
+
+
+def load_myco_frame(path=TREE_DATA):
+    """Return the Tree_Data rows used by Myco-Net (raw categories, NA rows dropped)."""
+    return _read(path, 'tree_data', MYCO_RAW_FEATURES + [MYCO_TARGET]).dropna()
+
+
+def encode_myco(myco_df, le_species, le_light, le_microbe):
+    """Return (X, y) for the Myco-Net model using fitted encoders."""
+    return encode_myco_features(myco_df, le_species, le_light, le_microbe), myco_df[MYCO_TARGET]
+
+
+def encode_myco_features(myco_df, le_species, le_light, le_microbe):
+    """Return the Myco-Net feature frame for raw fungal rows (no target needed)."""
+    return pd.DataFrame({
+        'Species_encoded': le_species.transform(myco_df['Species']),
+        'Light_encoded': le_light.transform(myco_df['Light']),
+        'Microbe_encoded': le_microbe.transform(myco_df['Microbe']),
+        'AMF': myco_df['AMF'],
+        'PHN_Imp': myco_df['PHN_Imp'],
+        'NSC_Imp': myco_df['NSC_Imp'],
+        'LIG_Imp': myco_df['LIG_Imp'],
+    }, index=myco_df.index, columns=MYCO_FEATURES)
@@ -0,0 +1,214 @@
+# distill.py
+"""Compact "fast path" models distilled from the full forests.
+
+A small regression tree is fitted on the full forest's predict_proba, over
+the training rows plus synthetic rows drawn from the per-feature training
+distributions, so the compact model learns the forest's decision regions
+and how sure the forest is. It is exported as a FlatForest
+(models/*_compact.npz) together with the fingerprint of the forest it was
+distilled from, so a retrained forest is not served stale compact models.
+
+CascadeModel scores every row with the compact model first and only sends
+the rows whose compact confidence is below a threshold to the full forest.
+Those are the rows near a decision boundary.
+
+    python src/distill.py            # distill the saved models and report fidelity
+    python src/train_and_save_models.py --distill
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from assets import MODELS_DIR
+from forest import FlatForest, forest_fingerprint
+
+COMPACT_FILES = {
+    'plant_model': 'plant_health_compact.npz',
+    'myco_model': 'myco_net_compact.npz',
+}
+
+N_TREES = 1
+MAX_DEPTH = 8
+MIN_SAMPLES_LEAF = 5
+AUGMENT_FACTOR = 10
+CASCADE_THRESHOLD = 0.8
+
+
+def augment(X, factor=AUGMENT_FACTOR, random_state=42):
+    """Training rows plus ``factor`` times as many rows whose features are
+    drawn independently from each column of X."""
+    rng = np.random.default_rng(random_state)
+    synthetic = pd.DataFrame({column: rng.choice(X[column].to_numpy(), factor * len(X)) for column in X.columns})
+    return pd.concat([X, synthetic], ignore_index=True)
+
+
+def distill(model, X, n_trees=N_TREES, max_depth=MAX_DEPTH, min_samples_leaf=MIN_SAMPLES_LEAF,
+            factor=AUGMENT_FACTOR, random_state=42):
+    """Fit a compact model approximating ``model`` on X; returns a FlatForest."""
+    from sklearn.ensemble import RandomForestRegressor
+
+    X_student = augment(X, factor, random_state)
+    target = model.predict_proba(X_student)
+    student = RandomForestRegressor(
+        n_estimators=n_trees, max_depth=max_depth, min_samples_leaf=min_samples_leaf,
+        bootstrap=n_trees > 1, max_features=None if n_trees == 1 else 0.6, random_state=random_state,
+    ).fit(X_student, target)
+    return FlatForest.from_sklearn(student, classes=model.classes_)
+
+
+class CascadeModel:
+    """Compact model first, full forest for the rows it is unsure about.
+
+    Rows whose highest compact probability is at least ``threshold`` keep
+    the compact probabilities; the rest get the full model's.
+    """
+
+    def __init__(self, compact, full, threshold=CASCADE_THRESHOLD):
+        if not np.array_equal(np.asarray(compact.classes_), np.asarray(full.classes_)):
+            raise ValueError("The compact and full models predict different classes")
+        self.compact = compact
+        self.full = full
+        self.threshold = threshold
+        self.rows = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    @property
+    def classes_(self):
+        return self.full.classes_
+
+    @property
+    def feature_importances_(self):
+        return self.full.feature_importances_
+
+    @property
+    def feature_names_in_(self):
+        return getattr(self.full, 'feature_names_in_', None)
+
+    def predict_proba(self, X):
+        proba = self.compact.predict_proba(X)
+        unsure = proba.max(axis=1) < self.threshold
+        if unsure.any():
+            rows = X.iloc[unsure] if hasattr(X, 'iloc') else np.asarray(X)[unsure]
+            proba[unsure] = self.full.predict_proba(rows)
+        with self._lock:
+            self.rows += len(proba)
+            self.fallbacks += int(unsure.sum())
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def fallback_rate(self):
+        return self.fallbacks / self.rows if self.rows else 0.0
+
+
+def compact_models_available(models_dir=MODELS_DIR):
+    return all(os.path.exists(os.path.join(models_dir, filename)) for filename in COMPACT_FILES.values())
+
+
+def save_compact(compact, teacher, path):
+    """Save a compact model with the fingerprint of the forest it was distilled from."""
+    teacher = teacher if isinstance(teacher, FlatForest) else FlatForest.from_sklearn(teacher)
+    np.savez(path, teacher_fingerprint=np.array(forest_fingerprint(teacher)), **compact.arrays())
+
+
+def load_compact_models(models_dir=MODELS_DIR, forests=None):
+    """Return {'plant_model': FlatForest, 'myco_model': FlatForest}.
+
+    With ``forests`` ({name: FlatForest}), raises ValueError if a compact
+    model was distilled from another forest.
+    """
+    models = {}
+    for name, filename in COMPACT_FILES.items():
+        path = os.path.join(models_dir, filename)
+        with np.load(path) as arrays:
+            teacher = str(arrays['teacher_fingerprint']) if 'teacher_fingerprint' in arrays.files else None
+            if forests is not None and teacher != forest_fingerprint(forests[name]):
+                raise ValueError(f"{path} was distilled from a different model; redistill it with "
+                                 "python src/distill.py")
+            models[name] = FlatForest.from_arrays({key: arrays[key] for key in arrays.files})
+    return models
+
+
+def _best_time(function, X, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(X)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def fidelity_report(full, compact, X, threshold=CASCADE_THRESHOLD):
+    """Agreement with the full model and speed of the compact and cascade models on X.
+
+    Timings compare flat-array models, so the speedup measures the model
+    size and not the inference engine.
+    """
+    full = full if isinstance(full, FlatForest) else FlatForest.from_sklearn(full)
+    cascade = CascadeModel(compact, full, threshold)
+    expected = full.predict(X)
+    compact_labels = compact.predict(X)
+    cascade_labels = cascade.predict(X)
+    full_seconds = _best_time(full.predict_proba, X)
+    cascade_seconds = _best_time(cascade.predict_proba, X)
+    single = X.iloc[:1] if hasattr(X, 'iloc') else X[:1]
+    return {
+        'rows': len(X),
+        'threshold': threshold,
+        'full_nodes': len(full.feature),
+        'compact_nodes': len(compact.feature),
+        'compact_agreement': float(np.mean(compact_labels == expected)),
+        'cascade_agreement': float(np.mean(cascade_labels == expected)),
+        'fallback_rate': float(np.mean(compact.predict_proba(X).max(axis=1) < threshold)),
+        'full_ms': round(full_seconds * 1000, 3),
+        'compact_ms': round(_best_time(compact.predict_proba, X) * 1000, 3),
+        'cascade_ms': round(cascade_seconds * 1000, 3),
+        'speedup': round(full_seconds / cascade_seconds, 2),
+        'single_row_speedup': round(_best_time(full.predict_proba, single, 50)
+                                    / _best_time(compact.predict_proba, single, 50), 2),
+    }
+
+
+def print_report(name, report):
+    print(f"{name}: {report['compact_nodes']} nodes (full forest {report['full_nodes']}), "
+          f"agreement {report['compact_agreement']:.2%} compact / {report['cascade_agreement']:.2%} cascade, "
+          f"{report['fallback_rate']:.1%} of rows fall back, "
+          f"{report['speedup']:.1f}x faster on {report['rows']} rows, "
+          f"{report['single_row_speedup']:.1f}x on a single row")
+
+
+def main():
+    from sklearn.model_selection import train_test_split
+
+    from assets import load_assets
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+    from train_and_save_models import MYCO_TEST_SIZE, PLANT_TEST_SIZE, RANDOM_STATE
+
+    parser = argparse.ArgumentParser(description="Distill compact fast-path models from the saved forests")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--threshold', type=float, default=CASCADE_THRESHOLD)
+    parser.add_argument('--max-depth', type=int, default=MAX_DEPTH)
+    parser.add_argument('--n-trees', type=int, default=N_TREES)
+    args = parser.parse_args()
+
+    plant_model, myco_model, le_species, le_light, le_microbe = load_assets(args.models_dir)
+    X_plant, _ = load_plant_data()
+    X_myco, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+    splits = {
+        'plant_model': (plant_model, train_test_split(X_plant, test_size=PLANT_TEST_SIZE, random_state=RANDOM_STATE)),
+        'myco_model': (myco_model, train_test_split(X_myco, test_size=MYCO_TEST_SIZE, random_state=RANDOM_STATE)),
+    }
+    for name, (model, (X_train, X_test)) in splits.items():
+        compact = distill(model, X_train, args.n_trees, args.max_depth)
+        save_compact(compact, model, os.path.join(args.models_dir, COMPACT_FILES[name]))
+        print_report(name, fidelity_report(model, compact, X_test, args.threshold))
+
+
+if __name__ == '__main__':
+    main()
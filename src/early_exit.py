@@ -0,0 +1,212 @@
+# early_exit.py
+"""Early-exit scoring: stop evaluating trees once a row's label is settled.
+
+The trees of a FlatForest are evaluated a few at a time in a learned
+order, with the trees that most often agree with the whole forest first.
+After each block, the rows whose label is settled drop out. Two stopping
+rules are available:
+
+  * ``margin``: stop when the leading class can no longer be overtaken.
+    The lead over the runner-up must exceed the most the remaining trees
+    could still swing the vote. Labels always equal full evaluation.
+  * ``hoeffding``: stop when a Hoeffding bound on the mean per-tree margin
+    says the leader wins the final vote with probability at least
+    1 - delta. Far fewer trees are evaluated, at the cost of rare label
+    flips.
+
+Rows that go through every tree get the full forest's probabilities
+bit-for-bit. Rows that stop early get the average of the trees
+evaluated so far, so their confidence is an estimate.
+
+    python src/early_exit.py --mode margin
+    python src/early_exit.py --mode hoeffding --delta 0.01
+"""
+import argparse
+import threading
+import time
+
+import numpy as np
+
+MODES = ['margin', 'hoeffding']
+BLOCK_SIZE = 4
+DEFAULT_DELTA = 0.05
+# Tolerance for the rounding of the partial sums in the margin test
+MARGIN_EPSILON = 1e-9
+
+
+def learn_order(forest, X):
+    """Tree order for early exit: trees agreeing most with the forest's labels on X first."""
+    leaves = forest.apply(X)
+    labels = np.argmax(forest.predict_proba(X), axis=1)
+    agreement = np.array([np.mean(np.argmax(forest.value[leaves[:, t]], axis=1) == labels)
+                          for t in range(forest.n_trees)])
+    return np.argsort(-agreement, kind='stable')
+
+
+def tree_swings(forest):
+    """Largest gap between two classes' probabilities in any leaf of each tree.
+
+    That is the most one tree can move the vote between two classes.
+    """
+    spread = forest.value.max(axis=1) - forest.value.min(axis=1)
+    swings = np.zeros(forest.n_trees)
+    # Walk down from every root; trees of a pruned forest may share nodes
+    trees, nodes = np.arange(forest.n_trees), forest.roots
+    while nodes.size:
+        leaf = forest._is_leaf[nodes]
+        np.maximum.at(swings, trees[leaf], spread[nodes[leaf]])
+        trees, nodes = trees[~leaf], nodes[~leaf]
+        trees = np.concatenate([trees, trees])
+        nodes = np.concatenate([forest.left[nodes], forest.right[nodes]])
+    return swings
+
+
+class EarlyExitForest:
+    """Model-like wrapper (classes_, predict_proba) evaluating a FlatForest with early exit."""
+
+    def __init__(self, forest, order=None, mode='margin', delta=DEFAULT_DELTA, block_size=BLOCK_SIZE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown early-exit mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.forest = forest
+        self.order = np.arange(forest.n_trees) if order is None else np.asarray(order)
+        self.mode = mode
+        self.delta = delta
+        self.block_size = block_size
+        # Most the trees after position k could still swing the vote
+        swings = tree_swings(forest)[self.order]
+        self._remaining_swing = np.append(np.cumsum(swings[::-1])[::-1], 0.0)
+        # No row can stop before this many trees, so the first block goes straight there
+        if mode == 'margin':
+            possible = np.append(0.0, np.cumsum(swings)) > self._remaining_swing + MARGIN_EPSILON
+            first = int(np.argmax(possible)) if possible.any() else forest.n_trees
+        else:
+            first = int(np.floor(2.0 * np.log(1.0 / delta))) + 1
+        first = min(max(first, 1), forest.n_trees)
+        self._checkpoints = list(range(first, forest.n_trees, block_size)) + [forest.n_trees]
+        self.rows = 0
+        self.trees_evaluated = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def learned(cls, forest, X, **options):
+        return cls(forest, learn_order(forest, X), **options)
+
+    @property
+    def classes_(self):
+        return self.forest.classes_
+
+    @property
+    def feature_importances_(self):
+        return self.forest.feature_importances_
+
+    @property
+    def feature_names_in_(self):
+        return self.forest.feature_names_in_
+
+    def _settled(self, sums, evaluated):
+        top = np.partition(sums, -2, axis=1)[:, -2:]
+        gap = top[:, 1] - top[:, 0]
+        if self.mode == 'margin':
+            return gap > self._remaining_swing[evaluated] + MARGIN_EPSILON
+        # Hoeffding: per-tree margins lie in [-1, 1]
+        return gap / evaluated > np.sqrt(2.0 * np.log(1.0 / self.delta) / evaluated)
+
+    def _score_block(self, X):
+        forest = self.forest
+        n_rows, n_trees = len(X), forest.n_trees
+        leaves = np.empty((n_rows, n_trees), dtype=np.int32)
+        sums = np.zeros((n_rows, len(forest.classes_)), dtype=np.float64)
+        evaluated = np.zeros(n_rows, dtype=np.int64)
+        active = np.arange(n_rows)
+        start = 0
+        for stop in self._checkpoints:
+            trees = self.order[start:stop]
+            block = forest._apply_block(X[active], roots=forest.roots[trees])
+            leaves[np.ix_(active, trees)] = block
+            for j in range(len(trees)):
+                sums[active] += forest.value[block[:, j]]
+            evaluated[active] = stop
+            if stop == n_trees:
+                break
+            active = active[~self._settled(sums[active], stop)]
+            if not active.size:
+                break
+            start = stop
+        proba = sums / evaluated[:, np.newaxis]
+        # Rows that needed every tree: sum again in the forest's own order for identical output
+        full = np.flatnonzero(evaluated == n_trees)
+        if full.size:
+            exact = np.zeros((len(full), len(forest.classes_)), dtype=np.float64)
+            for t in range(n_trees):
+                exact += forest.value[leaves[full, t]]
+            proba[full] = exact / n_trees
+        return proba, int(evaluated.sum())
+
+    def predict_proba(self, X, chunk_size=4096):
+        X = self.forest._as_float32(X)
+        proba = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+        trees = 0
+        for start in range(0, len(X), chunk_size):
+            proba[start:start + chunk_size], evaluated = self._score_block(X[start:start + chunk_size])
+            trees += evaluated
+        with self._lock:
+            self.rows += len(X)
+            self.trees_evaluated += trees
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def average_trees(self):
+        return self.trees_evaluated / self.rows if self.rows else 0.0
+
+
+def early_exit_report(forest, early, X):
+    """Average trees evaluated, label agreement and timing against full evaluation on X."""
+    start = time.perf_counter()
+    full_labels = forest.predict(X)
+    full_seconds = time.perf_counter() - start
+    early.rows = early.trees_evaluated = 0
+    start = time.perf_counter()
+    labels = early.predict(X)
+    early_seconds = time.perf_counter() - start
+    return {
+        'rows': len(X),
+        'mode': early.mode,
+        'average_trees': early.average_trees(),
+        'n_trees': forest.n_trees,
+        'agreement': float(np.mean(labels == full_labels)),
+        'full_ms': full_seconds * 1000,
+        'early_ms': early_seconds * 1000,
+    }
+
+
+def main():
+    from sklearn.model_selection import train_test_split
+
+    from bundle import load_flat_assets
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+    from train_and_save_models import MYCO_TEST_SIZE, PLANT_TEST_SIZE, RANDOM_STATE
+
+    parser = argparse.ArgumentParser(description="Average trees evaluated and label agreement of early exit")
+    parser.add_argument('--mode', choices=MODES, default='margin')
+    parser.add_argument('--delta', type=float, default=DEFAULT_DELTA, help="Error bound of the hoeffding mode")
+    parser.add_argument('--block-size', type=int, default=BLOCK_SIZE, help="Trees evaluated between checks")
+    args = parser.parse_args()
+
+    plant_model, myco_model, le_species, le_light, le_microbe = load_flat_assets()
+    X_plant, _ = load_plant_data()
+    X_myco, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+    cases = [('plant_model', plant_model, X_plant, PLANT_TEST_SIZE), ('myco_model', myco_model, X_myco, MYCO_TEST_SIZE)]
+    for name, forest, X, test_size in cases:
+        X_train, X_test = train_test_split(X, test_size=test_size, random_state=RANDOM_STATE)
+        early = EarlyExitForest.learned(forest, X_train, mode=args.mode, delta=args.delta,
+                                        block_size=args.block_size)
+        report = early_exit_report(forest, early, X_test)
+        print(f"{name} ({report['mode']}): {report['average_trees']:.1f} of {report['n_trees']} trees on average, "
+              f"agreement {report['agreement']:.2%} on {report['rows']} held-out rows, "
+              f"full {report['full_ms']:.1f} ms, early exit {report['early_ms']:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
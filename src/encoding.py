@@ -0,0 +1,126 @@
+# encoding.py
+"""Precomputed lookup tables for the categorical Myco-Net inputs.
+
+An EncodingTable is built once from a fitted LabelEncoder's ``classes_`` (or
+the class list stored in the model bundle) and gives the same codes as
+``LabelEncoder.transform`` without sklearn's per-call validation: a dict
+lookup for a single value and, for a batch, one factorize pass followed by a
+lookup of the distinct categories only.
+Unknown categories raise a ValueError naming them, or are mapped to an
+explicit ``unknown`` code when one is given.
+
+    python src/encoding.py --rows 1000000   # table vs LabelEncoder on Tree_Data-shaped rows
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+ENCODED_COLUMNS = {'Species': 'Species_encoded', 'Light': 'Light_encoded', 'Microbe': 'Microbe_encoded'}
+
+
+class EncodingTable:
+    """Category -> code lookup with the same codes as a fitted LabelEncoder."""
+
+    def __init__(self, classes, name=None):
+        self.classes_ = np.asarray(classes)
+        self.name = name
+        self._index = pd.Index(self.classes_)
+        self._codes = {value: code for code, value in enumerate(self.classes_.tolist())}
+
+    @classmethod
+    def from_encoder(cls, encoder, name=None):
+        return cls(encoder.classes_, name)
+
+    def encode(self, value):
+        """Code of a single category."""
+        try:
+            return self._codes[value]
+        except (KeyError, TypeError):
+            raise self._unknown_error([value])
+
+    def transform(self, values, unknown=None):
+        """Codes for a batch of categories.
+
+        Categories not in the table raise a ValueError unless ``unknown`` is
+        given, in which case they get that code (e.g. -1).
+        """
+        if not isinstance(values, (pd.Series, pd.Index, pd.Categorical)):
+            values = pd.Series(values, dtype=object)
+        # Hash every value once, then look up only the distinct categories;
+        # factorize marks missing values with -1, which stays unknown
+        try:
+            positions, uniques = pd.factorize(values)
+        except TypeError:
+            # Unhashable values such as lists
+            raise ValueError(f"{self.name or 'Category'} values must be strings") from None
+        codes = np.append(self._index.get_indexer(uniques), -1)[positions]
+        missing = codes == -1
+        if missing.any():
+            if unknown is None:
+                raise self._unknown_error(np.asarray(values, dtype=object)[missing])
+            codes[missing] = unknown
+        return codes
+
+    def inverse_transform(self, codes):
+        return self.classes_[np.asarray(codes)]
+
+    def __len__(self):
+        return len(self.classes_)
+
+    def _unknown_error(self, values):
+        unknown = sorted({str(value) for value in values})
+        field = f"{self.name} " if self.name else ""
+        return ValueError(f"Unknown {field}value(s): {', '.join(unknown)}; "
+                          f"expected one of {', '.join(map(str, self.classes_))}")
+
+
+def main():
+    from assets import load_assets
+    from datasets import load_myco_frame
+
+    parser = argparse.ArgumentParser(description="Benchmark EncodingTable against LabelEncoder.transform")
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    _, _, le_species, le_light, le_microbe = load_assets()
+    encoders = dict(zip(ENCODED_COLUMNS, (le_species, le_light, le_microbe)))
+    tables = {column: EncodingTable.from_encoder(encoder, column) for column, encoder in encoders.items()}
+    frame = load_myco_frame()
+    batch = frame.sample(args.rows, replace=True, random_state=0).reset_index(drop=True)
+
+    def best_of(encode):
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = {column: encode(column, batch[column]) for column in ENCODED_COLUMNS}
+            timings.append(time.perf_counter() - start)
+        return min(timings), result
+
+    sklearn_seconds, expected = best_of(lambda column, values: encoders[column].transform(values))
+    table_seconds, actual = best_of(lambda column, values: tables[column].transform(values))
+    identical = all(np.array_equal(expected[column], actual[column]) for column in ENCODED_COLUMNS)
+    print(f"{args.rows} rows x {len(ENCODED_COLUMNS)} columns: LabelEncoder {sklearn_seconds * 1000:.1f} ms, "
+          f"EncodingTable {table_seconds * 1000:.1f} ms ({sklearn_seconds / table_seconds:.1f}x), "
+          f"identical={identical}")
+
+    values = [batch[column].iloc[0] for column in ENCODED_COLUMNS]
+    start = time.perf_counter()
+    for _ in range(1000):
+        for column, value in zip(ENCODED_COLUMNS, values):
+            encoders[column].transform([value])[0]
+    single_sklearn = (time.perf_counter() - start) / 1000
+    start = time.perf_counter()
+    for _ in range(1000):
+        for column, value in zip(ENCODED_COLUMNS, values):
+            tables[column].encode(value)
+    single_table = (time.perf_counter() - start) / 1000
+    print(f"single row: LabelEncoder {single_sklearn * 1e6:.1f} us, EncodingTable {single_table * 1e6:.2f} us")
+    if not identical:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,353 @@
+# forest.py
+"""Array-backed inference for the project's RandomForestClassifier models.
+
+A fitted forest is flattened into contiguous NumPy arrays (one entry per
+node across all trees) and evaluated for a whole block of rows and all trees
+at once, instead of going through sklearn's per-call validation and
+per-tree dispatch. predict_proba reproduces sklearn bit-for-bit: inputs are
+cast to float32 like sklearn does, every tree's leaf distribution is
+normalised the same way and the trees are summed in the same order.
+contributions() walks the same paths to explain each prediction per feature.
+
+The NumPy traversal wins on single rows and small batches, where sklearn's
+per-call overhead dominates, but sklearn's compiled traversal is faster
+above a few hundred rows. BatchRouter sends calls above LARGE_BATCH_ROWS to
+the pickled forest.
+
+    python src/forest.py export   # write models/*_forest.npz
+    python src/forest.py check    # parity against the pickles on data/
+"""
+import argparse
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+from assets import MODELS_DIR
+
+FOREST_FILES = {
+    'plant_model': 'plant_health_forest.npz',
+    'myco_model': 'myco_net_forest.npz',
+}
+
+# Above this many rows per call the sklearn forest scores faster than the flat arrays
+LARGE_BATCH_ROWS = 512
+
+ARRAY_NAMES = ['feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots',
+               'classes', 'feature_importances']
+
+
+class FlatForest:
+    """Drop-in replacement for a fitted RandomForestClassifier at prediction time.
+
+    Leaves point to themselves as both children.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, value, roots,
+                 classes, feature_importances, max_depth, feature_names=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.value = value
+        self.roots = roots
+        self.classes_ = classes
+        self.feature_importances_ = feature_importances
+        self.max_depth = int(max_depth)
+        self.feature_names_in_ = feature_names
+        self.n_features_in_ = len(feature_importances)
+        # Derived lookup arrays: interleaved (left, right) children and a leaf mask
+        self._children = np.stack([left, right], axis=1).ravel()
+        self._is_leaf = left == np.arange(len(left))
+        self._delta = None
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @classmethod
+    def from_sklearn(cls, model, classes=None):
+        """Flatten a fitted RandomForestClassifier.
+
+        A multi-output RandomForestRegressor fitted on class probabilities
+        (see distill.py) is accepted too; ``classes`` then names its outputs.
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_]
+        classes = model.classes_ if classes is None else classes
+        offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+        parts = {name: [] for name in ('feature', 'threshold', 'left', 'right', 'missing_left', 'value')}
+        for tree, offset in zip(trees, offsets):
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            parts['feature'].append(np.where(is_leaf, 0, tree.feature))
+            parts['threshold'].append(np.where(is_leaf, 0.0, tree.threshold))
+            parts['left'].append(np.where(is_leaf, nodes, tree.children_left) + offset)
+            parts['right'].append(np.where(is_leaf, nodes, tree.children_right) + offset)
+            missing_left = getattr(tree, 'missing_go_to_left', None)
+            if missing_left is None:
+                missing_left = np.zeros(tree.node_count, dtype=bool)
+            parts['missing_left'].append(np.asarray(missing_left, dtype=bool))
+            # Same normalisation as DecisionTreeClassifier.predict_proba
+            if hasattr(model, 'classes_'):
+                value = tree.value[:, 0, :len(classes)].astype(np.float64)
+            else:
+                value = tree.value[:, :, 0].astype(np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            parts['value'].append(value / normalizer)
+
+        return cls(
+            feature=np.concatenate(parts['feature']).astype(np.int32),
+            threshold=np.concatenate(parts['threshold']).astype(np.float64),
+            left=np.concatenate(parts['left']).astype(np.int32),
+            right=np.concatenate(parts['right']).astype(np.int32),
+            missing_left=np.concatenate(parts['missing_left']),
+            value=np.ascontiguousarray(np.concatenate(parts['value'])),
+            roots=offsets[:-1].astype(np.int32),
+            classes=_plain_array(classes),
+            feature_importances=np.asarray(model.feature_importances_, dtype=np.float64),
+            max_depth=max(tree.max_depth for tree in trees),
+            feature_names=getattr(model, 'feature_names_in_', None),
+        )
+
+    def arrays(self):
+        """Return the arrays that fully describe the forest (for saving)."""
+        arrays = {name: getattr(self, name) for name in ARRAY_NAMES
+                  if name not in ('classes', 'feature_importances')}
+        arrays['classes'] = self.classes_
+        arrays['feature_importances'] = self.feature_importances_
+        arrays['max_depth'] = np.array(self.max_depth)
+        if self.feature_names_in_ is not None:
+            arrays['feature_names'] = _plain_array(self.feature_names_in_)
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        feature_names = arrays['feature_names'] if 'feature_names' in arrays else None
+        return cls(**{name: arrays[name] for name in ARRAY_NAMES},
+                   max_depth=arrays['max_depth'], feature_names=feature_names)
+
+    def save(self, path):
+        np.savez(path, **self.arrays())
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls.from_arrays({name: arrays[name] for name in arrays.files})
+
+    def _as_float32(self, X):
+        if hasattr(X, 'columns') and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        X = np.asarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has shape {X.shape}, expected (n_rows, {self.n_features_in_})")
+        return X
+
+    def apply(self, X, chunk_size=4096):
+        """Return the leaf index reached in every tree, shape (n_rows, n_trees)."""
+        X = self._as_float32(X)
+        leaves = np.empty((len(X), self.n_trees), dtype=np.int32)
+        for start in range(0, len(X), chunk_size):
+            leaves[start:start + chunk_size] = self._apply_block(X[start:start + chunk_size])
+        return leaves
+
+    def _apply_block(self, X, on_step=None, roots=None):
+        # Walk every (row, tree) pair together, dropping pairs as they reach a leaf.
+        # on_step(active, parents, children) sees every edge taken, one depth at a time;
+        # roots restricts the walk to a subset of the trees.
+        roots = self.roots if roots is None else roots
+        n_rows, n_trees = len(X), len(roots)
+        nodes = np.tile(roots, n_rows)
+        row_offsets = np.repeat(np.arange(n_rows, dtype=np.intp) * X.shape[1], n_trees)
+        values = X.ravel()
+        has_nan = np.isnan(values).any()
+        active = np.flatnonzero(~self._is_leaf[nodes])
+        while active.size:
+            current = nodes[active]
+            x = values[row_offsets[active] + self.feature[current]]
+            go_right = ~(x <= self.threshold[current])
+            if has_nan:
+                missing = np.isnan(x)
+                go_right[missing] = ~self.missing_left[current[missing]]
+            parents = current
+            current = self._children[2 * current + go_right]
+            if on_step is not None:
+                on_step(active, parents, current)
+            nodes[active] = current
+            active = active[~self._is_leaf[current]]
+        return nodes.reshape(n_rows, n_trees)
+
+    def predict_proba(self, X, chunk_size=4096):
+        X = self._as_float32(X)
+        proba = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            leaves = self._apply_block(X[start:start + chunk_size])
+            block = np.zeros((len(leaves), len(self.classes_)), dtype=np.float64)
+            # Accumulate tree by tree, in the same order as sklearn
+            for t in range(self.n_trees):
+                block += self.value[leaves[:, t]]
+            block /= self.n_trees
+            proba[start:start + chunk_size] = block
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def _node_deltas(self):
+        # value[child] - value[parent] for every non-root node (zero at the roots)
+        if self._delta is None:
+            parent = np.arange(len(self.left))
+            internal = ~self._is_leaf
+            parent[self.left[internal]] = np.flatnonzero(internal)
+            parent[self.right[internal]] = np.flatnonzero(internal)
+            self._delta = self.value - self.value[parent]
+        return self._delta
+
+    def contributions(self, X, chunk_size=4096):
+        """Decision-path feature contributions (Saabas' method) for every row.
+
+        Each split on a row's path moves the prediction from the parent's
+        class distribution to the child's; that change is credited to the
+        split feature and averaged over the trees. Returns (bias, contrib):
+        bias has shape (n_classes,) (the forest's root distribution) and
+        contrib has shape (n_rows, n_features, n_classes), with
+        bias + contrib.sum(axis=1) equal to predict_proba(X) up to rounding.
+        """
+        X = self._as_float32(X)
+        delta = self._node_deltas()
+        n_features, n_classes = self.n_features_in_, len(self.classes_)
+        contrib = np.empty((len(X), n_features, n_classes), dtype=np.float64)
+        for start in range(0, len(X), chunk_size):
+            block = X[start:start + chunk_size]
+            size = len(block) * n_features
+            sums = np.zeros((n_classes, size), dtype=np.float64)
+
+            def accumulate(active, parents, children):
+                cells = (active // self.n_trees) * n_features + self.feature[parents]
+                step = delta[children]
+                for c in range(n_classes):
+                    sums[c] += np.bincount(cells, weights=step[:, c], minlength=size)
+
+            self._apply_block(block, on_step=accumulate)
+            contrib[start:start + chunk_size] = sums.T.reshape(len(block), n_features, n_classes)
+        contrib /= self.n_trees
+        bias = self.value[self.roots].sum(axis=0) / self.n_trees
+        return bias, contrib
+
+
+class BatchRouter:
+    """Scores small calls with ``model`` and calls above ``threshold`` rows with a sklearn forest.
+
+    ``load_large`` returns the sklearn forest; it is called on the first
+    large call, so small-batch users never import sklearn.
+    """
+
+    def __init__(self, model, load_large, threshold=LARGE_BATCH_ROWS):
+        self.model = model
+        self.threshold = threshold
+        self._load_large = load_large
+        self._large = None
+        self._lock = threading.Lock()
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    @property
+    def feature_importances_(self):
+        return self.model.feature_importances_
+
+    @property
+    def feature_names_in_(self):
+        return getattr(self.model, 'feature_names_in_', None)
+
+    def large(self):
+        with self._lock:
+            if self._large is None:
+                self._large = self._load_large()
+        return self._large
+
+    def predict_proba(self, X):
+        if len(X) > self.threshold:
+            return self.large().predict_proba(X)
+        return self.model.predict_proba(X)
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def forest_fingerprint(forest):
+    """Short hash of the arrays that decide a FlatForest's output."""
+    digest = hashlib.sha256()
+    for values in (forest.feature, forest.threshold, forest.left, forest.right, forest.value):
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def _plain_array(values):
+    """Convert object arrays of strings to a fixed-width unicode array (no pickling)."""
+    values = np.asarray(values)
+    if values.dtype == object:
+        values = values.astype(str)
+    return values
+
+
+def check_parity(model, flat, X):
+    """Compare predict_proba of a sklearn forest and its FlatForest on X.
+
+    Returns a dict with bit-for-bit equality, the max absolute difference and
+    the timing of both engines.
+    """
+    start = time.perf_counter()
+    expected = model.predict_proba(X)
+    sklearn_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    actual = flat.predict_proba(X)
+    flat_seconds = time.perf_counter() - start
+    return {
+        'rows': len(X),
+        'identical': bool(np.array_equal(expected, actual)),
+        'max_abs_diff': float(np.max(np.abs(expected - actual))) if len(X) else 0.0,
+        'sklearn_seconds': sklearn_seconds,
+        'flat_seconds': flat_seconds,
+    }
+
+
+def main():
+    from assets import load_assets
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+
+    parser = argparse.ArgumentParser(description="Export the forests to flat arrays and check parity")
+    parser.add_argument('command', choices=['export', 'check'])
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    args = parser.parse_args()
+
+    plant_model, myco_model, le_species, le_light, le_microbe = load_assets(args.models_dir)
+    models = {'plant_model': plant_model, 'myco_model': myco_model}
+    flats = {name: FlatForest.from_sklearn(model) for name, model in models.items()}
+
+    if args.command == 'export':
+        for name, flat in flats.items():
+            path = os.path.join(args.models_dir, FOREST_FILES[name])
+            flat.save(path)
+            print(f"{name}: {flat.n_trees} trees, {len(flat.feature)} nodes -> {path}")
+        return
+
+    X_plant, _ = load_plant_data()
+    X_myco, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+    failed = False
+    for name, X in (('plant_model', X_plant), ('myco_model', X_myco)):
+        report = check_parity(models[name], flats[name], X)
+        failed |= not report['identical']
+        print(f"{name}: {report['rows']} rows, identical={report['identical']}, "
+              f"max_abs_diff={report['max_abs_diff']:.3g}, "
+              f"sklearn {report['sklearn_seconds'] * 1000:.1f} ms, flat {report['flat_seconds'] * 1000:.1f} ms")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
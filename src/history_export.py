@@ -0,0 +1,90 @@
+# history_export.py
+"""Chunked export of the test history store to CSV or Parquet.
+
+Rows are read from the store a chunk at a time and written straight to the
+output, so peak memory depends on the chunk size, not on the history length.
+
+    python src/history_export.py history.csv
+    python src/history_export.py history.parquet --format parquet
+"""
+import argparse
+import csv
+import io
+
+from history_store import DEFAULT_PATH, EXPORT_COLUMNS, HistoryStore
+
+DEFAULT_CHUNK_SIZE = 5000
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+FORMATS = {
+    'csv': {'extension': 'csv', 'mime': 'text/csv'},
+    'parquet': {'extension': 'parquet', 'mime': 'application/vnd.apache.parquet'},
+}
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def write_csv(store, out, chunk_size=DEFAULT_CHUNK_SIZE, status=None, risk=None):
+    """Write the history as CSV to a binary file object; returns the row count."""
+    text = io.TextIOWrapper(out, encoding='utf-8', newline='', write_through=True)
+    writer = csv.writer(text)
+    writer.writerow(EXPORT_COLUMNS.values())
+    rows = 0
+    for chunk in store.iter_chunks(list(EXPORT_COLUMNS), chunk_size, status, risk):
+        writer.writerows(chunk)
+        rows += len(chunk)
+    text.detach()
+    return rows
+
+
+def write_parquet(store, out, chunk_size=DEFAULT_CHUNK_SIZE, status=None, risk=None):
+    """Write the history as Parquet (one row group per chunk); returns the row count."""
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+    types = {'plant_status': pa.string(), 'fungal_risk': pa.string(), 'microbe_type': pa.string()}
+    schema = pa.schema([(name, types.get(column, pa.float64()))
+                        for column, name in EXPORT_COLUMNS.items() if column != 'combined_timestamp'])
+    schema = schema.insert(0, pa.field('Timestamp', pa.timestamp('s')))
+    rows = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in store.iter_chunks(list(EXPORT_COLUMNS), chunk_size, status, risk):
+            columns = list(zip(*chunk))
+            arrays = [pc.strptime(pa.array(columns[0], pa.string()), format=TIMESTAMP_FORMAT, unit='s')]
+            arrays += [pa.array(values, field.type) for values, field in zip(columns[1:], list(schema)[1:])]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            rows += len(chunk)
+    return rows
+
+
+WRITERS = {'csv': write_csv, 'parquet': write_parquet}
+
+
+def export_history(store, out, fmt='csv', chunk_size=DEFAULT_CHUNK_SIZE, status=None, risk=None):
+    if fmt not in WRITERS:
+        raise ValueError(f"Unknown export format {fmt!r}; expected one of {', '.join(WRITERS)}")
+    return WRITERS[fmt](store, out, chunk_size, status, risk)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Myco-Net test history")
+    parser.add_argument('output')
+    parser.add_argument('--format', choices=list(WRITERS), default='csv')
+    parser.add_argument('--db', default=DEFAULT_PATH)
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    store = HistoryStore(args.db)
+    with open(args.output, 'wb') as out:
+        rows = export_history(store, out, args.format, args.chunk_size)
+    print(f"Exported {rows} tests to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,221 @@
+# history_store.py
+"""Persistent, indexed store for saved combined test results (SQLite)."""
+import os
+import sqlite3
+import threading
+
+from assets import DATA_DIR
+
+DEFAULT_PATH = os.environ.get('MYCO_NET_HISTORY_DB', os.path.join(DATA_DIR, 'test_history.sqlite3'))
+
+COLUMNS = ['id', 'combined_timestamp',
+           'plant_status', 'plant_confidence', 'soil_moisture', 'nitrogen', 'soil_ph', 'plant_timestamp',
+           'fungal_risk', 'fungal_confidence', 'amf_colonization', 'nsc_level', 'microbe_type',
+           'fungal_timestamp']
+
+# Store column -> column name used in exports
+EXPORT_COLUMNS = {
+    'combined_timestamp': 'Timestamp',
+    'plant_status': 'Plant_Status',
+    'plant_confidence': 'Plant_Confidence',
+    'soil_moisture': 'Soil_Moisture',
+    'nitrogen': 'Nitrogen_Level',
+    'soil_ph': 'Soil_pH',
+    'fungal_risk': 'Fungal_Risk',
+    'fungal_confidence': 'Fungal_Confidence',
+    'amf_colonization': 'AMF_Colonization',
+    'nsc_level': 'NSC_Level',
+    'microbe_type': 'Microbe_Type',
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    combined_timestamp TEXT NOT NULL,
+    plant_status TEXT NOT NULL,
+    plant_confidence REAL,
+    soil_moisture REAL,
+    nitrogen REAL,
+    soil_ph REAL,
+    plant_timestamp TEXT,
+    fungal_risk TEXT NOT NULL,
+    fungal_confidence REAL,
+    amf_colonization REAL,
+    nsc_level REAL,
+    microbe_type TEXT,
+    fungal_timestamp TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_history_timestamp ON test_history (combined_timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_status ON test_history (plant_status, combined_timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_risk ON test_history (fungal_risk, combined_timestamp);
+CREATE INDEX IF NOT EXISTS idx_history_status_risk ON test_history (plant_status, fungal_risk, combined_timestamp);
+"""
+
+
+class HistoryStore:
+    """Test history shared by all sessions and kept across restarts.
+
+    Entries go in and come out in the same nested shape the app uses:
+    ``{'plant_results': {...}, 'fungal_results': {...}, 'combined_timestamp': ...}``
+    (plus an ``id``). Filters of ``None`` or ``"All"`` match everything.
+    """
+
+    def __init__(self, path=DEFAULT_PATH):
+        self.path = path
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            if path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+
+    def add(self, entry):
+        plant = entry['plant_results']
+        fungal = entry['fungal_results']
+        values = (
+            entry['combined_timestamp'],
+            str(plant['status']), float(plant['confidence']), float(plant['soil_moisture']),
+            float(plant['nitrogen']), float(plant['soil_ph']), plant.get('timestamp'),
+            str(fungal['risk_level']), float(fungal['confidence']), float(fungal['amf_colonization']),
+            float(fungal['nsc_level']), str(fungal['microbe_type']), fungal.get('timestamp'),
+        )
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"INSERT INTO test_history ({', '.join(COLUMNS[1:])}) "
+                f"VALUES ({', '.join('?' * len(values))})", values)
+        return cursor.lastrowid
+
+    @staticmethod
+    def _where(status=None, risk=None):
+        clauses, params = [], []
+        if status not in (None, "All"):
+            clauses.append("plant_status = ?")
+            params.append(status)
+        if risk not in (None, "All"):
+            clauses.append("fungal_risk = ?")
+            params.append(risk)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, status=None, risk=None):
+        where, params = self._where(status, risk)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM test_history{where}", params).fetchone()[0]
+
+    def page(self, status=None, risk=None, limit=20, offset=0):
+        """Entries matching the filters, newest first."""
+        where, params = self._where(status, risk)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM test_history{where} "
+                f"ORDER BY combined_timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]).fetchall()
+        return [_entry(row) for row in rows]
+
+    def summary(self, status=None, risk=None, limit=20, offset=0):
+        """Flat (id, timestamp, status, confidence, risk, confidence) rows, newest first."""
+        where, params = self._where(status, risk)
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, combined_timestamp, plant_status, plant_confidence, fungal_risk, fungal_confidence "
+                f"FROM test_history{where} ORDER BY combined_timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]).fetchall()
+
+    def get(self, entry_id):
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(COLUMNS)} FROM test_history WHERE id = ?",
+                                     (entry_id,)).fetchone()
+        return _entry(row) if row else None
+
+    def rows(self, columns=COLUMNS, status=None, risk=None):
+        """All matching rows as tuples of ``columns``, oldest first."""
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown history columns: {', '.join(sorted(unknown))}")
+        where, params = self._where(status, risk)
+        with self._lock:
+            return self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM test_history{where} ORDER BY combined_timestamp, id",
+                params).fetchall()
+
+    def recent(self, columns=COLUMNS, limit=500, status=None, risk=None):
+        """The ``limit`` newest matching rows as tuples of ``columns``, oldest first."""
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown history columns: {', '.join(sorted(unknown))}")
+        where, params = self._where(status, risk)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(columns)} FROM test_history{where} "
+                "ORDER BY combined_timestamp DESC, id DESC LIMIT ?", params + [limit]).fetchall()
+        return rows[::-1]
+
+    def counts(self, column, status=None, risk=None):
+        """{value: rows} of 'plant_status' or 'fungal_risk', most frequent first."""
+        if column not in ('plant_status', 'fungal_risk'):
+            raise ValueError(f"Cannot count history column {column}")
+        where, params = self._where(status, risk)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {column}, COUNT(*) FROM test_history{where} GROUP BY {column} "
+                f"ORDER BY COUNT(*) DESC, {column}", params).fetchall()
+        return dict(rows)
+
+    def iter_chunks(self, columns=COLUMNS, chunk_size=5000, status=None, risk=None):
+        """Yield matching rows oldest first, ``chunk_size`` at a time.
+
+        Each chunk is a separate keyset query, so the store is only locked
+        briefly and at most one chunk is held in memory.
+        """
+        unknown = set(columns) - set(COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown history columns: {', '.join(sorted(unknown))}")
+        where, params = self._where(status, risk)
+        after = " AND " if where else " WHERE "
+        last = None
+        while True:
+            keyset, keyset_params = ("", []) if last is None else \
+                (after + "(combined_timestamp, id) > (?, ?)", list(last))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT combined_timestamp, id, {', '.join(columns)} FROM test_history{where}{keyset} "
+                    "ORDER BY combined_timestamp, id LIMIT ?",
+                    params + keyset_params + [chunk_size]).fetchall()
+            if not rows:
+                return
+            last = rows[-1][:2]
+            yield [row[2:] for row in rows]
+            if len(rows) < chunk_size:
+                return
+
+    def clear(self):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM test_history")
+
+    def close(self):
+        self._conn.close()
+
+
+def _entry(row):
+    values = dict(zip(COLUMNS, row))
+    return {
+        'id': values['id'],
+        'combined_timestamp': values['combined_timestamp'],
+        'plant_results': {
+            'status': values['plant_status'],
+            'confidence': values['plant_confidence'],
+            'soil_moisture': values['soil_moisture'],
+            'nitrogen': values['nitrogen'],
+            'soil_ph': values['soil_ph'],
+            'timestamp': values['plant_timestamp'],
+        },
+        'fungal_results': {
+            'risk_level': values['fungal_risk'],
+            'confidence': values['fungal_confidence'],
+            'amf_colonization': values['amf_colonization'],
+            'nsc_level': values['nsc_level'],
+            'microbe_type': values['microbe_type'],
+            'timestamp': values['fungal_timestamp'],
+        },
+    }
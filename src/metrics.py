@@ -0,0 +1,125 @@
+# metrics.py
+"""Lightweight timing spans for the app's and the service's hot paths.
+
+    with span('predict_proba'):
+        proba = model.predict_proba(X)
+
+Every span records (time, stage, page, seconds) into a bounded in-process
+ring buffer, which the Performance page summarises, and into cumulative
+histogram buckets, which prometheus_text() exposes for scrapers (GET
+/metrics on the prediction service). The page a span belongs to comes from
+set_page(), which the app calls once per script run.
+
+Recording is on by default; set MYCO_NET_METRICS=0 or call
+set_enabled(False) to turn spans into no-ops.
+"""
+import bisect
+import contextlib
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+RING_SIZE = 10000
+# Histogram bucket upper bounds in seconds (Prometheus "le" labels)
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_page = contextvars.ContextVar('metrics_page', default=None)
+
+
+class SpanRecorder:
+    """Thread-safe store of recent spans plus cumulative per-stage histograms."""
+
+    def __init__(self, maxlen=RING_SIZE, buckets=BUCKETS):
+        self.buckets = tuple(buckets)
+        self.maxlen = maxlen
+        self.enabled = os.environ.get('MYCO_NET_METRICS', '1') != '0'
+        self._spans = deque(maxlen=maxlen)
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def span(self, stage, page=None):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, page)
+
+    def record(self, stage, seconds, page=None):
+        if not self.enabled:
+            return
+        page = page if page is not None else _page.get()
+        with self._lock:
+            self._spans.append((time.time(), stage, page, seconds))
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            histogram['counts'][bisect.bisect_left(self.buckets, seconds)] += 1
+            histogram['sum'] += seconds
+
+    def spans(self, stage=None, page=None):
+        """Recent spans as a list of (timestamp, stage, page, seconds), oldest first."""
+        with self._lock:
+            spans = list(self._spans)
+        return [s for s in spans if (stage is None or s[1] == stage) and (page is None or s[2] == page)]
+
+    def summary(self, by='stage'):
+        """Count, mean and p50/p95/p99 in ms of the recent spans, grouped by
+        ``'stage'`` or by ``'page'`` and stage."""
+        groups = {}
+        for _, stage, page, seconds in self.spans():
+            key = stage if by == 'stage' else (page or '-', stage)
+            groups.setdefault(key, []).append(seconds)
+        rows = []
+        for key, values in sorted(groups.items()):
+            ms = np.asarray(values) * 1000
+            p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+            row = {'stage': key} if by == 'stage' else {'page': key[0], 'stage': key[1]}
+            row.update(count=len(ms), mean_ms=float(ms.mean()), p50_ms=float(p50),
+                       p95_ms=float(p95), p99_ms=float(p99), max_ms=float(ms.max()))
+            rows.append(row)
+        return rows
+
+    def prometheus_text(self, prefix='myco_net'):
+        """Cumulative histograms in the Prometheus text exposition format."""
+        name = f"{prefix}_stage_duration_seconds"
+        lines = [f"# HELP {name} Time spent in instrumented stages.", f"# TYPE {name} histogram"]
+        with self._lock:
+            histograms = {stage: (list(h['counts']), h['sum']) for stage, h in self._histograms.items()}
+        for stage, (counts, total) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{le}"}} {cumulative}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total!r}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {cumulative}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._spans.clear()
+            self._histograms.clear()
+
+
+RECORDER = SpanRecorder()
+
+
+def span(stage, page=None):
+    return RECORDER.span(stage, page)
+
+
+def set_page(page):
+    """Attribute the spans of the current thread (one Streamlit script run) to ``page``."""
+    _page.set(page)
+
+
+def set_enabled(enabled):
+    RECORDER.enabled = bool(enabled)
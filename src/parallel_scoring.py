@@ -0,0 +1,183 @@
+# parallel_scoring.py
+"""Multi-core batch scoring with a process pool and shared-memory buffers.
+
+ParallelScorer behaves like a model (classes_, predict_proba), so it plugs
+into scoring.write_scored_csv. Each predict_proba call copies the feature
+matrix once into a shared-memory float32 buffer, splits the rows into
+shards and has the pool workers score their shards straight from that
+buffer into a shared result buffer. Only (start, stop) offsets cross the
+process boundary, never the rows. Every worker loads the model from
+models/ once, when the pool starts.
+
+    python src/parallel_scoring.py readings.csv scored.csv --workers 8
+    python src/parallel_scoring.py --bench --repeat 1000   # plant data x1000, 1..N workers
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from assets import MODELS_DIR
+from scoring import DEFAULT_CHUNK_SIZE, MYCO_FEATURES, PH_FEATURES, read_chunks, write_scored_csv
+
+FEATURES = {'plant_model': PH_FEATURES, 'myco_model': MYCO_FEATURES}
+SHARDS_PER_WORKER = 4
+
+# Per-worker state, set by _init_worker
+_model = None
+_features = None
+_attached = {}
+
+
+def _load_model(models_dir, engine, model_name):
+    if engine == 'flat':
+        from bundle import load_flat_assets as loader
+    elif engine == 'pruned':
+        from pruning import load_pruned_assets as loader
+    else:
+        from assets import load_assets as loader
+    plant_model, myco_model, *_ = loader(models_dir)
+    return plant_model if model_name == 'plant_model' else myco_model
+
+
+def _init_worker(models_dir, engine, model_name):
+    global _model, _features
+    _model = _load_model(models_dir, engine, model_name)
+    _features = FEATURES[model_name]
+
+
+def _score_shard(x_name, out_name, n_rows, n_classes, start, stop):
+    key = (x_name, out_name)
+    if key not in _attached:
+        # The parent reuses its buffers across calls, so each worker attaches once
+        for blocks in _attached.values():
+            for block in blocks:
+                block.close()
+        _attached.clear()
+        # Pool workers share the parent's resource tracker, which unlinks the blocks
+        _attached[key] = (shared_memory.SharedMemory(name=x_name), shared_memory.SharedMemory(name=out_name))
+    x_block, out_block = _attached[key]
+    X = np.ndarray((n_rows, len(_features)), dtype=np.float32, buffer=x_block.buf)
+    out = np.ndarray((n_rows, n_classes), dtype=np.float64, buffer=out_block.buf)
+    out[start:stop] = _model.predict_proba(pd.DataFrame(X[start:stop], columns=_features, copy=False))
+    return stop - start
+
+
+class ParallelScorer:
+    """Process pool scoring one model over shared-memory feature buffers.
+
+    Use as a context manager (or call close()) so the pool is shut down and
+    the shared memory released.
+    """
+
+    def __init__(self, model_name='plant_model', models_dir=MODELS_DIR, workers=None, engine='sklearn'):
+        self.features = FEATURES[model_name]
+        self.workers = workers or os.cpu_count() or 1
+        # The parent only needs the class labels; the forests live in the workers
+        self.classes_ = np.asarray(_load_model(models_dir, engine, model_name).classes_)
+        self._pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                         initargs=(models_dir, engine, model_name))
+        self._capacity = 0
+        self._x_block = None
+        self._out_block = None
+
+    def _reserve(self, n_rows):
+        if n_rows <= self._capacity:
+            return
+        self._release()
+        self._x_block = shared_memory.SharedMemory(create=True, size=max(1, n_rows * len(self.features) * 4))
+        self._out_block = shared_memory.SharedMemory(create=True, size=max(1, n_rows * len(self.classes_) * 8))
+        self._capacity = n_rows
+
+    def predict_proba(self, X):
+        n_rows = len(X)
+        self._reserve(n_rows)
+        values = X[self.features] if hasattr(X, 'columns') else X
+        X_shared = np.ndarray((n_rows, len(self.features)), dtype=np.float32, buffer=self._x_block.buf)
+        X_shared[:] = np.asarray(values, dtype=np.float32)
+        shards = min(n_rows, self.workers * SHARDS_PER_WORKER) or 1
+        bounds = np.linspace(0, n_rows, shards + 1, dtype=int)
+        futures = [self._pool.submit(_score_shard, self._x_block.name, self._out_block.name,
+                                     n_rows, len(self.classes_), int(start), int(stop))
+                   for start, stop in zip(bounds[:-1], bounds[1:]) if stop > start]
+        for future in futures:
+            future.result()
+        out = np.ndarray((n_rows, len(self.classes_)), dtype=np.float64, buffer=self._out_block.buf)
+        return out.copy()
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def _release(self):
+        for block in (self._x_block, self._out_block):
+            if block is not None:
+                block.close()
+                block.unlink()
+        self._x_block = self._out_block = None
+        self._capacity = 0
+
+    def close(self):
+        self._pool.shutdown()
+        self._release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def bench(repeat, workers_list, chunk_size, models_dir, engine):
+    """Rows/s scoring plant_health_data.csv x ``repeat`` for each worker count."""
+    from datasets import load_plant_data
+
+    X, _ = load_plant_data()
+    data = pd.concat([X] * repeat, ignore_index=True)
+    results = {}
+    for workers in workers_list:
+        with ParallelScorer('plant_model', models_dir, workers, engine) as scorer:
+            scorer.predict_proba(data.iloc[:workers])  # start the workers and load the models
+            start = time.perf_counter()
+            for begin in range(0, len(data), chunk_size):
+                scorer.predict_proba(data.iloc[begin:begin + chunk_size])
+            seconds = time.perf_counter() - start
+        results[workers] = len(data) / seconds
+        print(f"{workers:>3} workers: {len(data):,} rows in {seconds:.2f}s = {results[workers]:,.0f} rows/sec "
+              f"({results[workers] / results[workers_list[0]]:.2f}x)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a sensor file on all cores")
+    parser.add_argument('input', nargs='?')
+    parser.add_argument('output', nargs='?')
+    parser.add_argument('--model', choices=list(FEATURES), default='plant_model')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE * 10)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    # sklearn's compiled traversal has the higher per-core throughput on large chunks
+    parser.add_argument('--engine', choices=['flat', 'pruned', 'sklearn'], default='sklearn')
+    parser.add_argument('--bench', action='store_true', help="Measure scaling on the plant data instead")
+    parser.add_argument('--repeat', type=int, default=1000, help="Copies of the plant data used by --bench")
+    args = parser.parse_args()
+
+    if args.bench:
+        workers = sorted({1, *(w for w in (2, 4, 8, 16, 32) if w < args.workers), args.workers})
+        bench(args.repeat, workers, args.chunk_size, args.models_dir, args.engine)
+        return
+    if not args.input or not args.output:
+        parser.error("input and output are required unless --bench is given")
+
+    with ParallelScorer(args.model, args.models_dir, args.workers, args.engine) as scorer, \
+            open(args.output, 'w', newline='') as out:
+        stats = write_scored_csv(scorer, read_chunks(args.input, args.chunk_size), out, scorer.features)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec) with {args.workers} workers")
+
+
+if __name__ == '__main__':
+    main()
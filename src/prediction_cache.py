@@ -0,0 +1,94 @@
+# prediction_cache.py
+"""Bounded LRU cache in front of a model's predict_proba."""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+class PredictionCache:
+    """LRU cache of predict_proba results keyed on the (quantized) feature vector.
+
+    ``resolution`` optionally maps feature name -> step; those features are
+    snapped to the nearest multiple of the step before lookup *and* before
+    the model is called, so every cached answer is exactly the model's
+    output for the snapped vector. Features without a step are used as is.
+    The cache is thread-safe and can be shared between Streamlit sessions.
+    """
+
+    def __init__(self, model, features, maxsize=4096, resolution=None):
+        self.model = model
+        self.features = list(features)
+        self.maxsize = maxsize
+        resolution = resolution or {}
+        self._steps = np.array([resolution.get(f) or 0.0 for f in self.features], dtype=np.float64)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def classes_(self):
+        return self.model.classes_
+
+    @property
+    def feature_importances_(self):
+        return self.model.feature_importances_
+
+    def quantize(self, X):
+        X = np.array(X[self.features] if hasattr(X, 'columns') else X, dtype=np.float64)
+        snap = self._steps > 0
+        if snap.any():
+            X[:, snap] = np.round(X[:, snap] / self._steps[snap]) * self._steps[snap]
+        return X
+
+    def predict_proba(self, X):
+        X = self.quantize(X)
+        keys = [row.tobytes() for row in X]
+        proba = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                cached = self._entries.get(key)
+                if cached is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    proba[i] = cached
+                    self.hits += 1
+            self.misses += sum(len(rows) for rows in missing.values())
+
+        if missing:
+            first_rows = [rows[0] for rows in missing.values()]
+            fresh = self.model.predict_proba(pd.DataFrame(X[first_rows], columns=self.features))
+            with self._lock:
+                for (key, rows), values in zip(missing.items(), fresh):
+                    proba[rows] = values
+                    self._entries[key] = values
+                    self._entries.move_to_end(key)
+                    while len(self._entries) > self.maxsize:
+                        self._entries.popitem(last=False)
+                        self.evictions += 1
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
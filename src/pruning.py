@@ -0,0 +1,319 @@
+# pruning.py
+"""Forest pruning: smaller model artifacts with unchanged predictions.
+
+prune() rewrites a FlatForest bottom-up and hash-conses its nodes:
+
+  * a split whose two children have become the same node is dropped, which
+    merges sibling leaves with identical class distributions and removes
+    splits that cannot change the outcome;
+  * identical subtrees (same feature, threshold, missing-value direction
+    and children, or same leaf distribution) are stored once and shared,
+    within a tree and across trees, and nodes no longer referenced are
+    dropped;
+  * thresholds are rounded down to float32. The inputs are float32
+    already, so x <= t and x <= float32_down(t) agree for every input;
+  * leaf distributions are stored once in a small table and referenced by
+    a uint8/uint16 id, and features and child indices use the narrowest
+    integer type that fits.
+
+All of the above is exact: predict_proba is bit-for-bit unchanged, and
+every run checks that on the datasets. merge_argmax=True additionally
+collapses sibling leaves that predict the same class into a leaf holding
+their parent's distribution. That shrinks the forest further, but the
+probabilities change, so the report shows the label agreement instead,
+and the result goes to models/*_pruned_lossy.npz, which no engine serves.
+
+Each file records the fingerprint of the forest it was pruned from and
+whether leaves were merged. load_pruned_assets refuses lossy files and files
+pruned from other forests; train_and_save_models.py rewrites the exact ones
+after a retrain.
+
+Shared subtrees mean internal nodes have no distribution of their own, so
+a pruned forest predicts but cannot compute path contributions.
+
+    python src/pruning.py                  # write models/*_pruned.npz and report
+    python src/pruning.py --merge-argmax   # lossy: write models/*_pruned_lossy.npz instead
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from assets import MODEL_FILES, MODELS_DIR
+from forest import FlatForest, forest_fingerprint
+
+PRUNED_FILES = {
+    'plant_model': 'plant_health_pruned.npz',
+    'myco_model': 'myco_net_pruned.npz',
+}
+LOSSY_FILES = {
+    'plant_model': 'plant_health_pruned_lossy.npz',
+    'myco_model': 'myco_net_pruned_lossy.npz',
+}
+
+
+def round_thresholds(threshold):
+    """Largest float32 not above each threshold (same split for float32 inputs)."""
+    rounded = threshold.astype(np.float32)
+    above = rounded.astype(np.float64) > threshold
+    rounded[above] = np.nextafter(rounded[above], np.float32(-np.inf))
+    return rounded
+
+
+def _index_dtype(n):
+    return np.uint8 if n <= np.iinfo(np.uint8).max else np.uint16 if n <= np.iinfo(np.uint16).max else np.int32
+
+
+class PrunedForest(FlatForest):
+    """Prediction-only FlatForest produced by prune()."""
+
+    # Fingerprint of the full forest and whether same-argmax leaves were merged
+    source = None
+    merge_argmax = False
+
+    def contributions(self, X, chunk_size=4096):
+        raise ValueError("A pruned forest shares subtrees and cannot compute path contributions; "
+                         "use the full forest")
+
+    def arrays(self):
+        table, value_ids = np.unique(self.value, axis=0, return_inverse=True)
+        n_nodes = len(self.feature)
+        return {
+            'feature': self.feature.astype(_index_dtype(self.n_features_in_)),
+            'threshold': self.threshold.astype(np.float32),
+            'left': self.left.astype(_index_dtype(n_nodes)),
+            'right': self.right.astype(_index_dtype(n_nodes)),
+            'missing_left': self.missing_left,
+            'value_table': table,
+            'value_ids': value_ids.ravel().astype(_index_dtype(len(table))),
+            'roots': self.roots.astype(_index_dtype(n_nodes)),
+            'classes': self.classes_,
+            'feature_importances': self.feature_importances_,
+            'max_depth': np.array(self.max_depth),
+            'source': np.array(self.source or ''),
+            'merge_argmax': np.array(self.merge_argmax),
+            **({'feature_names': np.asarray(self.feature_names_in_).astype(str)}
+               if self.feature_names_in_ is not None else {}),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays):
+        # Child indices are widened again: the traversal computes 2 * node + 1
+        pruned = cls(
+            feature=arrays['feature'].astype(np.int32),
+            threshold=arrays['threshold'],
+            left=arrays['left'].astype(np.int32),
+            right=arrays['right'].astype(np.int32),
+            missing_left=arrays['missing_left'],
+            value=arrays['value_table'][arrays['value_ids']],
+            roots=arrays['roots'].astype(np.int32),
+            classes=arrays['classes'],
+            feature_importances=arrays['feature_importances'],
+            max_depth=arrays['max_depth'],
+            feature_names=arrays['feature_names'] if 'feature_names' in arrays else None,
+        )
+        pruned.source = (str(arrays['source']) or None) if 'source' in arrays else None
+        pruned.merge_argmax = bool(arrays['merge_argmax']) if 'merge_argmax' in arrays else False
+        return pruned
+
+
+def prune(forest, merge_argmax=False):
+    """Return a PrunedForest equivalent to ``forest`` (see the module docstring)."""
+    internal = np.flatnonzero(~forest._is_leaf)
+    if not ((forest.left[internal] > internal).all() and (forest.right[internal] > internal).all()):
+        raise ValueError("Children must come after their parent (sklearn's node order)")
+    threshold = round_thresholds(forest.threshold)
+    n_classes = len(forest.classes_)
+    nodes = {}
+    feature, new_threshold, left, right, missing_left, value = [], [], [], [], [], []
+
+    def node(key, split, distribution):
+        if key not in nodes:
+            nodes[key] = len(feature)
+            f, t, m, l, r = split if split is not None else (0, 0.0, False, len(feature), len(feature))
+            feature.append(f)
+            new_threshold.append(t)
+            missing_left.append(m)
+            left.append(l)
+            right.append(r)
+            value.append(distribution)
+        return nodes[key]
+
+    def leaf(distribution):
+        return node(('leaf', distribution.tobytes()), None, distribution)
+
+    canonical = np.empty(len(forest.feature), dtype=np.int64)
+    no_value = np.zeros(n_classes)
+    # Children have higher indices, so a reverse sweep sees them before their parent
+    for i in range(len(forest.feature) - 1, -1, -1):
+        if forest._is_leaf[i]:
+            canonical[i] = leaf(forest.value[i])
+            continue
+        l, r = canonical[forest.left[i]], canonical[forest.right[i]]
+        if l == r:
+            canonical[i] = l
+        elif merge_argmax and left[l] == l and left[r] == r and np.argmax(value[l]) == np.argmax(value[r]):
+            canonical[i] = leaf(forest.value[i])
+        else:
+            split = (int(forest.feature[i]), threshold[i], bool(forest.missing_left[i]), int(l), int(r))
+            canonical[i] = node(('split',) + split, split, no_value)
+
+    left, right, roots = np.array(left), np.array(right), canonical[forest.roots]
+    # Drop nodes that merged leaves left behind
+    reachable = np.zeros(len(left), dtype=bool)
+    frontier = np.unique(roots)
+    while frontier.size:
+        reachable[frontier] = True
+        frontier = np.unique(np.concatenate([left[frontier], right[frontier]]))
+        frontier = frontier[~reachable[frontier]]
+    renumber = np.cumsum(reachable) - 1
+
+    pruned = PrunedForest(
+        feature=np.array(feature, dtype=np.int32)[reachable],
+        threshold=np.array(new_threshold, dtype=np.float32)[reachable],
+        left=renumber[left[reachable]].astype(np.int32),
+        right=renumber[right[reachable]].astype(np.int32),
+        missing_left=np.array(missing_left, dtype=bool)[reachable],
+        value=np.array(value, dtype=np.float64).reshape(-1, n_classes)[reachable],
+        roots=renumber[roots].astype(np.int32),
+        classes=forest.classes_,
+        feature_importances=forest.feature_importances_,
+        max_depth=forest.max_depth,
+        feature_names=forest.feature_names_in_,
+    )
+    pruned.source = forest_fingerprint(forest)
+    pruned.merge_argmax = merge_argmax
+    return pruned
+
+
+def write_pruned(forests, models_dir=MODELS_DIR, merge_argmax=False):
+    """Prune and save {name: FlatForest}; returns {name: (pruned forest, path)}."""
+    files = LOSSY_FILES if merge_argmax else PRUNED_FILES
+    written = {}
+    for name, forest in forests.items():
+        pruned = prune(forest, merge_argmax)
+        path = os.path.join(models_dir, files[name])
+        pruned.save(path)
+        written[name] = (pruned, path)
+    return written
+
+
+def pruned_models_available(models_dir=MODELS_DIR):
+    return all(os.path.exists(os.path.join(models_dir, filename)) for filename in PRUNED_FILES.values())
+
+
+def load_pruned_assets(models_dir=MODELS_DIR):
+    """Like bundle.load_flat_assets, with the pruned forests.
+
+    Returns (plant_model, myco_model, le_species, le_light, le_microbe), the
+    encoding tables coming from the bundle. Raises ValueError if a pruned
+    forest is lossy or was pruned from other forests than the bundle's.
+    """
+    from bundle import load_flat_assets
+
+    *forests, le_species, le_light, le_microbe = load_flat_assets(models_dir)
+    models = []
+    for (name, filename), forest in zip(PRUNED_FILES.items(), forests):
+        path = os.path.join(models_dir, filename)
+        pruned = PrunedForest.load(path)
+        if pruned.merge_argmax:
+            raise ValueError(f"{path} has merged leaves and changed probabilities; rewrite it with "
+                             "python src/pruning.py")
+        if pruned.source != forest_fingerprint(forest):
+            raise ValueError(f"{path} was pruned from a different model; rewrite it with python src/pruning.py")
+        models.append(pruned)
+    return (*models, le_species, le_light, le_microbe)
+
+
+def _in_memory_bytes(forest):
+    return sum(getattr(forest, name).nbytes for name in
+               ('feature', 'threshold', 'left', 'right', 'missing_left', 'value', 'roots'))
+
+
+def _load_seconds(load, path, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load(path)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def pruning_report(model, forest, pruned, pickle_path, pruned_path, X):
+    """Size, load time and parity of the pickle, the flat forest and the pruned forest."""
+    import joblib
+
+    with tempfile.TemporaryDirectory() as tmp:
+        flat_path = os.path.join(tmp, 'forest.npz')
+        forest.save(flat_path)
+        flat_bytes = os.path.getsize(flat_path)
+        flat_load = _load_seconds(FlatForest.load, flat_path)
+    expected = model.predict_proba(X)
+    actual = pruned.predict_proba(X)
+    return {
+        'nodes': len(forest.feature),
+        'pruned_nodes': len(pruned.feature),
+        'pickle_bytes': os.path.getsize(pickle_path),
+        'flat_bytes': flat_bytes,
+        'pruned_bytes': os.path.getsize(pruned_path),
+        'flat_memory_bytes': _in_memory_bytes(forest),
+        'pruned_memory_bytes': _in_memory_bytes(pruned),
+        'pickle_load_ms': _load_seconds(joblib.load, pickle_path) * 1000,
+        'flat_load_ms': flat_load * 1000,
+        'pruned_load_ms': _load_seconds(PrunedForest.load, pruned_path) * 1000,
+        'rows': len(X),
+        'identical': bool(np.array_equal(expected, actual)),
+        'label_agreement': float(np.mean(np.argmax(expected, axis=1) == np.argmax(actual, axis=1))),
+        'max_abs_diff': float(np.max(np.abs(expected - actual))),
+    }
+
+
+def _kb(n):
+    return f"{n / 1024:,.0f} KB"
+
+
+def main():
+    import pandas as pd
+
+    from assets import load_assets
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+    from distill import augment
+
+    parser = argparse.ArgumentParser(description="Prune the saved forests and check prediction parity")
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--merge-argmax', action='store_true',
+                        help="Also merge sibling leaves with the same argmax (changes probabilities; "
+                             "written to *_pruned_lossy.npz)")
+    args = parser.parse_args()
+
+    plant_model, myco_model, le_species, le_light, le_microbe = load_assets(args.models_dir)
+    X_plant, _ = load_plant_data()
+    X_myco, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+    models = {'plant_model': plant_model, 'myco_model': myco_model}
+    forests = {name: FlatForest.from_sklearn(model) for name, model in models.items()}
+    written = write_pruned(forests, args.models_dir, args.merge_argmax)
+    failed = False
+    for name, X in (('plant_model', X_plant), ('myco_model', X_myco)):
+        model, forest = models[name], forests[name]
+        pruned, path = written[name]
+        # Data rows plus rows drawn from each column's distribution, off the training points
+        X_check = pd.concat([X, augment(X, 10)], ignore_index=True)
+        report = pruning_report(model, forest, pruned, os.path.join(args.models_dir, MODEL_FILES[name]),
+                                   path, X_check)
+        failed |= not (report['identical'] or args.merge_argmax)
+        print(f"{name}: {report['nodes']:,} -> {report['pruned_nodes']:,} nodes -> {path}")
+        print(f"  file: pickle {_kb(report['pickle_bytes'])}, flat {_kb(report['flat_bytes'])}, "
+              f"pruned {_kb(report['pruned_bytes'])}; in memory: flat {_kb(report['flat_memory_bytes'])}, "
+              f"pruned {_kb(report['pruned_memory_bytes'])}")
+        print(f"  load: pickle {report['pickle_load_ms']:.1f} ms, flat {report['flat_load_ms']:.1f} ms, "
+              f"pruned {report['pruned_load_ms']:.1f} ms")
+        print(f"  parity on {report['rows']:,} rows: identical={report['identical']}, "
+              f"label agreement {report['label_agreement']:.2%}, max_abs_diff={report['max_abs_diff']:.3g}")
+    if failed:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,378 @@
+# region_index.py
+"""Exact decision-region lookup index for the Myco-Net forest.
+
+Every split of the forest compares one feature with a threshold, so the
+sorted thresholds of each feature cut the input space into a grid of cells
+inside which the forest's output is constant. A row's cell is found with
+one binary search per feature, and predict_proba of the cell is a table
+lookup.
+
+The categorical inputs (Species, Light, Microbe) have a handful of cells.
+For each combination of them the forest is specialised: only the numeric
+thresholds still reachable once the categorical splits are decided are
+kept, which makes the numeric cells coarser. Even so, the full grid has
+about 250 million cells, so the index is sparse. It stores the cells seen
+in the data (plus uniform samples of the numeric ranges) as sorted int64
+codes, each pointing into a deduplicated table of probability rows. Rows
+that fall in a cell the index does not hold are scored by the forest.
+With learn=True their cells go into a small side buffer, which is merged
+into the sorted table MERGE_BATCH cells at a time, so a miss costs one
+forest evaluation rather than a rebuild of the table. Learning stops once
+the index holds MAX_CELLS. Both paths give the forest's exact output.
+
+    python src/region_index.py build    # write models/myco_net_regions.npz
+    python src/region_index.py check    # exactness vs the pickle, hit rate, memory report
+"""
+import argparse
+import os
+import threading
+import time
+
+import numpy as np
+
+from assets import MODELS_DIR
+from forest import forest_fingerprint
+
+REGION_FILE = 'myco_net_regions.npz'
+CATEGORICAL_FEATURES = ['Species_encoded', 'Light_encoded', 'Microbe_encoded']
+NUMERIC_FEATURES = ['AMF', 'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
+DEFAULT_SAMPLES = 100000
+# Cells learned at prediction time stop being added beyond this size
+MAX_CELLS = 1000000
+# Learned cells wait in a side buffer until this many are merged at once
+MERGE_BATCH = 4096
+
+
+def _split_thresholds(forest, nodes, position):
+    return np.unique(forest.threshold[nodes[forest.feature[nodes] == position]])
+
+
+def _reachable_thresholds(forest, categorical_positions, categorical_values, numeric_positions):
+    """Numeric thresholds per feature on the paths open to the given categorical values."""
+    values = np.zeros(forest.n_features_in_)
+    values[categorical_positions] = categorical_values
+    is_categorical = np.zeros(forest.n_features_in_, dtype=bool)
+    is_categorical[categorical_positions] = True
+    nodes = forest.roots
+    splits = []
+    while nodes.size:
+        nodes = nodes[~forest._is_leaf[nodes]]
+        categorical = is_categorical[forest.feature[nodes]]
+        decided = nodes[categorical]
+        go_left = values[forest.feature[decided]] <= forest.threshold[decided]
+        numeric = nodes[~categorical]
+        splits.append(numeric)
+        nodes = np.concatenate([np.where(go_left, forest.left[decided], forest.right[decided]),
+                                forest.left[numeric], forest.right[numeric]])
+    splits = np.concatenate(splits) if splits else np.empty(0, dtype=np.int32)
+    return [_split_thresholds(forest, splits, position) for position in numeric_positions]
+
+
+def _cell_representatives(thresholds):
+    # One value inside each cell: cell i is (t[i-1], t[i]], the last one (t[-1], inf)
+    if not len(thresholds):
+        return np.zeros(1)
+    return np.append(thresholds, thresholds[-1] + 1.0)
+
+
+class RegionIndex:
+    """Model-like lookup index (classes_, predict_proba) over a Myco-Net FlatForest."""
+
+    def __init__(self, forest, categorical_thresholds, numeric_thresholds, codes=None, value_ids=None,
+                 values=None, learn=True):
+        names = list(forest.feature_names_in_)
+        self.forest = forest
+        self.learn = learn
+        self._categorical = [names.index(name) for name in CATEGORICAL_FEATURES]
+        self._numeric = [names.index(name) for name in NUMERIC_FEATURES]
+        self.categorical_thresholds = categorical_thresholds
+        # numeric_thresholds[combination][feature]
+        self.numeric_thresholds = numeric_thresholds
+        self._radix = [[len(t) + 1 for t in combination] for combination in numeric_thresholds]
+        self.stride = max(int(np.prod(radix)) for radix in self._radix)
+        n_classes = len(forest.classes_)
+        # (codes, value_ids, values) is replaced as a whole when cells are added
+        self._table = (np.empty(0, dtype=np.int64) if codes is None else codes,
+                       np.empty(0, dtype=np.int32) if value_ids is None else value_ids,
+                       np.empty((0, n_classes)) if values is None else values)
+        # Learned cells not merged yet: {code: probability row}
+        self._pending = {}
+        # Row bytes -> position in values, built at the first merge
+        self._value_positions = None
+        self.lookups = 0
+        self.hits = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, forest, X=None):
+        """Extract the thresholds of ``forest`` and precompute the cells of X's rows."""
+        names = list(forest.feature_names_in_)
+        categorical = [names.index(name) for name in CATEGORICAL_FEATURES]
+        numeric = [names.index(name) for name in NUMERIC_FEATURES]
+        internal = np.flatnonzero(~forest._is_leaf)
+        categorical_thresholds = [_split_thresholds(forest, internal, position) for position in categorical]
+        grids = np.meshgrid(*[_cell_representatives(t) for t in categorical_thresholds], indexing='ij')
+        combinations = np.stack([grid.ravel() for grid in grids], axis=1)
+        numeric_thresholds = [_reachable_thresholds(forest, categorical, values, numeric)
+                              for values in combinations]
+        index = cls(forest, categorical_thresholds, numeric_thresholds)
+        if X is not None:
+            index.add(X)
+        return index
+
+    @property
+    def classes_(self):
+        return self.forest.classes_
+
+    @property
+    def feature_importances_(self):
+        return self.forest.feature_importances_
+
+    @property
+    def feature_names_in_(self):
+        return self.forest.feature_names_in_
+
+    @property
+    def cells(self):
+        return len(self._table[0]) + len(self._pending)
+
+    @property
+    def dense_cells(self):
+        """Cells a full lookup table over every categorical combination would hold."""
+        return sum(int(np.prod(radix)) for radix in self._radix)
+
+    def cell_codes(self, X):
+        """int64 cell code of each row (float32 features as the forest sees them); -1 for NaN rows."""
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        combination = np.zeros(len(X), dtype=np.int64)
+        for thresholds, position in zip(self.categorical_thresholds, self._categorical):
+            combination = combination * (len(thresholds) + 1) + np.searchsorted(thresholds, X[:, position])
+        codes = np.empty(len(X), dtype=np.int64)
+        for value in np.unique(combination):
+            rows = np.flatnonzero(combination == value)
+            code = np.zeros(len(rows), dtype=np.int64)
+            for thresholds, position in zip(self.numeric_thresholds[value], self._numeric):
+                code = code * (len(thresholds) + 1) + np.searchsorted(thresholds, X[rows, position])
+            codes[rows] = value * self.stride + code
+        codes[np.isnan(X).any(axis=1)] = -1
+        return codes
+
+    def _find(self, codes):
+        table = self._table
+        table_codes = table[0]
+        positions = np.minimum(np.searchsorted(table_codes, codes), max(len(table_codes) - 1, 0))
+        if not len(table_codes):
+            return np.zeros(len(codes), dtype=bool), positions, table
+        found = (table_codes[positions] == codes) & (codes >= 0)
+        return found, positions, table
+
+    def add(self, X):
+        """Precompute the cells of X's rows that the index does not hold yet."""
+        X = self.forest._as_float32(X)
+        codes = self.cell_codes(X)
+        found, _, _ = self._find(codes)
+        new = np.flatnonzero(~found & (codes >= 0))
+        new_codes, first = np.unique(codes[new], return_index=True)
+        if len(new_codes):
+            with self._lock:
+                self._pending.update(zip(new_codes.tolist(), self.forest.predict_proba(X[new[first]])))
+                self._merge()
+        return len(new_codes)
+
+    def _merge(self):
+        """Move the side buffer into the sorted table (caller holds the lock)."""
+        if not self._pending:
+            return
+        table_codes, value_ids, values = self._table
+        new_codes = np.fromiter(self._pending, dtype=np.int64, count=len(self._pending))
+        new_proba = list(self._pending.values())
+        keep = ~np.isin(new_codes, table_codes)
+        if self._value_positions is None:
+            self._value_positions = {row.tobytes(): i for i, row in enumerate(values)}
+        # Only the new rows are looked up against the existing distinct outputs
+        added = []
+        new_ids = np.empty(int(keep.sum()), dtype=np.int32)
+        for j, i in enumerate(np.flatnonzero(keep)):
+            key = new_proba[i].tobytes()
+            if key not in self._value_positions:
+                self._value_positions[key] = len(values) + len(added)
+                added.append(new_proba[i])
+            new_ids[j] = self._value_positions[key]
+        if added:
+            values = np.concatenate([values, np.array(added)])
+        new_codes = new_codes[keep]
+        order = np.argsort(new_codes)
+        new_codes, new_ids = new_codes[order], new_ids[order]
+        at = np.searchsorted(table_codes, new_codes)
+        self._table = (np.insert(table_codes, at, new_codes), np.insert(value_ids, at, new_ids), values)
+        self._pending = {}
+
+    def _learn(self, codes, proba):
+        with self._lock:
+            self._pending.update(zip(codes.tolist(), proba))
+            if len(self._pending) >= MERGE_BATCH:
+                self._merge()
+
+    def predict_proba(self, X):
+        X = self.forest._as_float32(X)
+        codes = self.cell_codes(X)
+        found, positions, (_, value_ids, values) = self._find(codes)
+        proba = np.empty((len(X), len(self.classes_)), dtype=np.float64)
+        proba[found] = values[value_ids[positions[found]]]
+        missed = np.flatnonzero(~found)
+        if missed.size and self._pending:
+            pending = self._pending
+            buffered = [pending.get(code) for code in codes[missed].tolist()]
+            in_buffer = np.array([row is not None for row in buffered])
+            if in_buffer.any():
+                proba[missed[in_buffer]] = [row for row in buffered if row is not None]
+                found[missed[in_buffer]] = True
+                missed = missed[~in_buffer]
+        if missed.size:
+            proba[missed] = self.forest.predict_proba(X[missed])
+            if self.learn and self.cells < MAX_CELLS:
+                learnable = missed[codes[missed] >= 0]
+                new_codes, first = np.unique(codes[learnable], return_index=True)
+                self._learn(new_codes, proba[learnable[first]])
+        with self._lock:
+            self.lookups += len(X)
+            self.hits += int(found.sum())
+        return proba
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+    def hit_rate(self):
+        return self.hits / self.lookups if self.lookups else 0.0
+
+    def memory_report(self):
+        """Bytes held by the index, next to what a dense cell table would need."""
+        with self._lock:
+            self._merge()
+        table_codes, value_ids, values = self._table
+        thresholds = sum(t.nbytes for t in self.categorical_thresholds)
+        thresholds += sum(t.nbytes for combination in self.numeric_thresholds for t in combination)
+        report = {
+            'cells': self.cells,
+            'distinct_outputs': len(values),
+            'threshold_bytes': thresholds,
+            'code_bytes': table_codes.nbytes,
+            'value_id_bytes': value_ids.nbytes,
+            'value_bytes': values.nbytes,
+            'dense_cells': self.dense_cells,
+            'dense_bytes': self.dense_cells * values.shape[1] * values.itemsize,
+        }
+        report['total_bytes'] = report['threshold_bytes'] + report['code_bytes'] + \
+            report['value_id_bytes'] + report['value_bytes']
+        return report
+
+    def save(self, path):
+        with self._lock:
+            self._merge()
+        table_codes, value_ids, values = self._table
+        np.savez(path,
+                 fingerprint=np.array(forest_fingerprint(self.forest)),
+                 categorical_thresholds=np.concatenate(self.categorical_thresholds),
+                 categorical_lengths=np.array([len(t) for t in self.categorical_thresholds]),
+                 numeric_thresholds=np.concatenate([t for combination in self.numeric_thresholds
+                                                    for t in combination]),
+                 numeric_lengths=np.array([[len(t) for t in combination]
+                                           for combination in self.numeric_thresholds]),
+                 codes=table_codes, value_ids=value_ids, values=values)
+
+    @classmethod
+    def load(cls, path, forest, learn=True):
+        """Load an index saved for ``forest``; raises ValueError if it was built for another model."""
+        with np.load(path) as arrays:
+            if str(arrays['fingerprint']) != forest_fingerprint(forest):
+                raise ValueError(f"{path} was built for a different model; rebuild it with "
+                                 "python src/region_index.py build")
+            categorical = np.split(arrays['categorical_thresholds'], np.cumsum(arrays['categorical_lengths'])[:-1])
+            lengths = arrays['numeric_lengths']
+            flat = np.split(arrays['numeric_thresholds'], np.cumsum(lengths.ravel())[:-1])
+            numeric = [flat[i:i + lengths.shape[1]] for i in range(0, len(flat), lengths.shape[1])]
+            return cls(forest, categorical, numeric, arrays['codes'], arrays['value_ids'], arrays['values'],
+                       learn=learn)
+
+
+def region_index_available(models_dir=MODELS_DIR):
+    return os.path.exists(os.path.join(models_dir, REGION_FILE))
+
+
+def load_region_index(forest, models_dir=MODELS_DIR, learn=True):
+    return RegionIndex.load(os.path.join(models_dir, REGION_FILE), forest, learn)
+
+
+def sample_rows(X, n, random_state=0):
+    """Uniform samples over X's numeric ranges, with categorical codes drawn from X."""
+    rng = np.random.default_rng(random_state)
+    samples = X.iloc[rng.integers(0, len(X), n)].reset_index(drop=True)
+    for name in NUMERIC_FEATURES:
+        samples[name] = rng.uniform(X[name].min(), X[name].max(), n)
+    return samples
+
+
+def check_exact(index, model, X):
+    """True if the index reproduces ``model.predict_proba`` bit-for-bit on X."""
+    return bool(np.array_equal(index.predict_proba(X), model.predict_proba(X)))
+
+
+def _format_bytes(n):
+    return f"{n / 1024 ** 2:,.2f} MB" if n >= 1024 ** 2 else f"{n / 1024:,.1f} KB"
+
+
+def main():
+    import pandas as pd
+
+    from assets import load_assets
+    from bundle import load_flat_assets
+    from datasets import encode_myco, load_myco_frame
+
+    parser = argparse.ArgumentParser(description="Exact decision-region lookup index for the Myco-Net forest")
+    parser.add_argument('command', choices=['build', 'check'])
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--samples', type=int, default=DEFAULT_SAMPLES,
+                        help="Uniform samples of the numeric ranges to precompute besides the data rows")
+    args = parser.parse_args()
+
+    _, forest, le_species, le_light, le_microbe = load_flat_assets(args.models_dir)
+    X, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index = RegionIndex.build(forest, pd.concat([X, sample_rows(X, args.samples)], ignore_index=True))
+        path = os.path.join(args.models_dir, REGION_FILE)
+        index.save(path)
+        print(f"{index.cells:,} cells precomputed in {time.perf_counter() - start:.1f}s -> {path}")
+    else:
+        if not region_index_available(args.models_dir):
+            raise SystemExit("Build the index first: python src/region_index.py build")
+        index = load_region_index(forest, args.models_dir, learn=False)
+        _, myco_model, *_ = load_assets(args.models_dir)
+        unseen = sample_rows(X, len(X), random_state=1)
+        exact = check_exact(index, myco_model, X) and check_exact(index, myco_model, unseen)
+        index.lookups = index.hits = 0
+        index.predict_proba(unseen)
+        print(f"exact={exact} on {len(X):,} data rows and {len(unseen):,} new samples "
+              f"({index.hit_rate():.1%} of the new samples hit a precomputed cell)")
+        for name, rows in (('data rows', X), ('single row', X.iloc[:1])):
+            timings = {}
+            for engine, model in (('forest', forest), ('index', index)):
+                start = time.perf_counter()
+                for _ in range(20):
+                    model.predict_proba(rows)
+                timings[engine] = (time.perf_counter() - start) / 20
+            print(f"{name}: forest {timings['forest'] * 1000:.3f} ms, index {timings['index'] * 1000:.3f} ms "
+                  f"({timings['forest'] / timings['index']:.1f}x)")
+        report = index.memory_report()
+        print(f"memory: {_format_bytes(report['total_bytes'])} for {report['cells']:,} cells "
+              f"({report['distinct_outputs']:,} distinct outputs; thresholds {_format_bytes(report['threshold_bytes'])}, "
+              f"codes {_format_bytes(report['code_bytes'])}, value ids {_format_bytes(report['value_id_bytes'])}, "
+              f"values {_format_bytes(report['value_bytes'])}); a dense table of all "
+              f"{report['dense_cells']:,} cells would need {_format_bytes(report['dense_bytes'])}")
+        if not exact:
+            raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
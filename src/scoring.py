@@ -0,0 +1,99 @@
+# scoring.py
+"""Batch scoring helpers shared by the Streamlit app and command line tools."""
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from explain import class_contributions, contribution_columns
+from metrics import span
+
+PH_FEATURES = ['Soil_Moisture', 'Ambient_Temperature', 'Soil_Temperature',
+               'Humidity', 'Light_Intensity', 'Soil_pH',
+               'Nitrogen_Level', 'Phosphorus_Level', 'Potassium_Level',
+               'Chlorophyll_Content', 'Electrochemical_Signal']
+
+MYCO_FEATURES = ['Species_encoded', 'Light_encoded', 'Microbe_encoded', 'AMF',
+                 'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
+
+DEFAULT_CHUNK_SIZE = 10000
+
+
+def predict_with_confidence(model, X):
+    """Score X with a single predict_proba pass.
+
+    The label is taken from the argmax of the probabilities (exactly what
+    RandomForestClassifier.predict does internally), so the forest is only
+    traversed once. Returns (labels, confidence in %, probabilities).
+    """
+    with span('predict_proba'):
+        proba = model.predict_proba(X)
+    best = np.argmax(proba, axis=1)
+    labels = model.classes_.take(best)
+    confidence = proba[np.arange(len(best)), best] * 100
+    return labels, confidence, proba
+
+
+def fungal_risk_level(labels):
+    """Map myco_model labels to the risk levels shown in the app."""
+    return np.where(np.asarray(labels) == 1, "Low Risk", "High Risk")
+
+
+def read_chunks(source, chunk_size=DEFAULT_CHUNK_SIZE, name=None):
+    """Yield DataFrame chunks from a CSV or Parquet file (path or file object)."""
+    name = name or getattr(source, 'name', None) or str(source)
+    if os.path.splitext(name)[1].lower() in ('.parquet', '.pq'):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        for chunk in pd.read_csv(source, chunksize=chunk_size):
+            yield chunk
+
+
+def score_chunks(model, chunks, features=PH_FEATURES, stats=None, explainer=None):
+    """Score an iterable of DataFrame chunks, yielding each chunk with
+    ``Predicted_Status`` and ``Confidence`` columns appended.
+
+    If ``stats`` is a dict it is updated in place with ``rows``,
+    ``seconds`` (time spent in the model) and ``rows_per_sec``. With an
+    ``explainer`` (a FlatForest of the same model) every row also gets
+    ``Contribution_<feature>`` columns toward its predicted status.
+    """
+    if stats is None:
+        stats = {}
+    stats.update(rows=0, seconds=0.0, rows_per_sec=0.0)
+    for chunk in chunks:
+        missing = [col for col in features if col not in chunk.columns]
+        if missing:
+            raise ValueError(f"Input is missing required columns: {', '.join(missing)}")
+        start = time.perf_counter()
+        labels, confidence, _ = predict_with_confidence(model, chunk[features])
+        stats['seconds'] += time.perf_counter() - start
+        stats['rows'] += len(chunk)
+        if stats['seconds'] > 0:
+            stats['rows_per_sec'] = stats['rows'] / stats['seconds']
+        chunk = chunk.assign(Predicted_Status=labels, Confidence=np.round(confidence, 2))
+        if explainer is not None:
+            with span('explain'):
+                _, contributions = class_contributions(explainer, chunk[features], labels)
+            chunk = pd.concat([chunk, contribution_columns(contributions)], axis=1)
+        yield chunk
+
+
+def write_scored_csv(model, chunks, out, features=PH_FEATURES, stats=None, on_chunk=None, explainer=None):
+    """Stream scored chunks to ``out`` (a text file object) as CSV.
+
+    ``on_chunk(stats)`` is called after each chunk is written, e.g. to drive a
+    progress bar. ``explainer`` is passed to score_chunks. Returns the stats dict.
+    """
+    if stats is None:
+        stats = {}
+    header = True
+    for scored in score_chunks(model, chunks, features, stats, explainer):
+        scored.to_csv(out, index=False, header=header)
+        header = False
+        if on_chunk is not None:
+            on_chunk(stats)
+    return stats
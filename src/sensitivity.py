@@ -0,0 +1,76 @@
+# sensitivity.py
+"""What-if sweeps: score one input vector with one or two features varied over a grid.
+
+The whole grid is built as one feature matrix (the base row repeated, the
+swept columns overwritten) and scored with a single predict_proba call.
+
+    python src/sensitivity.py --size 100   # time a 100x100 sweep for both models
+"""
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def grid_values(low, high, size):
+    return np.linspace(low, high, size)
+
+
+def sweep(model, base, features, x_feature, x_values, y_feature=None, y_values=None):
+    """Score ``base`` (a mapping or one-row frame) over a 1-D or 2-D grid.
+
+    Returns (proba, labels): proba has shape (len(y_values), len(x_values),
+    n_classes) for a 2-D sweep and (len(x_values), n_classes) for a 1-D one;
+    labels are the predicted classes with the grid's shape.
+    """
+    base = pd.DataFrame([base])[features] if not hasattr(base, 'columns') else base[features]
+    x_values = np.asarray(x_values, dtype=np.float64)
+    if y_feature is None:
+        shape = (len(x_values),)
+        columns = {x_feature: x_values}
+    else:
+        if y_feature == x_feature:
+            raise ValueError("Sweep two different features")
+        y_values = np.asarray(y_values, dtype=np.float64)
+        shape = (len(y_values), len(x_values))
+        xx, yy = np.meshgrid(x_values, y_values)
+        columns = {x_feature: xx.ravel(), y_feature: yy.ravel()}
+
+    n_points = int(np.prod(shape))
+    grid = pd.DataFrame(np.repeat(base.to_numpy(dtype=np.float64), n_points, axis=0), columns=features)
+    for feature, values in columns.items():
+        grid[feature] = values
+    proba = model.predict_proba(grid)
+    labels = np.asarray(model.classes_).take(np.argmax(proba, axis=1))
+    return proba.reshape(shape + (proba.shape[1],)), labels.reshape(shape)
+
+
+def main():
+    from bundle import load_flat_assets
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+    from scoring import MYCO_FEATURES, PH_FEATURES
+
+    parser = argparse.ArgumentParser(description="Time a what-if grid sweep for both models")
+    parser.add_argument('--size', type=int, default=100, help="Grid points per swept feature")
+    args = parser.parse_args()
+
+    plant_model, myco_model, le_species, le_light, le_microbe = load_flat_assets()
+    X_plant, _ = load_plant_data()
+    X_myco, _ = encode_myco(load_myco_frame(), le_species, le_light, le_microbe)
+    cases = [
+        ('plant_model', plant_model, X_plant, PH_FEATURES, 'Soil_Moisture', 'Nitrogen_Level'),
+        ('myco_model', myco_model, X_myco, MYCO_FEATURES, 'AMF', 'NSC_Imp'),
+    ]
+    for name, model, X, features, x_feature, y_feature in cases:
+        base = X.iloc[0]
+        x_values = grid_values(X[x_feature].min(), X[x_feature].max(), args.size)
+        y_values = grid_values(X[y_feature].min(), X[y_feature].max(), args.size)
+        start = time.perf_counter()
+        proba, _ = sweep(model, base.to_dict(), features, x_feature, x_values, y_feature, y_values)
+        seconds = time.perf_counter() - start
+        print(f"{name}: {x_feature} x {y_feature}, {proba.shape[0] * proba.shape[1]:,} points in {seconds * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
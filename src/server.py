@@ -0,0 +1,267 @@
+# server.py
+"""Headless prediction service for the plant health and Myco-Net models.
+
+Run from the project root:
+
+    python src/server.py --port 8000
+
+Endpoints (POST, JSON body is a single record, a list of records or
+``{"records": [...]}``):
+
+    /plant-health   records with the PH_FEATURES sensor fields
+    /fungal-risk    records with Species, Light, Microbe, AMF, PHN_Imp, NSC_Imp, LIG_Imp
+
+GET /health returns the service status and GET /metrics the stage
+latency histograms in the Prometheus text format. Concurrent requests are collected
+by a micro-batcher per model and scored with one predict_proba call.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from assets import MODELS_DIR, load_assets
+from bundle import load_flat_assets
+from encoding import ENCODED_COLUMNS, EncodingTable
+from metrics import RECORDER, span
+from pruning import load_pruned_assets
+from scoring import MYCO_FEATURES, PH_FEATURES, fungal_risk_level
+
+MYCO_INPUT_FIELDS = ['Species', 'Light', 'Microbe', 'AMF', 'PHN_Imp', 'NSC_Imp', 'LIG_Imp']
+CATEGORICAL_FIELDS = ['Species', 'Light', 'Microbe']
+
+
+class MicroBatcher:
+    """Collects concurrent scoring requests into a single predict_proba call.
+
+    A request is flushed once ``max_batch`` rows are waiting or the oldest
+    request has waited ``max_wait`` seconds, whichever comes first.
+    """
+
+    def __init__(self, model, max_batch=512, max_wait=0.005):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, frame):
+        """Queue a DataFrame for scoring and return a Future of its probabilities."""
+        future = Future()
+        self._queue.put((frame, future))
+        return future
+
+    def _run(self):
+        while True:
+            pending = [self._queue.get()]
+            rows = len(pending[0][0])
+            deadline = time.monotonic() + self.max_wait
+            while rows < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                pending.append(item)
+                rows += len(item[0])
+            self._flush(pending)
+
+    def _flush(self, pending):
+        try:
+            frame = pd.concat([item[0] for item in pending], ignore_index=True)
+            with span('batch_predict_proba'):
+                proba = self.model.predict_proba(frame)
+        except Exception as e:
+            for _, future in pending:
+                future.set_exception(e)
+            return
+        self.batches += 1
+        self.rows += len(frame)
+        start = 0
+        for item, future in pending:
+            stop = start + len(item)
+            future.set_result(proba[start:stop])
+            start = stop
+
+
+class PredictionService:
+    """Holds the models once per process and turns JSON records into predictions."""
+
+    def __init__(self, models_dir=MODELS_DIR, max_batch=512, max_wait=0.005, engine='flat'):
+        loader = {'flat': load_flat_assets, 'pruned': load_pruned_assets}.get(engine, load_assets)
+        with span('load_assets'):
+            self.plant_model, self.myco_model, *encoders = loader(models_dir)
+        # Encoding tables in every engine; the pickled LabelEncoders are slow per request
+        self.le_species, self.le_light, self.le_microbe = (
+            encoder if isinstance(encoder, EncodingTable) else EncodingTable.from_encoder(encoder, column)
+            for encoder, column in zip(encoders, ENCODED_COLUMNS))
+        self.plant_batcher = MicroBatcher(self.plant_model, max_batch, max_wait)
+        self.myco_batcher = MicroBatcher(self.myco_model, max_batch, max_wait)
+
+    def plant_health(self, records):
+        frame = _records_frame(records, PH_FEATURES)
+        proba = self.plant_batcher.submit(frame).result()
+        return _format(self.plant_model.classes_, proba, lambda labels: {'status': labels})
+
+    def fungal_risk(self, records):
+        raw = _records_frame(records, MYCO_INPUT_FIELDS)
+        frame = pd.DataFrame({
+            'Species_encoded': self.le_species.transform(raw['Species']),
+            'Light_encoded': self.le_light.transform(raw['Light']),
+            'Microbe_encoded': self.le_microbe.transform(raw['Microbe']),
+            'AMF': raw['AMF'],
+            'PHN_Imp': raw['PHN_Imp'],
+            'NSC_Imp': raw['NSC_Imp'],
+            'LIG_Imp': raw['LIG_Imp'],
+        }, columns=MYCO_FEATURES)
+        proba = self.myco_batcher.submit(frame).result()
+        return _format(self.myco_model.classes_, proba,
+                       lambda labels: {'risk_level': fungal_risk_level(labels)})
+
+    def status(self):
+        return {
+            'status': 'ok',
+            'plant_health': {'batches': self.plant_batcher.batches, 'rows': self.plant_batcher.rows},
+            'fungal_risk': {'batches': self.myco_batcher.batches, 'rows': self.myco_batcher.rows},
+        }
+
+
+def _records_frame(records, fields):
+    missing = sorted({field for record in records for field in fields if field not in record})
+    if missing:
+        raise ValueError(f"Records are missing required fields: {', '.join(missing)}")
+    categorical = [field for field in fields if field in CATEGORICAL_FIELDS]
+    numeric = [field for field in fields if field not in CATEGORICAL_FIELDS]
+    not_strings = sorted({field for record in records for field in categorical
+                          if not isinstance(record[field], str)})
+    if not_strings:
+        raise ValueError(f"{', '.join(not_strings)} must be strings")
+    # bool is an int subclass, and JSON null arrives as None
+    not_numbers = sorted({field for record in records for field in numeric
+                          if isinstance(record[field], bool) or not isinstance(record[field], (int, float))})
+    if not_numbers:
+        raise ValueError(f"Sensor fields must be numbers: {', '.join(not_numbers)}")
+    try:
+        frame = pd.DataFrame.from_records(records, columns=fields)
+        frame[numeric] = frame[numeric].astype(np.float64)
+    except OverflowError:
+        raise ValueError("Sensor fields must be finite numbers")
+    if not np.isfinite(frame[numeric].to_numpy()).all():
+        raise ValueError("Sensor fields must be finite numbers")
+    return frame
+
+
+def _format(classes, proba, describe):
+    best = np.argmax(proba, axis=1)
+    labels = classes.take(best)
+    # tolist() gives plain Python values for both object and numeric label arrays
+    fields = {name: np.asarray(values).tolist() for name, values in describe(labels).items()}
+    labels = labels.tolist()
+    results = []
+    for i, row in enumerate(proba):
+        result = {name: values[i] for name, values in fields.items()}
+        result['prediction'] = labels[i]
+        result['confidence'] = round(float(row[best[i]]) * 100, 2)
+        result['probabilities'] = {str(c): float(p) for c, p in zip(classes, row)}
+        results.append(result)
+    return results
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    service = None
+    routes = {'/plant-health': 'plant_health', '/fungal-risk': 'fungal_risk'}
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, self.service.status())
+        elif self.path == '/metrics':
+            data = RECORDER.prometheus_text().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        else:
+            self._send(404, {'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        route = self.routes.get(self.path)
+        if route is None:
+            self._send(404, {'error': f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            body = json.loads(self.rfile.read(length) or b'null')
+        except ValueError:
+            self._send(400, {'error': "Request body must be valid JSON"})
+            return
+
+        single = isinstance(body, dict) and 'records' not in body
+        records = [body] if single else body.get('records') if isinstance(body, dict) else body
+        if not isinstance(records, list) or not records or not all(isinstance(r, dict) for r in records):
+            self._send(400, {'error': "Expected a record, a list of records or {\"records\": [...]}"})
+            return
+
+        try:
+            with span(f"{route}_request"):
+                results = getattr(self.service, route)(records)
+        except ValueError as e:
+            self._send(400, {'error': str(e)})
+            return
+        except Exception as e:
+            # Still answer, so the client is not left with a closed connection
+            self._send(500, {'error': f"Scoring failed: {e}"})
+            return
+        self._send(200, results[0] if single else {'predictions': results})
+
+    def _send(self, code, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Myco-Net headless prediction service")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--max-batch', type=int, default=512,
+                        help="Maximum rows scored in one predict_proba call")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="Longest a request waits for others to join its batch")
+    parser.add_argument('--engine', choices=['flat', 'pruned', 'sklearn'], default='flat',
+                        help="Use the flat-array forest, the pruned forest (both give identical "
+                             "predictions) or the pickled sklearn models")
+    args = parser.parse_args()
+
+    PredictionHandler.service = PredictionService(args.models_dir, args.max_batch,
+                                                   args.max_wait_ms / 1000, args.engine)
+    server = ThreadingHTTPServer((args.host, args.port), PredictionHandler)
+    print(f"Myco-Net prediction service listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,284 @@
+# streaming.py
+"""Streaming ingestion of plant sensor feeds with rolling per-Plant_ID state.
+
+Readings arrive from a tailed CSV/JSONL file or a local TCP socket (one JSON
+object or CSV line per reading), are grouped into micro-batches and scored
+with one predict_proba call per batch. For every plant only the last
+``window`` scored readings are kept, and at most ``max_plants`` plants are
+tracked (least recently seen plants are dropped first), so memory stays
+bounded however long the feed runs.
+
+    python src/streaming.py data/plant_health_data.csv --from-start
+    python src/streaming.py --listen 127.0.0.1:9009
+"""
+import argparse
+import csv
+import io
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+from collections import OrderedDict, deque
+
+import numpy as np
+import pandas as pd
+
+from scoring import PH_FEATURES, predict_with_confidence
+
+
+class PlantState:
+    __slots__ = ('timestamps', 'statuses', 'confidences', 'status', 'since')
+
+    def __init__(self, window):
+        self.timestamps = deque(maxlen=window)
+        self.statuses = deque(maxlen=window)
+        self.confidences = deque(maxlen=window)
+        self.status = None
+        self.since = None
+
+
+class PlantHealthMonitor:
+    """Scores micro-batches of readings and keeps a rolling window per plant."""
+
+    def __init__(self, model, window=48, max_plants=100000, max_transitions=10000):
+        self.model = model
+        self.window = window
+        self.max_plants = max_plants
+        self.plants = OrderedDict()
+        self.transitions = deque(maxlen=max_transitions)
+        self.transition_count = 0
+        self.readings = 0
+        self.batches = 0
+        self.dropped_plants = 0
+        self._lock = threading.Lock()
+
+    def update(self, frame):
+        """Score a DataFrame of readings (Timestamp, Plant_ID and PH_FEATURES)."""
+        if frame.empty:
+            return
+        labels, confidence, _ = predict_with_confidence(self.model, frame[PH_FEATURES])
+        timestamps = frame['Timestamp'].astype(str).to_numpy() if 'Timestamp' in frame else \
+            np.full(len(frame), time.strftime("%Y-%m-%d %H:%M:%S"))
+        with self._lock:
+            for plant_id, timestamp, status, conf in zip(frame['Plant_ID'].to_numpy(), timestamps,
+                                                         labels, confidence):
+                state = self.plants.get(plant_id)
+                if state is None:
+                    state = self.plants[plant_id] = PlantState(self.window)
+                    if len(self.plants) > self.max_plants:
+                        self.plants.popitem(last=False)
+                        self.dropped_plants += 1
+                else:
+                    self.plants.move_to_end(plant_id)
+                state.timestamps.append(timestamp)
+                state.statuses.append(status)
+                state.confidences.append(float(conf))
+                if status != state.status:
+                    if state.status is not None:
+                        self.transitions.append({'Plant_ID': plant_id, 'Timestamp': timestamp,
+                                                 'From': state.status, 'To': status,
+                                                 'Confidence': round(float(conf), 1)})
+                        self.transition_count += 1
+                    state.status = status
+                    state.since = timestamp
+            self.readings += len(frame)
+            self.batches += 1
+
+    def snapshot(self):
+        """One row per tracked plant with its current status and window summary."""
+        with self._lock:
+            rows = [{
+                'Plant_ID': plant_id,
+                'Status': state.status,
+                'Since': state.since,
+                'Last_Reading': state.timestamps[-1],
+                'Confidence': round(state.confidences[-1], 1),
+                'Readings_In_Window': len(state.statuses),
+                'Stressed_Share': sum(s != "Healthy" for s in state.statuses) / len(state.statuses),
+            } for plant_id, state in self.plants.items()]
+        return pd.DataFrame(rows, columns=['Plant_ID', 'Status', 'Since', 'Last_Reading', 'Confidence',
+                                           'Readings_In_Window', 'Stressed_Share'])
+
+    def recent_transitions(self, limit=100, plant_id=None):
+        with self._lock:
+            transitions = [t for t in self.transitions if plant_id is None or t['Plant_ID'] == plant_id]
+        return transitions[-limit:][::-1]
+
+    def stats(self):
+        with self._lock:
+            return {'plants': len(self.plants), 'readings': self.readings, 'batches': self.batches,
+                    'transitions': self.transition_count, 'dropped_plants': self.dropped_plants}
+
+
+def _parse_line(line, header):
+    """Parse one feed line into a record dict (JSON object or CSV row)."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        return json.loads(line)
+    values = next(csv.reader([line]))
+    if header is None or len(values) != len(header):
+        raise ValueError(f"CSV line does not match the header: {line[:80]}")
+    return dict(zip(header, values))
+
+
+def _put(out, record, stop, timeout=0.5):
+    # A full queue must not keep the feed thread alive after stop is set
+    while not stop.is_set():
+        try:
+            out.put(record, timeout=timeout)
+            return
+        except queue.Full:
+            continue
+
+
+def tail_file(path, out, stop, from_start=False, poll_interval=0.5):
+    """Follow a CSV or JSONL file, putting each new record on the ``out`` queue."""
+    is_csv = os.path.splitext(path)[1].lower() == '.csv'
+    with open(path, newline='') as f:
+        header = next(csv.reader([f.readline()])) if is_csv else None
+        if not from_start:
+            f.seek(0, os.SEEK_END)
+        pending = ''
+        while not stop.is_set():
+            chunk = f.readline()
+            if not chunk:
+                time.sleep(poll_interval)
+                continue
+            pending += chunk
+            if not pending.endswith('\n'):
+                continue  # partial line, wait for the writer to finish it
+            try:
+                record = _parse_line(pending, header)
+            except ValueError:
+                record = None  # malformed line, skip it
+            pending = ''
+            if record is not None:
+                _put(out, record, stop, poll_interval)
+
+
+def serve_socket(host, port, out, stop):
+    """Accept readings on a TCP socket, one JSON object (or header + CSV rows) per line."""
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self):
+            header = None
+            for raw in io.TextIOWrapper(self.rfile, encoding='utf-8'):
+                if stop.is_set():
+                    return
+                if header is None and not raw.lstrip().startswith('{'):
+                    header = next(csv.reader([raw.strip()]))
+                    continue
+                try:
+                    record = _parse_line(raw, header)
+                except ValueError:
+                    continue
+                if record is not None:
+                    _put(out, record, stop)
+
+    server = socketserver.ThreadingTCPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=lambda: (stop.wait(), server.shutdown()), daemon=True).start()
+    server.serve_forever()
+    server.server_close()
+
+
+class StreamIngestor:
+    """Runs a feed source and scores its records in micro-batches on background threads."""
+
+    def __init__(self, monitor, max_rows=1000, max_wait=1.0):
+        self.monitor = monitor
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self.errors = 0
+        self.last_error = None
+        self.records = queue.Queue(maxsize=max_rows * 100)
+        self.stop = threading.Event()
+        self._threads = []
+
+    def start(self, source, *args, **kwargs):
+        """Start ``source(*args, out, stop, **kwargs)`` and the scoring loop."""
+        feed = threading.Thread(target=source, args=args + (self.records, self.stop), kwargs=kwargs, daemon=True)
+        scorer = threading.Thread(target=self._run, daemon=True)
+        self._threads = [feed, scorer]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def _run(self):
+        while not self.stop.is_set():
+            try:
+                batch = [self.records.get(timeout=self.max_wait)]
+            except queue.Empty:
+                continue
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_rows:
+                try:
+                    batch.append(self.records.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            self._score(batch)
+
+    def _score(self, batch):
+        # Any failure is counted and the loop goes on, so one bad batch cannot stop the feed
+        try:
+            frame = pd.DataFrame.from_records(batch)
+            frame[PH_FEATURES] = frame[PH_FEATURES].apply(pd.to_numeric, errors='coerce')
+            frame = frame.dropna(subset=PH_FEATURES + ['Plant_ID'])
+            frame['Plant_ID'] = frame['Plant_ID'].astype(str)
+            self.monitor.update(frame)
+        except Exception as e:
+            self.errors += 1
+            self.last_error = f"{type(e).__name__}: {e}"
+
+    def close(self, timeout=5.0):
+        """Stop the feed and the scoring loop and wait for both threads."""
+        self.stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+
+def main():
+    from assets import load_assets
+    from bundle import load_flat_assets
+    from forest import BatchRouter
+
+    parser = argparse.ArgumentParser(description="Score a live plant sensor feed")
+    parser.add_argument('feed', nargs='?', help="CSV or JSONL file to follow")
+    parser.add_argument('--listen', help="host:port to accept readings on instead of a file")
+    parser.add_argument('--from-start', action='store_true', help="Score the existing file content first")
+    parser.add_argument('--window', type=int, default=48, help="Readings kept per plant")
+    parser.add_argument('--max-rows', type=int, default=1000, help="Largest micro-batch")
+    args = parser.parse_args()
+    if not args.feed and not args.listen:
+        parser.error("give a feed file or --listen host:port")
+
+    # Backlog micro-batches above LARGE_BATCH_ROWS go to the pickled forest
+    plant_model = BatchRouter(load_flat_assets()[0], lambda: load_assets()[0])
+    monitor = PlantHealthMonitor(plant_model, window=args.window)
+    ingestor = StreamIngestor(monitor, max_rows=args.max_rows)
+    if args.listen:
+        host, port = args.listen.rsplit(':', 1)
+        ingestor.start(serve_socket, host, int(port))
+    else:
+        ingestor.start(tail_file, args.feed, from_start=args.from_start)
+
+    seen = 0
+    try:
+        while True:
+            time.sleep(1)
+            stats = monitor.stats()
+            new = min(stats['transitions'] - seen, len(monitor.transitions))
+            for t in monitor.recent_transitions(limit=new)[::-1] if new else []:
+                print(f"{t['Timestamp']}  plant {t['Plant_ID']}: {t['From']} -> {t['To']} ({t['Confidence']}%)")
+            seen = stats['transitions']
+            print(f"[{stats['readings']} readings, {stats['plants']} plants, {stats['batches']} batches]", end='\r')
+    except KeyboardInterrupt:
+        ingestor.close()
+
+
+if __name__ == '__main__':
+    main()
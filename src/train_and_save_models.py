@@ -0,0 +1,174 @@
+# train_and_save_models.py
+"""Train the Plant Health and Myco-Net forests from data/ and write models/.
+
+Reproduces the training cells of the notebook (same features, splits and
+random_state) but fits the trees on all cores, writes the artifacts next to
+each other in models/ (pickles + fast-start bundle) and records how long
+every stage took in models/training_report.json.
+
+    python src/train_and_save_models.py                    # full retrain
+    python src/train_and_save_models.py --add-trees 20 \\
+        --plant-data new_readings.csv                       # grow existing forests
+    python src/train_and_save_models.py --distill          # also write compact fast-path models
+
+With --add-trees the existing models are loaded and warm-started: the
+requested number of trees is fitted on the given data and appended, the
+existing trees are kept as they are.
+"""
+import argparse
+import datetime
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import joblib
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder
+
+from assets import MODEL_FILES, MODELS_DIR, load_assets
+from bundle import BUNDLE_DIR, build_bundle
+from datasets import PLANT_DATA, TREE_DATA, encode_myco, load_myco_frame, load_plant_data
+from distill import COMPACT_FILES, distill, fidelity_report, print_report, save_compact
+from forest import FlatForest
+from pruning import pruned_models_available, write_pruned
+
+N_ESTIMATORS = 100
+RANDOM_STATE = 42
+PLANT_TEST_SIZE = 0.2
+MYCO_TEST_SIZE = 0.3
+REPORT_FILE = 'training_report.json'
+
+
+class StageTimer:
+    """Records wall-clock time per named stage."""
+
+    def __init__(self):
+        self.stages = []
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.stages.append({'stage': name, 'seconds': round(seconds, 4)})
+            print(f"  {name:<28} {seconds:8.3f}s")
+
+
+def grow_forest(model, X, y, add_trees, n_jobs):
+    """Append ``add_trees`` trees fitted on (X, y) to an existing forest."""
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + add_trees, n_jobs=n_jobs)
+    model.fit(X, y)
+    model.set_params(warm_start=False)
+    return model
+
+
+def new_forest(n_jobs):
+    return RandomForestClassifier(n_estimators=N_ESTIMATORS, random_state=RANDOM_STATE, n_jobs=n_jobs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Train and save the Myco-Net models")
+    parser.add_argument('--plant-data', default=PLANT_DATA)
+    parser.add_argument('--tree-data', default=TREE_DATA)
+    parser.add_argument('--models-dir', default=MODELS_DIR)
+    parser.add_argument('--n-jobs', type=int, default=-1, help="Cores used to fit the trees (-1 = all)")
+    parser.add_argument('--add-trees', type=int, default=0,
+                        help="Warm-start the existing models and add this many trees fitted on the given data")
+    parser.add_argument('--no-bundle', action='store_true', help="Only write the .pkl files")
+    parser.add_argument('--distill', action='store_true',
+                        help="Also distill compact fast-path models and report their fidelity")
+    args = parser.parse_args()
+
+    timer = StageTimer()
+    report = {'started': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+              'n_jobs': args.n_jobs, 'add_trees': args.add_trees}
+    os.makedirs(args.models_dir, exist_ok=True)
+
+    print("Training Myco-Net models")
+    if args.add_trees:
+        with timer.stage('load existing models'):
+            plant_model, myco_model, le_species, le_light, le_microbe = load_assets(args.models_dir)
+
+    # Plant Health model
+    with timer.stage('load plant data'):
+        X_ph, y_ph = load_plant_data(args.plant_data)
+        X_train_ph, X_test_ph, y_train_ph, y_test_ph = train_test_split(
+            X_ph, y_ph, test_size=PLANT_TEST_SIZE, random_state=RANDOM_STATE)
+    with timer.stage('fit plant model'):
+        if args.add_trees:
+            plant_model = grow_forest(plant_model, X_train_ph, y_train_ph, args.add_trees, args.n_jobs)
+        else:
+            plant_model = new_forest(args.n_jobs).fit(X_train_ph, y_train_ph)
+    with timer.stage('evaluate plant model'):
+        report['plant_accuracy'] = accuracy_score(y_test_ph, plant_model.predict(X_test_ph))
+
+    # Myco-Net model
+    with timer.stage('load tree data'):
+        myco_df = load_myco_frame(args.tree_data)
+        if not args.add_trees:
+            # The encoders are only refitted on a full retrain so existing codes stay valid
+            le_species = LabelEncoder().fit(myco_df['Species'])
+            le_light = LabelEncoder().fit(myco_df['Light'])
+            le_microbe = LabelEncoder().fit(myco_df['Microbe'])
+        X_myco, y_myco = encode_myco(myco_df, le_species, le_light, le_microbe)
+        X_train_myco, X_test_myco, y_train_myco, y_test_myco = train_test_split(
+            X_myco, y_myco, test_size=MYCO_TEST_SIZE, random_state=RANDOM_STATE)
+    with timer.stage('fit myco model'):
+        if args.add_trees:
+            myco_model = grow_forest(myco_model, X_train_myco, y_train_myco, args.add_trees, args.n_jobs)
+        else:
+            myco_model = new_forest(args.n_jobs).fit(X_train_myco, y_train_myco)
+    with timer.stage('evaluate myco model'):
+        report['myco_accuracy'] = accuracy_score(y_test_myco, myco_model.predict(X_test_myco))
+
+    # Artifacts
+    for model in (plant_model, myco_model):
+        model.set_params(n_jobs=None)
+    assets = (plant_model, myco_model, le_species, le_light, le_microbe)
+    with timer.stage('save pickles'):
+        for asset, filename in zip(assets, MODEL_FILES.values()):
+            joblib.dump(asset, os.path.join(args.models_dir, filename))
+    bundle_dir = os.path.join(args.models_dir, os.path.basename(BUNDLE_DIR))
+    if not args.no_bundle:
+        with timer.stage('build bundle'):
+            build_bundle(*assets, path=bundle_dir)
+    elif os.path.exists(bundle_dir):
+        print(f"Warning: {bundle_dir} still holds the previous models; rebuild it with: python src/bundle.py build")
+    if pruned_models_available(args.models_dir):
+        # The pruned forests are exact copies, so they are rewritten rather than left stale
+        with timer.stage('prune'):
+            write_pruned({'plant_model': FlatForest.from_sklearn(plant_model),
+                          'myco_model': FlatForest.from_sklearn(myco_model)}, args.models_dir)
+    if args.distill:
+        report['distillation'] = {}
+        for name, model, X_train, X_test in (('plant_model', plant_model, X_train_ph, X_test_ph),
+                                             ('myco_model', myco_model, X_train_myco, X_test_myco)):
+            with timer.stage(f'distill {name}'):
+                compact = distill(model, X_train)
+                save_compact(compact, model, os.path.join(args.models_dir, COMPACT_FILES[name]))
+            report['distillation'][name] = fidelity_report(model, compact, X_test)
+    elif any(os.path.exists(os.path.join(args.models_dir, f)) for f in COMPACT_FILES.values()):
+        print("Warning: the compact models were distilled from the previous models and the app will not use "
+              "them; rerun with --distill or python src/distill.py")
+
+    report['n_estimators'] = {'plant_model': len(plant_model.estimators_),
+                              'myco_model': len(myco_model.estimators_)}
+    report['stages'] = timer.stages
+    report['total_seconds'] = round(sum(stage['seconds'] for stage in timer.stages), 4)
+    with open(os.path.join(args.models_dir, REPORT_FILE), 'w') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"Plant Health accuracy: {report['plant_accuracy']:.4f}")
+    print(f"Myco-Net accuracy:     {report['myco_accuracy']:.4f}")
+    for name, fidelity in report.get('distillation', {}).items():
+        print_report(name, fidelity)
+    print(f"All models trained and saved to {args.models_dir} in {report['total_seconds']:.2f}s")
+
+
+if __name__ == '__main__':
+    main()
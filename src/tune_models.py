@@ -0,0 +1,269 @@
+# tune_models.py
+"""Cross-validated hyperparameter search for both forests, on all cores.
+
+The training split of each dataset (the same split as
+train_and_save_models.py) is preprocessed once: categorical inputs are
+label-encoded and labels turned into integer codes. It is then written
+with its stratified fold assignment to data/tuning_cache/ as .npy files,
+keyed by a hash of the data. Pool workers memory-map those files, so the
+matrices and folds are built once and shared by every fit and every later
+run.
+
+The grid covers max_depth, max_features and min_samples_leaf for each tree
+count. Successive halving runs separately for every (tree count, depth)
+pair, the two settings that decide a forest's size and latency. Every
+candidate is first cross-validated on a small share of the training rows,
+and only the best 1/ETA move on to a round with ETA times the rows, until
+the survivors use all of them. Halving ranks on accuracy alone, so
+halving per pair keeps small and shallow forests in the running even
+though they rarely beat large ones on accuracy. The Pareto front is built
+from these survivors, one per pair with the default grid, not from every
+configuration.
+
+The survivors are refitted on the whole training split, scored on the
+held-out split and timed with the flat-array engine the app serves with.
+The report lists the Pareto front of CV accuracy against single-row
+latency and model size.
+
+    python src/tune_models.py                     # both models, all cores
+    python src/tune_models.py --model myco_model --workers 4 -o tuning.json
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import math
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from assets import DATA_DIR
+
+CACHE_DIR = os.path.join(DATA_DIR, 'tuning_cache')
+MODELS = ['plant_model', 'myco_model']
+N_FOLDS = 5
+ETA = 3
+MIN_RESOURCE_FRACTION = 1 / 9
+RANDOM_STATE = 42
+LATENCY_REPEAT = 200
+GRID = {
+    'n_estimators': [10, 25, 50, 100, 200],
+    'max_depth': [None, 4, 8, 16],
+    'max_features': ['sqrt', 0.5, 1.0],
+    'min_samples_leaf': [1, 2, 4],
+}
+CACHE_ARRAYS = ['X_train', 'y_train', 'X_test', 'y_test', 'folds', 'order']
+
+# Per-worker memory maps of the cached splits, keyed by cache directory
+_splits = {}
+
+
+def _load_matrices(model_name):
+    """(X, y, test_size) exactly as train_and_save_models.py builds them."""
+    from sklearn.preprocessing import LabelEncoder
+
+    from datasets import encode_myco, load_myco_frame, load_plant_data
+    from train_and_save_models import MYCO_TEST_SIZE, PLANT_TEST_SIZE
+
+    if model_name == 'plant_model':
+        X, y = load_plant_data()
+        return X, y, PLANT_TEST_SIZE
+    myco_df = load_myco_frame()
+    encoders = [LabelEncoder().fit(myco_df[column]) for column in ('Species', 'Light', 'Microbe')]
+    X, y = encode_myco(myco_df, *encoders)
+    return X, y, MYCO_TEST_SIZE
+
+
+def prepare_split(model_name, n_folds=N_FOLDS, cache_dir=CACHE_DIR):
+    """Build (or reuse) the cached training matrices and folds; returns (cache path, class labels)."""
+    from sklearn.model_selection import StratifiedKFold, train_test_split
+
+    from train_and_save_models import RANDOM_STATE as SPLIT_STATE
+
+    X, y, test_size = _load_matrices(model_name)
+    classes, codes = np.unique(np.asarray(y), return_inverse=True)
+    X = np.ascontiguousarray(X.to_numpy(dtype=np.float64))
+    digest = hashlib.sha256(X.tobytes() + codes.tobytes() + f"{test_size}/{n_folds}".encode()).hexdigest()[:12]
+    path = os.path.join(cache_dir, f"{model_name}-{digest}")
+    if not os.path.exists(os.path.join(path, 'order.npy')):
+        X_train, X_test, y_train, y_test = train_test_split(X, codes, test_size=test_size, random_state=SPLIT_STATE)
+        folds = np.empty(len(y_train), dtype=np.int8)
+        splitter = StratifiedKFold(n_folds, shuffle=True, random_state=RANDOM_STATE)
+        for fold, (_, test_index) in enumerate(splitter.split(X_train, y_train)):
+            folds[test_index] = fold
+        # Rows used by the small-budget rounds: a fixed random order, truncated per round
+        order = np.random.default_rng(RANDOM_STATE).permutation(len(y_train))
+        os.makedirs(path, exist_ok=True)
+        arrays = dict(X_train=X_train, y_train=y_train, X_test=X_test, y_test=y_test, folds=folds, order=order)
+        # order.npy is written last and marks the cache as complete
+        for name in CACHE_ARRAYS:
+            np.save(os.path.join(path, name + '.npy'), arrays[name])
+    return path, classes
+
+
+def _split(path):
+    if path not in _splits:
+        _splits[path] = {name: np.load(os.path.join(path, name + '.npy'), mmap_mode='r') for name in CACHE_ARRAYS}
+    return _splits[path]
+
+
+def _forest(params):
+    from sklearn.ensemble import RandomForestClassifier
+
+    return RandomForestClassifier(random_state=RANDOM_STATE, n_jobs=1, **params)
+
+
+def cv_score(path, params, n_rows):
+    """Mean CV accuracy of ``params`` fitted on the first ``n_rows`` of the shuffled training rows."""
+    split = _split(path)
+    rows = np.sort(split['order'][:n_rows])
+    X, y, folds = split['X_train'][rows], split['y_train'][rows], split['folds'][rows]
+    scores = []
+    for fold in np.unique(split['folds']):
+        train, test = folds != fold, folds == fold
+        if test.any() and len(np.unique(y[train])) > 1:
+            model = _forest(params).fit(X[train], y[train])
+            scores.append(float(np.mean(model.predict(X[test]) == y[test])))
+    return float(np.mean(scores)) if scores else 0.0
+
+
+def fit_final(path, params):
+    """Fit on the whole training split; returns (held-out accuracy, pickled model)."""
+    split = _split(path)
+    model = _forest(params).fit(np.asarray(split['X_train']), np.asarray(split['y_train']))
+    accuracy = float(np.mean(model.predict(np.asarray(split['X_test'])) == split['y_test']))
+    model.set_params(n_jobs=None)
+    return accuracy, pickle.dumps(model)
+
+
+def candidates(grid=GRID):
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def successive_halving(pool, path, n_train, grid=GRID, eta=ETA, min_fraction=MIN_RESOURCE_FRACTION):
+    """Halve the candidates of every (tree count, depth) pair in parallel; returns (survivors, rounds)."""
+    groups = {}
+    for params in candidates(grid):
+        groups.setdefault((params['n_estimators'], params['max_depth']), []).append(params)
+    n_rounds = max(1, math.ceil(math.log(1 / min_fraction, eta)) + 1)
+    rounds = []
+    for r in range(n_rounds):
+        n_rows = n_train if r == n_rounds - 1 else max(2 * N_FOLDS, int(n_train * min_fraction * eta ** r))
+        jobs = {(pair, i): pool.submit(cv_score, path, params, n_rows)
+                for pair, group in groups.items() for i, params in enumerate(group)}
+        scored = {key: job.result() for key, job in jobs.items()}
+        rounds.append({'rows': n_rows, 'candidates': len(jobs)})
+        if r == n_rounds - 1:
+            return [dict(params=params, cv_accuracy=scored[(pair, i)])
+                    for pair, group in groups.items() for i, params in enumerate(group)], rounds
+        for pair, group in groups.items():
+            keep = max(1, math.ceil(len(group) / eta))
+            ranking = sorted(range(len(group)), key=lambda i: -scored[(pair, i)])
+            groups[pair] = [group[i] for i in ranking[:keep]]
+
+
+def measure(model, X, repeat=LATENCY_REPEAT):
+    """Single-row p50 latency (flat-array engine, ms) and size of a fitted forest."""
+    from forest import FlatForest
+
+    flat = FlatForest.from_sklearn(model)
+    row = X[:1]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        flat.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+    return {
+        'latency_ms': float(np.median(timings) * 1000),
+        'nodes': int(len(flat.feature)),
+        'size_bytes': int(sum(array.nbytes for array in flat.arrays().values())),
+    }
+
+
+def pareto_front(results):
+    """Indices of results not dominated on (cv_accuracy up, latency_ms down, size_bytes down)."""
+    front = []
+    for i, a in enumerate(results):
+        dominated = any(
+            b['cv_accuracy'] >= a['cv_accuracy'] and b['latency_ms'] <= a['latency_ms']
+            and b['size_bytes'] <= a['size_bytes']
+            and (b['cv_accuracy'], -b['latency_ms'], -b['size_bytes'])
+            != (a['cv_accuracy'], -a['latency_ms'], -a['size_bytes'])
+            for j, b in enumerate(results) if j != i)
+        if not dominated:
+            front.append(i)
+    return front
+
+
+def tune(model_name, pool, n_folds=N_FOLDS, grid=GRID, eta=ETA):
+    start = time.perf_counter()
+    path, classes = prepare_split(model_name, n_folds)
+    X_test = np.load(os.path.join(path, 'X_test.npy'))
+    n_train = len(np.load(os.path.join(path, 'y_train.npy'), mmap_mode='r'))
+    survivors, rounds = successive_halving(pool, path, n_train, grid, eta)
+    finals = [pool.submit(fit_final, path, result['params']) for result in survivors]
+    payloads = []
+    for result, job in zip(survivors, finals):
+        result['test_accuracy'], payload = job.result()
+        payloads.append(payload)
+    # Timed one model at a time once every fit is done, so no timing runs next to busy workers
+    for result, payload in zip(survivors, payloads):
+        result.update(measure(pickle.loads(payload), X_test))
+    front = set(pareto_front(survivors))
+    for i, result in enumerate(survivors):
+        result['pareto'] = i in front
+    return {
+        'model': model_name,
+        'classes': [str(c) for c in classes],
+        'cache': path,
+        'rounds': rounds,
+        'seconds': round(time.perf_counter() - start, 2),
+        'results': sorted(survivors, key=lambda result: result['latency_ms']),
+    }
+
+
+def print_report(report):
+    print(f"{report['model']}: " + " -> ".join(f"{r['candidates']} candidates on {r['rows']} rows"
+                                                for r in report['rounds']) + f" ({report['seconds']:.0f}s)")
+    print(f"  {'trees':>5} {'depth':>5} {'features':>8} {'leaf':>4} {'cv acc':>7} {'test acc':>8} "
+          f"{'latency':>9} {'size':>9}")
+    for result in report['results']:
+        if not result['pareto']:
+            continue
+        params = result['params']
+        print(f"  {params['n_estimators']:>5} {str(params['max_depth']):>5} {str(params['max_features']):>8} "
+              f"{params['min_samples_leaf']:>4} {result['cv_accuracy']:>7.2%} {result['test_accuracy']:>8.2%} "
+              f"{result['latency_ms']:>7.3f}ms {result['size_bytes'] / 1024:>7.0f}KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel successive-halving search; prints the Pareto front "
+                                                 "of accuracy vs latency and size")
+    parser.add_argument('--model', action='append', choices=MODELS, help="Model(s) to tune (default: both)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--folds', type=int, default=N_FOLDS)
+    parser.add_argument('--eta', type=int, default=ETA, help="Keep the best 1/ETA candidates each round")
+    parser.add_argument('--trees', type=int, nargs='+', default=GRID['n_estimators'],
+                        help="Tree counts to search")
+    parser.add_argument('-o', '--output', help="Write every survivor's metrics as JSON")
+    args = parser.parse_args()
+
+    grid = dict(GRID, n_estimators=args.trees)
+    reports = []
+    with ProcessPoolExecutor(args.workers) as pool:
+        for model_name in args.model or MODELS:
+            report = tune(model_name, pool, args.folds, grid, args.eta)
+            print_report(report)
+            reports.append(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(reports, f, indent=2)
+        print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
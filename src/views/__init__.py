@@ -0,0 +1,16 @@
+# views/__init__.py
+"""One module per sidebar page; each exposes ``render(ctx)``.
+
+Pages are imported on first use, so plotting and ML libraries are only
+loaded by the pages that need them.
+"""
+PAGES = {
+    "Home": "views.home",
+    "Plant Health Assessment": "views.plant_health",
+    "Fungal Network Analysis": "views.fungal",
+    "Combined Results": "views.combined",
+    "Test History": "views.history",
+    "Results Dashboard": "views.dashboard",
+    "Live Monitoring": "views.live",
+    "Performance": "views.performance",
+}
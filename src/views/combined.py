@@ -0,0 +1,163 @@
+# views/combined.py
+"""Combined Results page (current readings and whole-field batch scoring)."""
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from combined import CRITICAL, DEFAULT_KEY, OPTIMAL, RECOMMENDATIONS, combined_verdict, score_combined
+from metrics import span
+
+
+def render(ctx):
+    st.header("📊 Combined Analysis Results")
+    
+    tab_current, tab_batch = st.tabs(["📋 Current Analysis", "📁 Field Batch"])
+    with tab_current:
+        render_current(ctx)
+    with tab_batch:
+        render_batch(ctx)
+
+
+def render_current(ctx):
+    history_store = ctx.history_store
+    if st.session_state.plant_results and st.session_state.fungal_results:
+        plant = st.session_state.plant_results
+        fungal = st.session_state.fungal_results
+        
+        # Summary cards
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            if plant['status'] == "Healthy":
+                st.success(f"🌱 **Plant Health: {plant['status']}**")
+            elif plant['status'] == "Moderate Stress":
+                st.warning(f"🌱 **Plant Health: {plant['status']}**")
+            else:
+                st.error(f"🌱 **Plant Health: {plant['status']}**")
+            st.write(f"Confidence: {plant['confidence']:.1f}%")
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+        with col2:
+            st.markdown('<div class="card fungal-card">', unsafe_allow_html=True)
+            if fungal['risk_level'] == "Low Risk":
+                st.success(f"🍄 **Fungal Network: {fungal['risk_level']}**")
+            else:
+                st.error(f"🍄 **Fungal Network: {fungal['risk_level']}**")
+            st.write(f"Confidence: {fungal['confidence']:.1f}%")
+            st.markdown('</div>', unsafe_allow_html=True)
+                
+        verdict = combined_verdict([plant['status']], [fungal['risk_level']])[0]
+        with col3:
+            st.markdown('<div class="card">', unsafe_allow_html=True)
+            if verdict == OPTIMAL:
+                st.success("✅ **Overall: Optimal Health**")
+                st.write("Your plants are healthy now and likely to remain so.")
+            elif verdict == CRITICAL:
+                st.error("🚨 **Overall: Critical Attention Needed**")
+                st.write("Immediate intervention is required.")
+            else:
+                st.warning("⚠️ **Overall: Monitoring Required**")
+                st.write("Some parameters need attention.")
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Detailed results
+        st.markdown("---")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### 🌱 Plant Health Details")
+            st.markdown('<div class="metric-box">', unsafe_allow_html=True)
+            st.write(f"**Status:** {plant['status']} ({plant['confidence']:.1f}% confidence)")
+            st.write(f"**Soil Moisture:** {plant['soil_moisture']}%")
+            st.write(f"**Nitrogen Level:** {plant['nitrogen']} ppm")
+            st.write(f"**Soil pH:** {plant['soil_ph']}")
+            st.write(f"**Last Updated:** {plant['timestamp']}")
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        with col2:
+            st.markdown("#### 🍄 Fungal Network Details")
+            st.markdown('<div class="metric-box">', unsafe_allow_html=True)
+            st.write(f"**Risk Level:** {fungal['risk_level']} ({fungal['confidence']:.1f}% confidence)")
+            st.write(f"**AMF Colonization:** {fungal['amf_colonization']}%")
+            st.write(f"**NSC Level:** {fungal['nsc_level']}")
+            st.write(f"**Microbial Community:** {fungal['microbe_type']}")
+            st.write(f"**Last Updated:** {fungal['timestamp']}")
+            st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Recommendations
+        st.markdown("#### 💡 Recommendations")
+        recommendations = "\n".join(f"- {item}" for item in RECOMMENDATIONS[verdict])
+        if verdict == OPTIMAL:
+            st.success(recommendations)
+        elif verdict == CRITICAL:
+            st.error(recommendations)
+        else:
+            st.warning(recommendations)
+        
+        if st.button("Save Combined Results to History", type="primary", use_container_width=True):
+            test_entry = {
+                'plant_results': plant,
+                'fungal_results': fungal,
+                'combined_timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            history_store.add(test_entry)
+            st.success("Results saved to history!")
+            st.rerun()
+
+    else:
+        st.warning("⚠️ Please run both Plant Health and Fungal Network analyses first!")
+        col1, col2 = st.columns(2)
+        with col1:
+            if not st.session_state.plant_results:
+                st.error("Plant Health Assessment not completed")
+            else:
+                st.success("Plant Health Assessment completed")
+        with col2:
+            if not st.session_state.fungal_results:
+                st.error("Fungal Network Analysis not completed")
+            else:
+                st.success("Fungal Network Analysis completed")
+
+
+def render_batch(ctx):
+    st.markdown("#### Score a whole field")
+    st.write("Upload the plant sensor readings and the fungal records of the same plots. Rows are matched "
+             "on a shared ID column; every reading of a plot uses that plot's fungal record.")
+    col1, col2 = st.columns(2)
+    with col1:
+        plant_file = st.file_uploader("Plant sensor readings (CSV)", type=["csv"], key="combined_plants")
+    with col2:
+        fungal_file = st.file_uploader("Fungal records (CSV)", type=["csv"], key="combined_fungal")
+    if plant_file is None or fungal_file is None:
+        return
+
+    plant_df = pd.read_csv(plant_file)
+    fungal_df = pd.read_csv(fungal_file)
+    shared = [col for col in plant_df.columns if col in fungal_df.columns]
+    if not shared:
+        st.error("The two files have no column in common to match plots on.")
+        return
+    key = st.selectbox("Match rows on", shared, index=shared.index(DEFAULT_KEY) if DEFAULT_KEY in shared else 0)
+
+    if st.button("Score Field", type="primary", use_container_width=True):
+        try:
+            with span('batch_scoring'):
+                scored = score_combined(ctx.batch_plant_model, ctx.batch_myco_model, plant_df, fungal_df,
+                                        (ctx.le_species, ctx.le_light, ctx.le_microbe), key)
+        except ValueError as e:
+            st.error(str(e))
+            return
+        unmatched = len(plant_df) - len(scored)
+        st.success(f"Scored {len(scored):,} joined readings" +
+                   (f" ({unmatched:,} readings had no fungal record)" if unmatched else ""))
+        counts = scored['Verdict'].value_counts()
+        for col, name in zip(st.columns(len(RECOMMENDATIONS)), RECOMMENDATIONS):
+            col.metric(name, f"{counts.get(name, 0):,}")
+        st.dataframe(scored[[key, 'Plant_Status', 'Risk_Level', 'Verdict', 'Recommendations']].head(100),
+                     use_container_width=True)
+        st.download_button(
+            label="Download Combined CSV",
+            data=scored.to_csv(index=False),
+            file_name="combined_" + plant_file.name.rsplit('.', 1)[0] + ".csv",
+            mime="text/csv",
+        )
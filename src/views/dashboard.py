@@ -0,0 +1,92 @@
+# views/dashboard.py
+"""Results Dashboard page."""
+import pandas as pd
+import streamlit as st
+
+from charts import MYCO_FEATURES_RAW, importance_comparison_png, model_version
+from metrics import span
+from scoring import PH_FEATURES
+
+# Trend charts plot at most this many of the newest tests
+TREND_ROWS = 500
+
+
+# Keyed on the model versions only; the importances are passed unhashed
+@st.cache_data(max_entries=8)
+def cached_importance_comparison_png(plant_version, myco_version, _ph_importances, _myco_importances):
+    return importance_comparison_png(PH_FEATURES, _ph_importances, MYCO_FEATURES_RAW, _myco_importances)
+
+
+def render(ctx):
+    plant_model, myco_model = ctx.plant_model, ctx.myco_model
+    history_store, total_tests = ctx.history_store, ctx.total_tests
+    st.header("📊 Performance Dashboard")
+    
+    st.subheader("Feature Importance Comparison")
+    
+    with span('chart'):
+        chart = cached_importance_comparison_png(model_version(plant_model), model_version(myco_model),
+                                                 plant_model.feature_importances_, myco_model.feature_importances_)
+    st.image(chart, use_container_width=True)
+    
+    # Model performance metrics
+    st.subheader("Model Performance Metrics")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="card">', unsafe_allow_html=True)
+        st.metric("Plant Health Model Accuracy", "100%", "0%")
+        st.write("Trained on extensive agricultural data")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="card fungal-card">', unsafe_allow_html=True)
+        st.metric("Myco-Net Model Accuracy", "98.13%", "1.87%")
+        st.write("Early warning prediction system")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Add some statistics if we have test history
+    if total_tests:
+        st.subheader("Historical Trends")
+        
+        # The newest tests for the trends; the status shares are counted in SQL over all of them
+        history_df = pd.DataFrame(
+            history_store.recent(['combined_timestamp', 'soil_moisture', 'nitrogen', 'amf_colonization'],
+                                 limit=TREND_ROWS),
+            columns=['Timestamp', 'Soil_Moisture', 'Nitrogen_Level', 'AMF_Colonization'])
+        history_df['Timestamp'] = pd.to_datetime(history_df['Timestamp'])
+        if total_tests > TREND_ROWS:
+            st.caption(f"Trends show the latest {TREND_ROWS:,} of {total_tests:,} tests; "
+                       "the status distribution covers all of them.")
+        
+        # Plot trends over time
+        import matplotlib.pyplot as plt
+        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+        
+        # Soil moisture over time
+        axes[0, 0].plot(history_df['Timestamp'], history_df['Soil_Moisture'], marker='o', color='blue')
+        axes[0, 0].set_title('Soil Moisture Over Time')
+        axes[0, 0].set_ylabel('Soil Moisture (%)')
+        axes[0, 0].tick_params(axis='x', rotation=45)
+        
+        # Nitrogen level over time
+        axes[0, 1].plot(history_df['Timestamp'], history_df['Nitrogen_Level'], marker='o', color='green')
+        axes[0, 1].set_title('Nitrogen Level Over Time')
+        axes[0, 1].set_ylabel('Nitrogen (ppm)')
+        axes[0, 1].tick_params(axis='x', rotation=45)
+        
+        # AMF colonization over time
+        axes[1, 0].plot(history_df['Timestamp'], history_df['AMF_Colonization'], marker='o', color='orange')
+        axes[1, 0].set_title('AMF Colonization Over Time')
+        axes[1, 0].set_ylabel('AMF Colonization (%)')
+        axes[1, 0].tick_params(axis='x', rotation=45)
+        
+        # Status counts
+        status_counts = history_store.counts('plant_status')
+        axes[1, 1].pie(list(status_counts.values()), labels=list(status_counts), autopct='%1.1f%%', 
+                      colors=['green', 'orange', 'red'])
+        axes[1, 1].set_title('Plant Status Distribution')
+        
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
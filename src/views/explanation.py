@@ -0,0 +1,27 @@
+# views/explanation.py
+"""The "Why this prediction" section under the Plant Health and Fungal result cards."""
+import streamlit as st
+
+from charts import contributions_png
+from explain import class_contributions, top_contributions
+from metrics import span
+
+
+def render_explanation(flat_model, features, label, labels, class_name=None):
+    """Decision-path contributions of one scored row toward ``label``.
+
+    ``labels`` maps feature -> display name; ``class_name`` is how the
+    class is shown (defaults to the label itself).
+    """
+    class_name = class_name or str(label)
+    with span('explain'):
+        base, contributions = class_contributions(flat_model, features, [label])
+    row = contributions.iloc[0].rename(labels)
+
+    st.markdown("#### Why this prediction")
+    drivers = ", ".join(f"{name} ({value:+.2f})" for name, value in top_contributions(row, 3).items())
+    st.write(f"Starting from the forest's base rate of {base[0]:.0%} for **{class_name}**, "
+             f"the inputs that moved it most were: {drivers}.")
+    with span('chart'):
+        png = contributions_png(row, f"Contributions to P({class_name})", "Change in probability")
+    st.image(png, use_container_width=True)
@@ -0,0 +1,138 @@
+# views/fungal.py
+"""Fungal Network Analysis page."""
+import datetime
+
+import pandas as pd
+import streamlit as st
+
+from charts import fungal_importance_png, model_version
+from metrics import span
+from scoring import MYCO_FEATURES, predict_with_confidence
+from views.explanation import render_explanation
+from views.what_if import render_what_if
+
+# Sweepable (numeric) fungal inputs with their slider label and range, then the slider defaults
+MYCO_RANGES = {
+    'AMF': ("AMF Colonization (%)", 0.0, 100.0),
+    'PHN_Imp': ("PHN_Imp (Water Stress Proxy)", 0.0, 1.0),
+    'NSC_Imp': ("NSC_Imp (Non-Structural Carbohydrate Proxy)", 0.0, 1.0),
+    'LIG_Imp': ("LIG_Imp (Lignin Content Proxy)", 0.0, 1.0),
+}
+MYCO_DEFAULTS = {'AMF': 65.0, 'PHN_Imp': 0.5, 'NSC_Imp': 0.5, 'LIG_Imp': 0.5}
+MYCO_CLASS_NAMES = {1: "Survival", 0: "At Risk"}
+MYCO_LABELS = {'Species_encoded': "Plant Species", 'Light_encoded': "Light Condition",
+               'Microbe_encoded': "Microbial Community",
+               **{feature: label for feature, (label, _, _) in MYCO_RANGES.items()}}
+
+
+def myco_slider(feature, **kwargs):
+    """Input slider for ``feature`` with the label, range and default above."""
+    label, low, high = MYCO_RANGES[feature]
+    return st.slider(label, low, high, MYCO_DEFAULTS[feature], **kwargs)
+
+
+# Keyed on the model version only; the importances are passed unhashed
+@st.cache_data(max_entries=8)
+def cached_fungal_importance_png(version, _importances):
+    return fungal_importance_png(MYCO_FEATURES, _importances)
+
+
+def render(ctx):
+    myco_model, myco_cache = ctx.myco_model, ctx.myco_cache
+    le_species, le_light, le_microbe = ctx.le_species, ctx.le_light, ctx.le_microbe
+    st.markdown('<h2 class="sub-header">🍄 Fungal Network Analysis</h2>', unsafe_allow_html=True)
+    
+    tab1, tab_what_if, tab2 = st.tabs(["📊 Input Parameters", "🔍 What-If", "ℹ️ Information"])
+    
+    with tab1:
+        myco_features = MYCO_FEATURES
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### Fungal Metrics & Tree Type")
+            species = st.selectbox("Plant Species", le_species.classes_)
+            amf_colonization = myco_slider('AMF')
+            nsc_imp = myco_slider('NSC_Imp', step=0.01)
+            lig_imp = myco_slider('LIG_Imp', step=0.01)
+        with col2:
+            st.markdown("#### Environmental Factors")
+            light_level = st.selectbox("Light Condition", le_light.classes_)
+            microbe_type = st.selectbox("Microbial Community", le_microbe.classes_)
+            phn_imp = myco_slider('PHN_Imp', step=0.01)
+            
+        if st.button("Analyze Fungal Network", type="primary", use_container_width=True):
+            with span('build_frame'):
+                species_encoded = le_species.encode(species)
+                light_encoded = le_light.encode(light_level)
+                microbe_encoded = le_microbe.encode(microbe_type)
+                
+                features = pd.DataFrame([[species_encoded, light_encoded, microbe_encoded, 
+                                          amf_colonization, phn_imp, nsc_imp, lig_imp]],
+                                        columns=myco_features)
+            
+            labels, confidences, _ = predict_with_confidence(myco_cache, features)
+            prediction = labels[0]
+            confidence = confidences[0]
+            
+            st.markdown("---")
+            
+            risk_level = "Low Risk" if prediction == 1 else "High Risk"
+            
+            st.session_state.fungal_results = {
+                'risk_level': risk_level,
+                'confidence': confidence,
+                'amf_colonization': amf_colonization,
+                'nsc_level': nsc_imp,
+                'microbe_type': microbe_type,
+                'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            if risk_level == "Low Risk":
+                st.markdown(f"""
+                <div class="prediction-box">
+                    <h2>✅ Survival Prediction: LIKELY TO SURVIVE</h2>
+                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
+                    <p>The fungal network appears strong and supportive of plant health.</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="prediction-box warning">
+                    <h2>⚠️ Survival Prediction: AT RISK</h2>
+                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
+                    <p>The fungal network may be compromised. Immediate action is recommended.</p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            render_explanation(ctx.flat_myco_model, features, prediction, MYCO_LABELS,
+                               MYCO_CLASS_NAMES.get(prediction))
+                
+            # Feature importance visualization
+            st.markdown("#### Feature Importance")
+            with span('chart'):
+                chart = cached_fungal_importance_png(model_version(myco_model), myco_model.feature_importances_)
+            st.image(chart, use_container_width=True)
+    
+    with tab_what_if:
+        current = dict(zip(MYCO_FEATURES, [le_species.encode(species), le_light.encode(light_level),
+                                           le_microbe.encode(microbe_type),
+                                           amf_colonization, phn_imp, nsc_imp, lig_imp]))
+        render_what_if(myco_model, current, MYCO_FEATURES, MYCO_RANGES, key="what_if_myco",
+                       default_axes=('AMF', 'NSC_Imp'), class_names=MYCO_CLASS_NAMES, default_class=1)
+    
+    with tab2:
+        st.markdown("""
+        ### About Fungal Network Analysis
+        
+        This module analyzes fungal network parameters to predict future plant health issues:
+        
+        - **Plant Species**: Different species have different fungal associations
+        - **Light Conditions**: Affects fungal network development
+        - **Microbial Community**: Composition of soil microbes
+        - **AMF Colonization**: Arbuscular Mycorrhizal Fungi colonization percentage
+        - **PHN_Imp**: Water stress proxy measurement
+        - **NSC_Imp**: Non-Structural Carbohydrate proxy (energy reserves)
+        - **LIG_Imp**: Lignin content proxy (structural integrity)
+        
+        The Myco-Net model uses these parameters to provide early warnings about potential plant health issues before they become visible.
+        """)
@@ -0,0 +1,129 @@
+# views/history.py
+"""Test History page."""
+import tempfile
+
+import pandas as pd
+import streamlit as st
+
+from history_export import FORMATS as EXPORT_FORMATS, export_history, parquet_available
+from metrics import span
+
+HISTORY_PAGE_SIZES = [10, 25, 50, 100]
+
+
+def render(ctx):
+    history_store, total_tests = ctx.history_store, ctx.total_tests
+    st.header("📋 Test History")
+    
+    if total_tests:
+        st.info(f"Total tests conducted: {total_tests}")
+        
+        # Add filter options
+        col1, col2 = st.columns(2)
+        with col1:
+            filter_status = st.selectbox("Filter by Plant Status", 
+                                       ["All", "Healthy", "Moderate Stress", "High Stress"])
+        with col2:
+            filter_risk = st.selectbox("Filter by Fungal Risk", 
+                                     ["All", "Low Risk", "High Risk"])
+        
+        # Filtering and paging run as indexed queries against the history store
+        with span('history_query'):
+            filtered_count = history_store.count(filter_status, filter_risk)
+        
+        if not filtered_count:
+            st.warning("No tests match the selected filters.")
+        else:
+            col1, col2 = st.columns(2)
+            with col1:
+                page_size = st.selectbox("Tests per page", HISTORY_PAGE_SIZES, index=1)
+            page_count = (filtered_count - 1) // page_size + 1
+            with col2:
+                page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, value=1)
+            
+            # Only the current page is fetched and shown as a single summary table
+            with span('history_query'):
+                rows = history_store.summary(filter_status, filter_risk, limit=page_size, offset=(page - 1) * page_size)
+            summary = pd.DataFrame(
+                rows,
+                columns=['ID', 'Timestamp', 'Plant Status', 'Plant Confidence (%)',
+                         'Fungal Risk', 'Fungal Confidence (%)'])
+            st.dataframe(summary.round(1), use_container_width=True, hide_index=True)
+            
+            # Per-test detail is only built for the test that is opened
+            test_labels = dict(zip(summary['ID'], summary['Timestamp']))
+            selected_id = st.selectbox("Open test details", [None] + list(test_labels),
+                                       format_func=lambda i: "—" if i is None else f"#{i} · {test_labels[i]}")
+            if selected_id is not None:
+                test = history_store.get(int(selected_id))
+                plant = test['plant_results']
+                fungal = test['fungal_results']
+                
+                st.markdown(f"""
+                <div class="history-item">
+                    <div class="history-header">
+                        <span>Test from {test['combined_timestamp']}</span>
+                    </div>
+                """, unsafe_allow_html=True)
+                
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.subheader("🌱 Plant Health")
+                    if plant['status'] == "Healthy":
+                        st.success(f"**Status:** {plant['status']} ({plant['confidence']:.1f}%)")
+                    elif plant['status'] == "Moderate Stress":
+                        st.warning(f"**Status:** {plant['status']} ({plant['confidence']:.1f}%)")
+                    else:
+                        st.error(f"**Status:** {plant['status']} ({plant['confidence']:.1f}%)")
+                    
+                    st.write(f"Soil Moisture: {plant['soil_moisture']}%")
+                    st.write(f"Nitrogen: {plant['nitrogen']} ppm")
+                    st.write(f"Soil pH: {plant['soil_ph']}")
+                
+                with col2:
+                    st.subheader("🍄 Fungal Network")
+                    if fungal['risk_level'] == "Low Risk":
+                        st.success(f"**Risk Level:** {fungal['risk_level']} ({fungal['confidence']:.1f}%)")
+                    else:
+                        st.error(f"**Risk Level:** {fungal['risk_level']} ({fungal['confidence']:.1f}%)")
+                    
+                    st.write(f"AMF Colonization: {fungal['amf_colonization']}%")
+                    st.write(f"NSC Level: {fungal['nsc_level']}")
+                    st.write(f"Microbe Type: {fungal['microbe_type']}")
+                
+                st.markdown("</div>", unsafe_allow_html=True)
+        
+        # Add export functionality
+        st.markdown("---")
+        st.subheader("Export History")
+        
+        # Written chunk by chunk from the store into a temporary file instead of building
+        # the whole history as a list, a DataFrame and a CSV string in memory. The download
+        # button still holds the finished file's bytes in memory, so very long histories are
+        # better exported with python src/history_export.py
+        export_formats = ["CSV"] + (["Parquet"] if parquet_available() else [])
+        export_format = st.radio("Format", export_formats, horizontal=True)
+        if st.button("Export Test History", type="secondary"):
+            fmt = export_format.lower()
+            with tempfile.TemporaryFile() as export_file:
+                export_history(history_store, export_file, fmt)
+                export_file.seek(0)
+                
+                st.download_button(
+                    label=f"Download {export_format}",
+                    data=export_file.read(),
+                    file_name=f"myco_net_test_history.{EXPORT_FORMATS[fmt]['extension']}",
+                    mime=EXPORT_FORMATS[fmt]['mime'],
+                )
+            st.caption("For very long histories, python src/history_export.py writes the file "
+                       "without holding it in memory.")
+    else:
+        st.info("📝 No test history yet. Run some analyses and save the results to build your history!")
+        
+    if total_tests:
+        # The history is shared by every user, so clearing it needs a second step
+        confirm = st.checkbox(f"Yes, delete all {total_tests:,} saved tests for every user")
+        if st.button("🗑️ Clear All History", type="secondary", disabled=not confirm):
+            history_store.clear()
+            st.success("Test history cleared!")
+            st.rerun()
@@ -0,0 +1,36 @@
+# views/home.py
+"""Home page."""
+import streamlit as st
+
+
+def render(ctx):
+    st.header("Welcome to Myco-Net!")
+    st.markdown("""
+    **Myco-Net** is an innovative AI system that interprets plant health through:
+    - **Standard sensor data** for immediate stress detection
+    - **Fungal network analysis** for early warning predictions
+    
+    ### How it Works:
+    1. **Input** your plant's sensor data
+    2. **Get instant analysis** of current health status
+    3. **Receive early warnings** from fungal network data
+    4. **View actionable recommendations** for farmers
+    
+    ### Key Features:
+    - 🎯 **100% accuracy** in current stress detection (Plant Health Model)
+    - 🔮 **98.13% accuracy** in early warning predictions (Myco-Net Model)
+    - 🌱 **Sustainable** farming practices
+    - 💰 **Cost-effective** for small-scale farmers
+    """)
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.image("https://images.unsplash.com/photo-1589923188937-cb64779f4abe?w=600", 
+                 caption="AI-Powered Plant Health Monitoring")
+    with col2:
+        st.image("https://images.unsplash.com/photo-1598003807926-9a376a19e536?w=600", 
+                 caption="Fungal Network Analysis")
+    
+    st.markdown("---")
+    st.markdown("### 🚀 Get Started")
+    st.info("Use the navigation menu on the left to begin your analysis. Start with **Plant Health Assessment** or **Fungal Network Analysis**.")
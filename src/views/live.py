@@ -0,0 +1,67 @@
+# views/live.py
+"""Live Monitoring page."""
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from assets import DATA_DIR
+from streaming import PlantHealthMonitor, StreamIngestor, tail_file
+
+
+@st.cache_resource
+def live_feed():
+    # The feed being followed, shared by every session
+    return {'lock': threading.Lock(), 'path': None, 'monitor': None, 'ingestor': None}
+
+
+def start_live_monitor(feed_path, plant_model):
+    """Monitor and ingestor of ``feed_path``; switching feeds stops the previous ingestor."""
+    feed = live_feed()
+    with feed['lock']:
+        if feed['path'] != feed_path:
+            if feed['ingestor'] is not None:
+                feed['ingestor'].close()
+            monitor = PlantHealthMonitor(plant_model)
+            feed.update(path=feed_path, monitor=monitor,
+                        ingestor=StreamIngestor(monitor).start(tail_file, feed_path, from_start=True))
+        return feed['monitor'], feed['ingestor']
+
+
+def render(ctx):
+    st.header("📡 Live Plant Monitoring")
+    st.write("Follows a sensor feed (CSV or JSONL with Timestamp, Plant_ID and the plant health sensor columns), "
+             "scores new readings in micro-batches and keeps a rolling window per plant.")
+    
+    feed_path = st.text_input("Sensor feed file", value=os.path.join(DATA_DIR, 'plant_health_data.csv'))
+    if not os.path.exists(feed_path):
+        st.warning(f"Feed file not found: {feed_path}")
+    else:
+        monitor, ingestor = start_live_monitor(feed_path, ctx.stream_plant_model)
+        st.button("🔄 Refresh")
+        
+        stats = monitor.stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Plants Tracked", f"{stats['plants']:,}")
+        col2.metric("Readings Scored", f"{stats['readings']:,}")
+        col3.metric("Status Transitions", f"{stats['transitions']:,}")
+        if ingestor.last_error:
+            st.warning(f"{ingestor.errors} micro-batch(es) could not be scored. Last error: {ingestor.last_error}")
+        
+        snapshot = monitor.snapshot()
+        if snapshot.empty:
+            st.info("Waiting for readings...")
+        else:
+            filter_status = st.selectbox("Filter by Current Status",
+                                         ["All", "Healthy", "Moderate Stress", "High Stress"])
+            if filter_status != "All":
+                snapshot = snapshot[snapshot['Status'] == filter_status]
+            st.dataframe(snapshot, use_container_width=True, hide_index=True)
+            
+            st.subheader("Recent Status Transitions")
+            transitions = monitor.recent_transitions(limit=100)
+            if transitions:
+                st.dataframe(pd.DataFrame(transitions), use_container_width=True, hide_index=True)
+            else:
+                st.info("No plant has changed status yet.")
@@ -0,0 +1,61 @@
+# views/performance.py
+"""Performance page: latency of the instrumented stages, per stage and per page."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from metrics import BUCKETS, RECORDER, set_enabled
+
+
+def _duration(seconds):
+    return f"{seconds * 1000:g} ms" if seconds < 1 else f"{seconds:g} s"
+
+
+def _bucket_label(low, high):
+    if low == 0:
+        return f"≤ {_duration(high)}"
+    if high == np.inf:
+        return f"> {_duration(low)}"
+    return f"{_duration(low)} – {_duration(high)}"
+
+
+def render(ctx):
+    st.header("⏱️ Performance")
+    st.write("Timing spans recorded by this app process for its most recent "
+             f"{RECORDER.maxlen:,} operations.")
+
+    # The switch is process-wide: it applies to every session of this app
+    st.toggle("Record timing spans", value=RECORDER.enabled, key="metrics_enabled",
+              on_change=lambda: set_enabled(st.session_state.metrics_enabled))
+
+    by_stage = pd.DataFrame(RECORDER.summary('stage'))
+    if by_stage.empty:
+        st.info("No spans recorded yet. Use the other pages and come back here.")
+        return
+
+    st.subheader("Latency per Stage")
+    st.dataframe(by_stage.round(2), use_container_width=True, hide_index=True)
+
+    st.subheader("Latency per Page")
+    st.dataframe(pd.DataFrame(RECORDER.summary('page')).round(2), use_container_width=True, hide_index=True)
+
+    st.subheader("Latency Histogram")
+    col1, col2 = st.columns(2)
+    with col1:
+        stage = st.selectbox("Stage", by_stage['stage'])
+    with col2:
+        pages = sorted({page for _, _, page, _ in RECORDER.spans(stage) if page})
+        page = st.selectbox("Page", ["All"] + pages)
+    seconds = [s[3] for s in RECORDER.spans(stage, None if page == "All" else page)]
+    edges = np.concatenate([[0.0], BUCKETS, [np.inf]])
+    counts, _ = np.histogram(seconds, bins=edges)
+    labels = [_bucket_label(low, high) for low, high in zip(edges[:-1], edges[1:])]
+    histogram = pd.DataFrame({'Spans': counts}, index=pd.CategoricalIndex(labels, categories=labels, ordered=True))
+    st.bar_chart(histogram)
+
+    with st.expander("Prometheus metrics"):
+        st.code(RECORDER.prometheus_text(), language="text")
+
+    if st.button("Clear Recorded Spans"):
+        RECORDER.clear()
+        st.rerun()
@@ -0,0 +1,182 @@
+# views/plant_health.py
+"""Plant Health Assessment page (single reading and batch scoring)."""
+import datetime
+import io
+
+import pandas as pd
+import streamlit as st
+
+from metrics import span
+from scoring import PH_FEATURES, predict_with_confidence, read_chunks, write_scored_csv
+from views.explanation import render_explanation
+from views.what_if import render_what_if
+
+# Slider label and range per feature (also the what-if sweep ranges), then the slider defaults
+PH_RANGES = {
+    'Soil_Moisture': ("Soil Moisture (%)", 0.0, 100.0),
+    'Ambient_Temperature': ("Ambient Temperature (°C)", 0.0, 50.0),
+    'Soil_Temperature': ("Soil Temperature (°C)", 0.0, 50.0),
+    'Humidity': ("Humidity (%)", 0.0, 100.0),
+    'Light_Intensity': ("Light Intensity (lux)", 0.0, 100000.0),
+    'Soil_pH': ("Soil pH", 0.0, 14.0),
+    'Nitrogen_Level': ("Nitrogen Level (ppm)", 0.0, 100.0),
+    'Phosphorus_Level': ("Phosphorus Level (ppm)", 0.0, 100.0),
+    'Potassium_Level': ("Potassium Level (ppm)", 0.0, 100.0),
+    'Chlorophyll_Content': ("Chlorophyll Content", 0.0, 100.0),
+    'Electrochemical_Signal': ("Electrochemical Signal", -100.0, 100.0),
+}
+PH_DEFAULTS = {
+    'Soil_Moisture': 45.0, 'Ambient_Temperature': 25.0, 'Soil_Temperature': 22.0, 'Humidity': 60.0,
+    'Light_Intensity': 50000.0, 'Soil_pH': 6.5, 'Nitrogen_Level': 45.0, 'Phosphorus_Level': 35.0,
+    'Potassium_Level': 40.0, 'Chlorophyll_Content': 65.0, 'Electrochemical_Signal': 10.0,
+}
+
+
+def ph_slider(feature, **kwargs):
+    """Input slider for ``feature`` with the label, range and default above."""
+    label, low, high = PH_RANGES[feature]
+    return st.slider(label, low, high, PH_DEFAULTS[feature], **kwargs)
+
+
+def render(ctx):
+    plant_model, plant_cache = ctx.plant_model, ctx.plant_cache
+    st.markdown('<h2 class="sub-header">🌱 Plant Health Assessment</h2>', unsafe_allow_html=True)
+    
+    # Use tabs for better organization
+    tab1, tab_what_if, tab_batch, tab2 = st.tabs(["📊 Input Parameters", "🔍 What-If", "📁 Batch Scoring",
+                                                  "ℹ️ Information"])
+    
+    with tab1:
+        ph_features = PH_FEATURES
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown("#### Environmental Sensors")
+            soil_moisture = ph_slider('Soil_Moisture', help="Optimal range: 30-60%")
+            ambient_temp = ph_slider('Ambient_Temperature', help="Optimal range: 20-30°C")
+            soil_temp = ph_slider('Soil_Temperature', help="Optimal range: 18-24°C")
+            humidity = ph_slider('Humidity', help="Optimal range: 50-70%")
+            light_intensity = ph_slider('Light_Intensity', key="light_ph")
+            
+        with col2:
+            st.markdown("#### Soil Composition")
+            soil_ph = ph_slider('Soil_pH', help="Optimal range: 6.0-7.0")
+            nitrogen = ph_slider('Nitrogen_Level', help="Optimal range: 40-60 ppm")
+            phosphorus = ph_slider('Phosphorus_Level', help="Optimal range: 30-50 ppm")
+            potassium = ph_slider('Potassium_Level', help="Optimal range: 35-55 ppm")
+            chlorophyll = ph_slider('Chlorophyll_Content', key="chlorophyll_ph")
+        
+        st.markdown("#### Bio-signals")
+        electrochemical = ph_slider('Electrochemical_Signal', key="electro_ph")
+        
+        if st.button("Analyze Plant Health", type="primary", use_container_width=True):
+            with span('build_frame'):
+                features = pd.DataFrame([[soil_moisture, ambient_temp, soil_temp, humidity, light_intensity,
+                                          soil_ph, nitrogen, phosphorus, potassium, chlorophyll, electrochemical]],
+                                        columns=ph_features)
+            
+            labels, confidences, _ = predict_with_confidence(plant_cache, features)
+            prediction = labels[0]
+            confidence = confidences[0]
+            
+            st.session_state.plant_results = {
+                'status': prediction,
+                'confidence': confidence,
+                'soil_moisture': soil_moisture,
+                'nitrogen': nitrogen,
+                'soil_ph': soil_ph,
+                'timestamp': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            st.markdown("---")
+            
+            if prediction == "Healthy":
+                st.markdown(f"""
+                <div class="prediction-box">
+                    <h2>✅ Health Status: {prediction}</h2>
+                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
+                    <p>Your plants are in good condition! Maintain current practices.</p>
+                </div>
+                """, unsafe_allow_html=True)
+            elif prediction == "Moderate Stress":
+                st.markdown(f"""
+                <div class="prediction-box warning">
+                    <h2>⚠️ Health Status: {prediction}</h2>
+                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
+                    <p>Recommendations:</p>
+                    <ul>
+                        <li>Increase irrigation (current: {soil_moisture}%)</li>
+                        <li>Add nitrogen-rich fertilizer (current: {nitrogen} ppm)</li>
+                        <li>Monitor soil pH levels (current: {soil_ph})</li>
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                st.markdown(f"""
+                <div class="prediction-box critical">
+                    <h2>🚨 Health Status: {prediction}</h2>
+                    <p><strong>Confidence:</strong> {confidence:.1f}%</p>
+                    <p>Immediate action required:</p>
+                    <ul>
+                        <li>Urgent irrigation needed (current: {soil_moisture}%)</li>
+                        <li>Apply emergency fertilizer (current nitrogen: {nitrogen} ppm)</li>
+                        <li>Check soil pH and adjust if needed (current: {soil_ph})</li>
+                    </ul>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            render_explanation(ctx.flat_plant_model, features, prediction,
+                               {feature: label for feature, (label, _, _) in PH_RANGES.items()})
+    
+    with tab_what_if:
+        current = dict(zip(PH_FEATURES, [soil_moisture, ambient_temp, soil_temp, humidity, light_intensity,
+                                         soil_ph, nitrogen, phosphorus, potassium, chlorophyll, electrochemical]))
+        render_what_if(plant_model, current, PH_FEATURES, PH_RANGES, key="what_if_ph",
+                       default_axes=('Soil_Moisture', 'Nitrogen_Level'), default_class="Healthy")
+    
+    with tab_batch:
+        st.markdown("#### Score a sensor file")
+        st.write("Upload a CSV or Parquet file with the following columns: " + ", ".join(PH_FEATURES))
+        uploaded = st.file_uploader("Sensor readings", type=["csv", "parquet"], key="batch_ph")
+        chunk_size = st.number_input("Rows per chunk", min_value=100, max_value=1000000, value=10000, step=1000)
+        explain = st.checkbox("Include per-feature explanations",
+                              help="Adds a Contribution_<feature> column per input toward the predicted status")
+        
+        if uploaded is not None and st.button("Score File", type="primary", use_container_width=True):
+            progress = st.empty()
+            out = io.StringIO()
+            try:
+                with span('batch_scoring'):
+                    stats = write_scored_csv(
+                        ctx.batch_plant_model, read_chunks(uploaded, int(chunk_size)), out,
+                        on_chunk=lambda s: progress.info(f"Scored {s['rows']:,} rows ({s['rows_per_sec']:,.0f} rows/sec)"),
+                        explainer=ctx.flat_plant_model if explain else None)
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                progress.success(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+                                 f"({stats['rows_per_sec']:,.0f} rows/sec)")
+                st.download_button(
+                    label="Download Scored CSV",
+                    data=out.getvalue(),
+                    file_name="scored_" + uploaded.name.rsplit('.', 1)[0] + ".csv",
+                    mime="text/csv",
+                )
+    
+    with tab2:
+        st.markdown("""
+        ### About Plant Health Assessment
+        
+        This module analyzes standard plant health parameters to detect current stress conditions:
+        
+        - **Soil Moisture**: Water content in the soil
+        - **Temperature**: Both ambient and soil temperatures
+        - **Humidity**: Atmospheric moisture level
+        - **Light Intensity**: Amount of light exposure
+        - **Soil pH**: Acidity/alkalinity level
+        - **Nutrients**: Nitrogen, Phosphorus, and Potassium levels
+        - **Chlorophyll Content**: Indicator of photosynthetic activity
+        - **Electrochemical Signals**: Plant's electrical response to environment
+        
+        The model uses a Random Forest classifier trained on extensive agricultural data to provide accurate health assessments.
+        """)
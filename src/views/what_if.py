@@ -0,0 +1,67 @@
+# views/what_if.py
+"""What-if sensitivity tab shared by the Plant Health and Fungal pages."""
+import time
+
+import streamlit as st
+
+from charts import response_curve_png, response_surface_png
+from metrics import span
+from sensitivity import grid_values, sweep
+
+GRID_SIZES = [25, 50, 100, 200]
+
+
+def render_what_if(model, base, features, ranges, key, default_axes, class_names=None, default_class=None):
+    """Sweep one or two of the ``ranges`` features around the ``base`` inputs.
+
+    ``ranges`` maps feature -> (label, low, high); ``base`` maps every
+    feature to its current value.
+    """
+    class_names = class_names or {}
+    labels = {feature: label for feature, (label, _, _) in ranges.items()}
+    classes = list(model.classes_)
+
+    st.write("Vary one or two inputs around the current values and score the whole grid at once.")
+    col1, col2 = st.columns(2)
+    with col1:
+        x_feature = st.selectbox("Vary", list(ranges), index=list(ranges).index(default_axes[0]),
+                                 format_func=labels.get, key=f"{key}_x")
+        size = st.select_slider("Grid points per input", GRID_SIZES, value=100, key=f"{key}_size")
+    with col2:
+        others = [None] + [feature for feature in ranges if feature != x_feature]
+        y_default = default_axes[1] if default_axes[1] in others else None
+        y_feature = st.selectbox("Against", others, index=others.index(y_default),
+                                 format_func=lambda f: "— (single input)" if f is None else labels[f],
+                                 key=f"{key}_y")
+        shown = st.selectbox("Show probability of", classes,
+                             index=classes.index(default_class) if default_class in classes else 0,
+                             format_func=lambda c: class_names.get(c, str(c)), key=f"{key}_class")
+
+    if not st.button("Run Sweep", key=f"{key}_run", use_container_width=True):
+        return
+
+    _, x_low, x_high = ranges[x_feature]
+    x_values = grid_values(x_low, x_high, size)
+    y_values = None
+    if y_feature is not None:
+        _, y_low, y_high = ranges[y_feature]
+        y_values = grid_values(y_low, y_high, size)
+
+    start = time.perf_counter()
+    with span('sensitivity_sweep'):
+        proba, _ = sweep(model, base, features, x_feature, x_values, y_feature, y_values)
+    seconds = time.perf_counter() - start
+    points = size if y_feature is None else size * size
+    st.caption(f"Scored {points:,} input combinations in {seconds * 1000:.0f} ms")
+
+    with span('chart'):
+        if y_feature is None:
+            png = response_curve_png(x_values, proba, [class_names.get(c, c) for c in classes],
+                                     labels[x_feature], f"Prediction vs {labels[x_feature]}")
+        else:
+            png = response_surface_png(x_values, y_values, proba[:, :, classes.index(shown)],
+                                       labels[x_feature], labels[y_feature],
+                                       f"P({class_names.get(shown, shown)})",
+                                       f"Probability of {class_names.get(shown, shown)}",
+                                       marker=(base[x_feature], base[y_feature]))
+    st.image(png, use_container_width=True)
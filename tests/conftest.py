@@ -0,0 +1,43 @@
+# conftest.py
+"""Puts src/ on the import path and loads the pickled models and the CSV rows once."""
+import os
+import sys
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from assets import load_assets  # noqa: E402
+from datasets import MYCO_RAW_FEATURES, PLANT_DATA, TREE_DATA, encode_myco  # noqa: E402
+from scoring import PH_FEATURES  # noqa: E402
+
+
+def with_drawn_rows(X, factor=5, seed=42):
+    """X plus ``factor`` times as many rows drawn column by column, off the data points."""
+    rng = np.random.default_rng(seed)
+    drawn = pd.DataFrame({column: rng.choice(X[column].to_numpy(), factor * len(X)) for column in X.columns})
+    return pd.concat([X, drawn], ignore_index=True)
+
+
+@pytest.fixture(scope='session')
+def assets():
+    with warnings.catch_warnings():
+        # The pickles may come from another scikit-learn version
+        warnings.simplefilter('ignore')
+        return load_assets()
+
+
+@pytest.fixture(scope='session')
+def cases(assets):
+    """{name: (pickled model, rows of its CSV plus drawn rows)} for both models."""
+    plant_model, myco_model, le_species, le_light, le_microbe = assets
+    X_plant = pd.read_csv(PLANT_DATA)[PH_FEATURES]
+    myco_df = pd.read_csv(TREE_DATA)[MYCO_RAW_FEATURES + ['Event']].dropna()
+    X_myco, _ = encode_myco(myco_df, le_species, le_light, le_microbe)
+    return {
+        'plant_model': (plant_model, with_drawn_rows(X_plant)),
+        'myco_model': (myco_model, with_drawn_rows(X_myco)),
+    }
@@ -0,0 +1,91 @@
+# test_dataset_store.py
+"""DatasetStore round trip against the CSV files, appends and recovery of uncommitted bytes."""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataset_store import DATASETS, DatasetStore, StoreError, convert
+
+
+def assert_matches_csv(store, csv, timestamps):
+    expected = pd.read_csv(csv)
+    frame = store.frame()
+    assert list(frame.columns) == list(expected.columns)
+    assert len(frame) == len(expected)
+    for name in expected.columns:
+        if name in timestamps:
+            assert np.array_equal(frame[name].to_numpy(), pd.to_datetime(expected[name]).to_numpy())
+        elif pd.api.types.is_numeric_dtype(expected[name]):
+            assert frame[name].dtype == expected[name].dtype
+            np.testing.assert_array_equal(frame[name].to_numpy(), expected[name].to_numpy())
+        else:
+            assert frame[name].astype(object).where(frame[name].notna(), None).tolist() == \
+                expected[name].astype(object).where(expected[name].notna(), None).tolist()
+
+
+@pytest.mark.parametrize('name', list(DATASETS))
+def test_store_matches_csv(name, tmp_path):
+    store = convert(name, str(tmp_path))
+    assert_matches_csv(store, DATASETS[name]['csv'], DATASETS[name]['timestamps'])
+    # Numeric columns are read-only maps of the column files
+    numeric = [column for column in store.columns if store._specs[column]['kind'] == 'numeric']
+    assert isinstance(store.column(numeric[0]), np.memmap)
+
+
+def test_append_keeps_existing_codes(tmp_path):
+    frame = pd.DataFrame({'Species': ["Acer", "Quercus"], 'AMF': [1.0, 2.0]})
+    store = DatasetStore.create(frame, str(tmp_path / 'tiny'))
+    codes = store.column('Species').copy()
+    assert store.append(pd.DataFrame({'Species': ["Betula", "Acer", None], 'AMF': [3.0, 4.0, 5.0]})) == 5
+    reopened = DatasetStore(store.path)
+    assert np.array_equal(reopened.column('Species')[:2], codes)
+    assert reopened.categories('Species') == ["Acer", "Quercus", "Betula"]
+    assert reopened.frame()['Species'].astype(object).tolist()[:4] == ["Acer", "Quercus", "Betula", "Acer"]
+    assert pd.isna(reopened.frame()['Species'].iloc[4])
+    assert reopened.column('AMF').tolist() == [1.0, 2.0, 3.0, 4.0, 5.0]
+
+
+def test_append_rejects_bad_rows(tmp_path):
+    store = DatasetStore.create(pd.DataFrame({'Species': ["Acer"], 'AMF': [1.0]}), str(tmp_path / 'tiny'))
+    with pytest.raises(StoreError):
+        store.append(pd.DataFrame({'Species': ["Acer"]}))
+    with pytest.raises(StoreError):
+        store.append(pd.DataFrame({'Species': ["Acer"], 'AMF': ["lots"]}))
+    assert DatasetStore(store.path).rows == 1
+
+
+def test_uncommitted_tail_is_ignored_and_truncated(tmp_path):
+    store = DatasetStore.create(pd.DataFrame({'AMF': [1.0, 2.0]}), str(tmp_path / 'tiny'))
+    path = os.path.join(store.path, store._specs['AMF']['file'])
+    # Bytes of an append that died before the manifest was replaced
+    with open(path, 'ab') as f:
+        f.write(np.array([99.0, 98.0]).tobytes())
+    reopened = DatasetStore(store.path)
+    assert reopened.column('AMF').tolist() == [1.0, 2.0]
+    reopened.append(pd.DataFrame({'AMF': [3.0]}))
+    assert DatasetStore(store.path).column('AMF').tolist() == [1.0, 2.0, 3.0]
+    assert os.path.getsize(path) == 3 * 8
+
+
+def test_changed_csv_makes_the_store_stale(tmp_path):
+    csv = tmp_path / 'readings.csv'
+    pd.DataFrame({'AMF': [1.0, 2.0]}).to_csv(csv, index=False)
+    store = convert('tree_data', str(tmp_path / 'store'), csv=str(csv))
+    assert store.is_current(str(csv))
+    pd.DataFrame({'AMF': [1.0, 2.0, 3.0]}).to_csv(csv, index=False)
+    assert not DatasetStore(store.path).is_current(str(csv))
+
+
+def test_loaders_give_csv_dtypes_from_the_store(tmp_path, monkeypatch):
+    import datasets
+
+    stores = {name: convert(name, str(tmp_path)) for name in DATASETS}
+    monkeypatch.setattr(datasets, 'open_dataset', lambda name: stores[name])
+    X, y = datasets.load_plant_data()
+    expected = pd.read_csv(datasets.PLANT_DATA)
+    pd.testing.assert_frame_equal(X, expected[X.columns])
+    pd.testing.assert_series_equal(y, expected[datasets.PLANT_TARGET])
+    myco = datasets.load_myco_frame()
+    pd.testing.assert_frame_equal(myco, pd.read_csv(datasets.TREE_DATA)[myco.columns].dropna())
@@ -0,0 +1,30 @@
+# test_distill.py
+"""Compact models are only loaded for the forests they were distilled from."""
+import numpy as np
+import pytest
+
+from distill import COMPACT_FILES, distill, load_compact_models, save_compact
+from forest import FlatForest
+
+
+@pytest.fixture(scope='module')
+def models_dir(cases, tmp_path_factory):
+    path = tmp_path_factory.mktemp('models')
+    for name in COMPACT_FILES:
+        model, X = cases[name]
+        save_compact(distill(model, X[:500], max_depth=4, factor=1), model, str(path / COMPACT_FILES[name]))
+    return path
+
+
+def test_compact_models_load_for_their_forests(cases, models_dir):
+    forests = {name: FlatForest.from_sklearn(cases[name][0]) for name in COMPACT_FILES}
+    compact = load_compact_models(str(models_dir), forests)
+    for name, model in compact.items():
+        assert np.array_equal(model.classes_, forests[name].classes_)
+
+
+def test_compact_models_of_other_forests_are_refused(cases, models_dir):
+    forests = {name: FlatForest.from_sklearn(cases[name][0]) for name in COMPACT_FILES}
+    forests['myco_model'].threshold = forests['myco_model'].threshold + 1.0
+    with pytest.raises(ValueError):
+        load_compact_models(str(models_dir), forests)
@@ -0,0 +1,43 @@
+# test_early_exit.py
+"""Margin-mode early exit keeps every label of the full forest."""
+import numpy as np
+import pytest
+
+from early_exit import EarlyExitForest, early_exit_report
+from forest import FlatForest
+
+MODELS = ['plant_model', 'myco_model']
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_margin_mode_keeps_labels(cases, name):
+    model, X = cases[name]
+    forest = FlatForest.from_sklearn(model)
+    early = EarlyExitForest.learned(forest, X[:500], mode='margin')
+    assert np.array_equal(early.predict(X), model.predict(X))
+    assert early.average_trees() < forest.n_trees
+
+
+def test_rows_using_every_tree_are_exact(cases):
+    model, X = cases['plant_model']
+    forest = FlatForest.from_sklearn(model)
+    # Ties never settle, so these rows go through every tree and are summed in sklearn's order
+    early = EarlyExitForest(forest, mode='margin', block_size=forest.n_trees)
+    early._settled = lambda sums, evaluated: np.zeros(len(sums), dtype=bool)
+    assert np.array_equal(early.predict_proba(X), model.predict_proba(X))
+
+
+def test_hoeffding_mode_evaluates_fewer_trees(cases):
+    model, X = cases['myco_model']
+    forest = FlatForest.from_sklearn(model)
+    margin = early_exit_report(forest, EarlyExitForest.learned(forest, X[:500], mode='margin'), X)
+    hoeffding = early_exit_report(forest, EarlyExitForest.learned(forest, X[:500], mode='hoeffding'), X)
+    assert margin['agreement'] == 1.0
+    assert hoeffding['average_trees'] < margin['average_trees']
+    assert hoeffding['agreement'] > 0.9
+
+
+def test_unknown_mode(cases):
+    model, _ = cases['myco_model']
+    with pytest.raises(ValueError):
+        EarlyExitForest(FlatForest.from_sklearn(model), mode='sometimes')
@@ -0,0 +1,52 @@
+# test_encoding.py
+"""EncodingTable gives LabelEncoder's codes and rejects unknown or missing values."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from encoding import ENCODED_COLUMNS, EncodingTable
+
+
+@pytest.fixture(scope='module')
+def encoders(assets):
+    return dict(zip(ENCODED_COLUMNS, assets[2:]))
+
+
+def test_codes_match_label_encoder(encoders):
+    for column, encoder in encoders.items():
+        table = EncodingTable.from_encoder(encoder, column)
+        values = np.random.default_rng(0).choice(encoder.classes_, 1000)
+        assert np.array_equal(table.transform(values), encoder.transform(values))
+        assert np.array_equal(table.transform(pd.Series(values, dtype='category')), encoder.transform(values))
+        assert [table.encode(value) for value in encoder.classes_] == list(range(len(encoder.classes_)))
+        assert np.array_equal(table.inverse_transform(table.transform(values)), values)
+
+
+def test_unknown_values():
+    table = EncodingTable(['a', 'b'], 'Species')
+    with pytest.raises(ValueError, match="Unknown Species value.*: c"):
+        table.transform(['a', 'c'])
+    with pytest.raises(ValueError, match="c"):
+        table.encode('c')
+    assert list(table.transform(['b', 'c', 'a'], unknown=-1)) == [1, -1, 0]
+
+
+def test_missing_values():
+    table = EncodingTable(['a', 'b'], 'Light')
+    with pytest.raises(ValueError):
+        table.transform(['a', None])
+    with pytest.raises(ValueError):
+        table.transform(pd.Series(['a', np.nan]))
+    assert list(table.transform(['a', None], unknown=-1)) == [0, -1]
+    with pytest.raises(ValueError):
+        table.encode(None)
+
+
+def test_unhashable_values():
+    table = EncodingTable(['a', 'b'], 'Microbe')
+    with pytest.raises(ValueError, match="Microbe values must be strings"):
+        table.transform(['a', ['b']])
+    with pytest.raises(ValueError, match="must be strings"):
+        table.transform(pd.Series([{'a': 1}]), unknown=-1)
+    with pytest.raises(ValueError):
+        table.encode(['a'])
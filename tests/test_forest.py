@@ -0,0 +1,51 @@
+# test_forest.py
+"""FlatForest must reproduce the pickled forests' predict_proba bit for bit."""
+import numpy as np
+import pytest
+
+from forest import BatchRouter, FlatForest, check_parity
+
+MODELS = ['plant_model', 'myco_model']
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_flat_forest_matches_pickle(cases, name):
+    model, X = cases[name]
+    flat = FlatForest.from_sklearn(model)
+    assert np.array_equal(flat.predict_proba(X), model.predict_proba(X))
+    assert np.array_equal(flat.predict(X), model.predict(X))
+    assert check_parity(model, flat, X)['identical']
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_saved_flat_forest_matches_pickle(cases, name, tmp_path):
+    model, X = cases[name]
+    path = str(tmp_path / 'forest.npz')
+    FlatForest.from_sklearn(model).save(path)
+    assert np.array_equal(FlatForest.load(path).predict_proba(X), model.predict_proba(X))
+
+
+def test_single_rows_and_small_chunks(cases):
+    model, X = cases['plant_model']
+    flat = FlatForest.from_sklearn(model)
+    assert np.array_equal(flat.predict_proba(X[:1]), model.predict_proba(X[:1]))
+    assert np.array_equal(flat.predict_proba(X[:1000], chunk_size=7), model.predict_proba(X[:1000]))
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_contributions_add_up_to_the_probabilities(cases, name):
+    model, X = cases[name]
+    bias, contributions = FlatForest.from_sklearn(model).contributions(X[:500], chunk_size=128)
+    assert contributions.shape == (500, X.shape[1], len(model.classes_))
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), model.predict_proba(X[:500]), rtol=0, atol=1e-12)
+
+
+def test_batch_router_sends_large_calls_to_sklearn(cases):
+    model, X = cases['plant_model']
+    loads = []
+    router = BatchRouter(FlatForest.from_sklearn(model), lambda: loads.append(1) or model, threshold=100)
+    assert np.array_equal(router.predict_proba(X[:100]), model.predict_proba(X[:100]))
+    assert router._large is None
+    assert np.array_equal(router.predict(X), model.predict(X))
+    router.predict_proba(X[:101])
+    assert loads == [1]
@@ -0,0 +1,111 @@
+# test_history_store.py
+"""Insert, filter, paging, lookup and clearing of the SQLite HistoryStore."""
+import pytest
+
+from history_store import HistoryStore
+
+
+def entry(timestamp, status="Healthy", risk="Low Risk", moisture=40.0):
+    return {
+        'combined_timestamp': timestamp,
+        'plant_results': {'status': status, 'confidence': 91.5, 'soil_moisture': moisture, 'nitrogen': 45.0,
+                          'soil_ph': 6.5, 'timestamp': timestamp},
+        'fungal_results': {'risk_level': risk, 'confidence': 80.0, 'amf_colonization': 65.0, 'nsc_level': 0.5,
+                           'microbe_type': "AMF", 'timestamp': timestamp},
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path / 'history.sqlite3'))
+    yield store
+    store.close()
+
+
+def test_entries_round_trip(store):
+    entry_id = store.add(entry("2026-01-01 10:00:00", moisture=33.5))
+    saved = store.get(entry_id)
+    assert saved['id'] == entry_id
+    assert saved['plant_results']['soil_moisture'] == 33.5
+    assert saved['fungal_results']['risk_level'] == "Low Risk"
+    assert store.get(entry_id + 1) is None
+
+
+def test_filters(store):
+    store.add(entry("2026-01-01 10:00:00", "Healthy", "Low Risk"))
+    store.add(entry("2026-01-01 11:00:00", "High Stress", "High Risk"))
+    store.add(entry("2026-01-01 12:00:00", "High Stress", "Low Risk"))
+    assert store.count() == store.count("All", "All") == 3
+    assert store.count(status="High Stress") == 2
+    assert store.count(risk="Low Risk") == 2
+    assert store.count("High Stress", "Low Risk") == 1
+    assert [e['combined_timestamp'] for e in store.page(status="High Stress")] == \
+        ["2026-01-01 12:00:00", "2026-01-01 11:00:00"]
+
+
+def test_pages_are_newest_first(store):
+    ids = [store.add(entry(f"2026-01-01 10:00:{second:02d}")) for second in range(5)]
+    assert [e['id'] for e in store.page(limit=2)] == ids[:-3:-1]
+    assert [e['id'] for e in store.page(limit=2, offset=2)] == [ids[2], ids[1]]
+    assert [e['id'] for e in store.page(limit=2, offset=4)] == [ids[0]]
+
+
+def test_rows_are_oldest_first_and_checked(store):
+    store.add(entry("2026-01-02 00:00:00", moisture=2.0))
+    store.add(entry("2026-01-01 00:00:00", moisture=1.0))
+    assert store.rows(['soil_moisture']) == [(1.0,), (2.0,)]
+    with pytest.raises(ValueError):
+        store.rows(['soil_moisture; DROP TABLE test_history'])
+
+
+def test_clear_and_persistence(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    store = HistoryStore(path)
+    store.add(entry("2026-01-01 10:00:00"))
+    store.close()
+    reopened = HistoryStore(path)
+    assert reopened.count() == 1
+    reopened.clear()
+    assert reopened.count() == 0
+    reopened.close()
+
+
+def test_keyset_chunks_cover_every_row_once(store):
+    # Equal timestamps make the id the tie-breaker of the keyset
+    ids = [store.add(entry("2026-01-01 10:00:00", moisture=float(i))) for i in range(7)]
+    store.add(entry("2026-01-01 09:00:00", "High Stress", moisture=-1.0))
+    chunks = list(store.iter_chunks(['id'], chunk_size=3, status="Healthy"))
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    assert [row[0] for chunk in chunks for row in chunk] == ids
+    with pytest.raises(ValueError):
+        list(store.iter_chunks(['nope']))
+
+
+def test_csv_export_matches_the_store(store):
+    import csv
+    import io
+
+    from history_export import export_history
+    from history_store import EXPORT_COLUMNS
+
+    for second in range(5):
+        store.add(entry(f"2026-01-01 10:00:{second:02d}", moisture=float(second)))
+    out = io.BytesIO()
+    assert export_history(store, out, 'csv', chunk_size=2) == 5
+    rows = list(csv.reader(io.StringIO(out.getvalue().decode('utf-8'))))
+    assert rows[0] == list(EXPORT_COLUMNS.values())
+    assert [float(row[3]) for row in rows[1:]] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+
+def test_recent_rows_and_counts(store):
+    for i, status in enumerate(["Healthy", "High Stress", "High Stress", "Moderate Stress", "High Stress"]):
+        store.add(entry(f"2026-01-01 1{i}:00:00", status, moisture=float(i)))
+    assert store.recent(['soil_moisture'], limit=3) == [(2.0,), (3.0,), (4.0,)]
+    assert store.recent(['soil_moisture'], limit=10, status="High Stress") == [(1.0,), (2.0,), (4.0,)]
+    assert store.counts('plant_status') == {"High Stress": 3, "Healthy": 1, "Moderate Stress": 1}
+    assert list(store.counts('plant_status')) == ["High Stress", "Healthy", "Moderate Stress"]
+    assert store.counts('fungal_risk', status="Healthy") == {"Low Risk": 1}
+    with pytest.raises(ValueError):
+        store.counts('soil_ph')
+    with pytest.raises(ValueError):
+        store.recent(['password'])
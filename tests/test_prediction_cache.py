@@ -0,0 +1,82 @@
+# test_prediction_cache.py
+"""Quantization keys, hit/miss accounting and LRU eviction of PredictionCache."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from prediction_cache import PredictionCache
+
+FEATURES = ['a', 'b']
+
+
+class RecordingModel:
+    """Two-class model whose output depends on every input; remembers the rows it scored."""
+
+    classes_ = np.array(['low', 'high'])
+
+    def __init__(self):
+        self.calls = []
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float64)
+        self.calls.append(X.copy())
+        high = 1.0 / (1.0 + np.exp(-(X[:, 0] + 10.0 * X[:, 1])))
+        return np.column_stack([1.0 - high, high])
+
+
+def frame(*rows):
+    return pd.DataFrame(list(rows), columns=FEATURES)
+
+
+def test_answers_are_the_model_output_for_the_snapped_inputs():
+    model = RecordingModel()
+    cache = PredictionCache(model, FEATURES, resolution={'a': 0.5})
+    X = frame([1.2, 0.3], [1.3, 0.3], [7.0, -0.25])
+    proba = cache.predict_proba(X)
+    snapped = frame([1.0, 0.3], [1.5, 0.3], [7.0, -0.25])
+    assert np.array_equal(proba, RecordingModel().predict_proba(snapped))
+    assert np.array_equal(cache.predict(X), model.classes_.take(np.argmax(proba, axis=1)))
+
+
+def test_rows_with_the_same_key_share_one_entry():
+    model = RecordingModel()
+    cache = PredictionCache(model, FEATURES, resolution={'a': 1.0})
+    first = cache.predict_proba(frame([2.1, 0.5], [1.9, 0.5]))
+    second = cache.predict_proba(frame([2.3, 0.5]))
+    # One model call with the one distinct key; the second lookup is a hit
+    assert len(model.calls) == 1 and len(model.calls[0]) == 1
+    assert np.array_equal(first[0], second[0])
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['size']) == (1, 2, 1)
+
+
+def test_features_without_a_step_are_exact_keys():
+    model = RecordingModel()
+    cache = PredictionCache(model, FEATURES, resolution={'a': 1.0})
+    cache.predict_proba(frame([1.0, 0.5]))
+    cache.predict_proba(frame([1.0, 0.5000001]))
+    assert cache.stats()['misses'] == 2
+
+
+def test_least_recently_used_entry_is_evicted():
+    model = RecordingModel()
+    cache = PredictionCache(model, FEATURES, maxsize=2)
+    cache.predict_proba(frame([1.0, 0.0]))
+    cache.predict_proba(frame([2.0, 0.0]))
+    cache.predict_proba(frame([1.0, 0.0]))  # refreshes the first entry
+    cache.predict_proba(frame([3.0, 0.0]))  # evicts [2, 0]
+    assert cache.stats()['evictions'] == 1
+    calls = len(model.calls)
+    cache.predict_proba(frame([1.0, 0.0]))
+    assert len(model.calls) == calls
+    cache.predict_proba(frame([2.0, 0.0]))
+    assert len(model.calls) == calls + 1
+    assert cache.stats()['size'] == 2
+
+
+def test_clear_resets_entries_and_counters():
+    cache = PredictionCache(RecordingModel(), FEATURES)
+    cache.predict_proba(frame([1.0, 0.0], [1.0, 0.0]))
+    cache.clear()
+    assert cache.stats() == pytest.approx({'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0,
+                                           'maxsize': 4096, 'hit_rate': 0.0})
@@ -0,0 +1,85 @@
+# test_pruning.py
+"""prune() must leave predict_proba bit for bit unchanged."""
+import os
+import shutil
+
+import numpy as np
+import pytest
+
+from assets import MODEL_FILES, MODELS_DIR
+from early_exit import EarlyExitForest
+from encoding import EncodingTable
+from forest import FlatForest, forest_fingerprint
+from pruning import LOSSY_FILES, PRUNED_FILES, PrunedForest, load_pruned_assets, prune, write_pruned
+
+MODELS = ['plant_model', 'myco_model']
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_pruned_forest_matches_pickle(cases, name, tmp_path):
+    model, X = cases[name]
+    forest = FlatForest.from_sklearn(model)
+    pruned = prune(forest)
+    assert len(pruned.feature) < len(forest.feature)
+    assert np.array_equal(pruned.predict_proba(X), model.predict_proba(X))
+    path = str(tmp_path / 'pruned.npz')
+    pruned.save(path)
+    assert np.array_equal(PrunedForest.load(path).predict_proba(X), model.predict_proba(X))
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_merge_argmax_keeps_labels_on_the_data(cases, name):
+    model, X = cases[name]
+    forest = FlatForest.from_sklearn(model)
+    merged = prune(forest, merge_argmax=True)
+    assert len(merged.feature) <= len(prune(forest).feature)
+    assert np.mean(merged.predict(X) == model.predict(X)) > 0.95
+
+
+def test_pruned_forest_has_no_contributions(cases):
+    model, X = cases['myco_model']
+    with pytest.raises(ValueError):
+        prune(FlatForest.from_sklearn(model)).contributions(X)
+
+
+@pytest.mark.parametrize('name', MODELS)
+def test_margin_early_exit_on_pruned_forest(cases, name):
+    model, X = cases[name]
+    early = EarlyExitForest(prune(FlatForest.from_sklearn(model)), mode='margin')
+    assert np.array_equal(early.predict(X), model.predict(X))
+
+
+@pytest.fixture
+def models_dir(tmp_path):
+    for filename in MODEL_FILES.values():
+        shutil.copy(os.path.join(MODELS_DIR, filename), tmp_path)
+    return str(tmp_path)
+
+
+# Without a bundle the pickles are loaded, which may come from another scikit-learn version
+@pytest.mark.filterwarnings('ignore')
+def test_pruned_assets_come_from_the_current_forests(cases, models_dir):
+    forests = {name: FlatForest.from_sklearn(cases[name][0]) for name in MODELS}
+    write_pruned(forests, models_dir)
+    plant_model, myco_model, *tables = load_pruned_assets(models_dir)
+    assert not plant_model.merge_argmax and plant_model.source == forest_fingerprint(forests['plant_model'])
+    assert all(isinstance(table, EncodingTable) for table in tables)
+    # Lossy forests go to their own files and leave the exact ones in place
+    written = write_pruned(forests, models_dir, merge_argmax=True)
+    assert [os.path.basename(path) for _, path in written.values()] == list(LOSSY_FILES.values())
+    assert PrunedForest.load(written['myco_model'][1]).merge_argmax
+    load_pruned_assets(models_dir)
+
+
+@pytest.mark.filterwarnings('ignore')
+def test_lossy_or_stale_pruned_forests_are_refused(cases, models_dir):
+    forests = {name: FlatForest.from_sklearn(cases[name][0]) for name in MODELS}
+    path = os.path.join(models_dir, PRUNED_FILES['myco_model'])
+    write_pruned(forests, models_dir)
+    prune(forests['myco_model'], merge_argmax=True).save(path)
+    with pytest.raises(ValueError):
+        load_pruned_assets(models_dir)
+    forests['myco_model'].threshold = forests['myco_model'].threshold + 1.0
+    prune(forests['myco_model']).save(path)
+    with pytest.raises(ValueError):
+        load_pruned_assets(models_dir)
@@ -0,0 +1,70 @@
+# test_region_index.py
+"""RegionIndex must give the Myco-Net forest's exact output, on hits and misses."""
+import numpy as np
+import pytest
+
+from forest import FlatForest
+from region_index import RegionIndex, sample_rows
+
+
+@pytest.fixture(scope='module')
+def myco(cases):
+    model, X = cases['myco_model']
+    return model, X, FlatForest.from_sklearn(model)
+
+
+@pytest.mark.parametrize('learn', [False, True])
+def test_index_matches_pickle(myco, learn):
+    model, X, forest = myco
+    index = RegionIndex.build(forest, X[:1000])
+    index.learn = learn
+    cells = index.cells
+    unseen = sample_rows(X, 2000, random_state=1)
+    expected = model.predict_proba(unseen)
+    for start in range(0, len(unseen), 100):
+        assert np.array_equal(index.predict_proba(unseen[start:start + 100]), expected[start:start + 100])
+    assert (index.cells > cells) == learn
+    assert np.array_equal(index.predict_proba(X), model.predict_proba(X))
+    assert 0 < index.hit_rate() <= 1
+
+
+def test_saved_index_round_trip(myco, tmp_path):
+    model, X, forest = myco
+    path = str(tmp_path / 'regions.npz')
+    index = RegionIndex.build(forest, X)
+    index.save(path)
+    loaded = RegionIndex.load(path, forest, learn=False)
+    assert loaded.cells == index.cells
+    assert np.array_equal(loaded.predict_proba(X), model.predict_proba(X))
+    assert loaded.hit_rate() == 1.0
+
+
+def test_index_of_another_model_is_refused(myco, tmp_path):
+    _, X, forest = myco
+    path = str(tmp_path / 'regions.npz')
+    RegionIndex.build(forest, X[:100]).save(path)
+    other = FlatForest.from_arrays(forest.arrays())
+    other.threshold = other.threshold + 1.0
+    with pytest.raises(ValueError):
+        RegionIndex.load(path, other)
+
+
+def test_learned_cells_are_merged_in_batches(myco, monkeypatch):
+    import region_index
+
+    monkeypatch.setattr(region_index, 'MERGE_BATCH', 64)
+    model, X, forest = myco
+    index = RegionIndex.build(forest, X[:200])
+    merged = len(index._table[0])
+    unseen = sample_rows(X, 1000, random_state=2)
+    expected = model.predict_proba(unseen)
+    for start in range(len(unseen)):
+        assert np.array_equal(index.predict_proba(unseen[start:start + 1]), expected[start:start + 1])
+        assert len(index._pending) < 64
+    assert len(index._table[0]) > merged
+    # Cells now come from the table or the side buffer; none goes back to the forest
+    hits = index.hits
+    assert np.array_equal(index.predict_proba(unseen), expected)
+    assert index.hits == hits + len(unseen)
+    codes = index._table[0]
+    assert np.all(codes[1:] > codes[:-1])
@@ -0,0 +1,103 @@
+# test_server.py
+"""Request handling of the prediction service, over HTTP on a free port."""
+import json
+import threading
+import urllib.error
+import urllib.request
+import warnings
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from server import PredictionHandler, PredictionService
+
+PLANT_RECORD = {
+    'Soil_Moisture': 45.0, 'Ambient_Temperature': 25.0, 'Soil_Temperature': 22.0, 'Humidity': 60.0,
+    'Light_Intensity': 50000.0, 'Soil_pH': 6.5, 'Nitrogen_Level': 45.0, 'Phosphorus_Level': 35.0,
+    'Potassium_Level': 40.0, 'Chlorophyll_Content': 65.0, 'Electrochemical_Signal': 10.0,
+}
+
+
+@pytest.fixture(scope='module')
+def service():
+    with warnings.catch_warnings():
+        # The pickles may come from another scikit-learn version
+        warnings.simplefilter('ignore')
+        service = PredictionService(max_wait=0.001)
+    PredictionHandler.service = service
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PredictionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    service.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield service
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def fungal_record(service):
+    return {'Species': str(service.le_species.classes_[0]), 'Light': str(service.le_light.classes_[0]),
+            'Microbe': str(service.le_microbe.classes_[0]),
+            'AMF': 40.0, 'PHN_Imp': 0.5, 'NSC_Imp': 0.5, 'LIG_Imp': 0.5}
+
+
+def post(service, path, body):
+    data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+    request = urllib.request.Request(service.url + path, data=data, headers={'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_single_plant_record(service):
+    status, body = post(service, '/plant-health', PLANT_RECORD)
+    assert status == 200
+    assert body['status'] == body['prediction']
+    assert abs(sum(body['probabilities'].values()) - 1.0) < 1e-9
+
+
+def test_batch_of_records(service, fungal_record):
+    status, body = post(service, '/fungal-risk', {'records': [fungal_record, fungal_record]})
+    assert status == 200
+    assert len(body['predictions']) == 2
+    assert body['predictions'][0] == body['predictions'][1]
+
+
+def test_missing_field_is_a_bad_request(service):
+    record = dict(PLANT_RECORD)
+    del record['Soil_pH']
+    status, body = post(service, '/plant-health', record)
+    assert status == 400
+    assert 'Soil_pH' in body['error']
+
+
+def test_non_numeric_sensor_is_a_bad_request(service):
+    status, _ = post(service, '/plant-health', dict(PLANT_RECORD, Humidity="damp"))
+    assert status == 400
+
+
+def test_unknown_category_is_a_bad_request(service, fungal_record):
+    status, body = post(service, '/fungal-risk', dict(fungal_record, Species="Not a species"))
+    assert status == 400
+    assert "Not a species" in body['error']
+
+
+def test_malformed_bodies(service):
+    assert post(service, '/plant-health', b'{"Soil_Moisture":')[0] == 400
+    assert post(service, '/plant-health', [])[0] == 400
+    assert post(service, '/unknown', PLANT_RECORD)[0] == 404
+
+
+@pytest.mark.parametrize('value', [None, True, "12.5", float('nan'), float('inf'), 10 ** 400])
+def test_sensor_values_must_be_finite_numbers(service, value):
+    status, body = post(service, '/plant-health', dict(PLANT_RECORD, Humidity=value))
+    assert status == 400
+    assert 'Sensor fields must be' in body['error']
+
+
+@pytest.mark.parametrize('value', [["a"], None, 3])
+def test_categories_must_be_strings(service, fungal_record, value):
+    status, body = post(service, '/fungal-risk', dict(fungal_record, Species=value))
+    assert status == 400
+    assert body['error'] == "Species must be strings"
@@ -0,0 +1,43 @@
+# test_streaming.py
+"""StreamIngestor scores a followed feed and stops all of its threads on close()."""
+import time
+
+import pandas as pd
+
+from datasets import PLANT_DATA
+from forest import FlatForest
+from streaming import PlantHealthMonitor, StreamIngestor, tail_file
+
+
+def wait_for(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return condition()
+
+
+def test_ingestor_scores_the_feed_and_stops(cases, tmp_path):
+    feed = tmp_path / 'feed.csv'
+    rows = pd.read_csv(PLANT_DATA).head(50)
+    rows.to_csv(feed, index=False)
+    monitor = PlantHealthMonitor(FlatForest.from_sklearn(cases['plant_model'][0]))
+    ingestor = StreamIngestor(monitor, max_wait=0.1).start(tail_file, str(feed), from_start=True,
+                                                           poll_interval=0.05)
+    assert wait_for(lambda: monitor.stats()['readings'] == len(rows))
+    ingestor.close()
+    assert not any(thread.is_alive() for thread in ingestor._threads)
+    assert ingestor.errors == 0
+
+
+def test_close_stops_a_feed_blocked_on_a_full_queue(cases, tmp_path):
+    feed = tmp_path / 'feed.csv'
+    pd.read_csv(PLANT_DATA).head(50).to_csv(feed, index=False)
+    monitor = PlantHealthMonitor(FlatForest.from_sklearn(cases['plant_model'][0]))
+    ingestor = StreamIngestor(monitor, max_rows=1)
+    ingestor.records.maxsize = 1
+    # Only the feed thread runs, so the queue fills up and put() blocks
+    ingestor._run = lambda: None
+    ingestor.start(tail_file, str(feed), from_start=True, poll_interval=0.05)
+    assert wait_for(ingestor.records.full)
+    ingestor.close()
+    assert not any(thread.is_alive() for thread in ingestor._threads)